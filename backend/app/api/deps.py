@@ -1,18 +1,51 @@
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.core.auth import InvalidToken, token_cache, verify_access_token
+from app.core.config import settings
 from app.core.supabase_client import get_supabase_client
+from app.core.tracing import span
+from app.models.users import AuthUser
 
 
 security = HTTPBearer()
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def verify_token_remote(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthUser:
+    """Verify the token with the Supabase auth server.
+
+    Costs a network round trip, but catches sessions revoked before their
+    `exp`; use it on revocation-sensitive routes.
+    """
     supabase = get_supabase_client()
     token = credentials.credentials
     try:
-        user = supabase.auth.get_user(token)
+        async with span("auth"):
+            user = await supabase.auth.get_user(token)
         if not user or not user.user:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return user.user
+        return AuthUser(
+            id=user.user.id,
+            email=user.user.email,
+            role=user.user.role,
+            app_metadata=user.user.app_metadata or {},
+        )
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthUser:
+    """Verify the token locally against the cached signing keys."""
+    if settings.auth_remote_verify:
+        return await verify_token_remote(credentials)
+
+    token = credentials.credentials
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    try:
+        # A cache miss may have to (re)fetch the JWKS, which is blocking I/O.
+        async with span("auth"):
+            return await run_in_threadpool(verify_access_token, token)
+    except InvalidToken:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
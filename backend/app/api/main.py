@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.api.routes import profiles, portfolios
-from app.api.routes import resumes, users
+from app.api.routes import public, resumes, search, users
 
 api_router = APIRouter()
 
@@ -8,3 +8,5 @@ api_router.include_router(resumes.router)
 api_router.include_router(users.router)
 api_router.include_router(profiles.router)
 api_router.include_router(portfolios.router)
+api_router.include_router(public.router)
+api_router.include_router(search.router)
@@ -1,54 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import Response
+from postgrest.exceptions import APIError
 from app.api.deps import verify_token
+from app.core.json_response import FastJSONResponse
+from app.core.pagination import keyset_page, select_columns, split_page
+from app.core.portfolio_patch import (
+    MERGE_PATCH_TYPE,
+    VERSION_CONFLICT,
+    etag_headers,
+    expected_version,
+    precondition_failed,
+    split_merge_patch,
+)
+from app.core.portfolio_snapshots import snapshot_store, sync_portfolio_snapshot
+from app.core.read_cache import read_cache
 from app.core.supabase_client import get_supabase_client
 from app.models.portfolios import PortfolioCreate, PortfolioUpdate, Portfolio
-from typing import List
+from typing import Optional
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/portfolios", tags=["portfolios"])
 
-@router.get("/", response_model=List[Portfolio])
+SUMMARY_COLUMNS = ("id", "name", "template_id", "color", "display_mode", "is_published", "slug", "version", "created_at", "updated_at")
+LIST_FIELDS = frozenset({"user_id", "data"})
+
+@router.get("/")
 async def get_my_portfolios(
     user=Depends(verify_token),
     limit: int = 50,
-    offset: int = 0
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
 ):
-    """Get all portfolios for the current user"""
+    """Get portfolio summaries for the current user, newest first.
+
+    Pass `fields=data` to include the portfolio document. When there are more
+    results the X-Next-Cursor header holds the `cursor` for the next page.
+    """
+    columns = select_columns(SUMMARY_COLUMNS, LIST_FIELDS, fields)
+
     try:
         supabase = get_supabase_client()
-        response = supabase.table("portfolios")\
-            .select("*")\
-            .eq("user_id", user.id)\
-            .order("created_at", desc=True)\
-            .limit(limit)\
-            .offset(offset)\
-            .execute()
-        
-        return response.data
+
+        async def load():
+            query = supabase.table("portfolios").select(columns).eq("user_id", user.id)
+            response = await keyset_page(query, limit, cursor).execute()
+            return response.data
+
+        rows = await read_cache.get_or_load(user.id, "portfolios", ("list", limit, cursor, columns), load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching portfolios: {str(e)}")
 
-@router.get("/{portfolio_id}")
-async def get_portfolio(portfolio_id: str, user=Depends(verify_token)):
-    """Get a specific portfolio by ID"""
-    try:
-        supabase = get_supabase_client()
-        response = supabase.table("portfolios")\
+    page, next_cursor = split_page(rows, limit)
+    return FastJSONResponse(content=page, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+async def load_portfolio(portfolio_id: str, user_id: str) -> Optional[dict]:
+    supabase = get_supabase_client()
+
+    async def load():
+        response = await supabase.table("portfolios")\
             .select("*")\
             .eq("id", portfolio_id)\
-            .eq("user_id", user.id)\
+            .eq("user_id", user_id)\
             .execute()
-        
-        if not response.data or len(response.data) == 0:
+        return response.data[0] if response.data else None
+
+    return await read_cache.get_or_load(user_id, "portfolios", ("item", portfolio_id), load)
+
+@router.get("/{portfolio_id}")
+async def get_portfolio(portfolio_id: str, user=Depends(verify_token)):
+    """Get a specific portfolio by ID; the ETag is what If-Match takes on writes"""
+    try:
+        portfolio = await load_portfolio(portfolio_id, user.id)
+
+        if portfolio is None:
             raise HTTPException(status_code=404, detail="Portfolio not found")
-            
-        return response.data[0]
+
+        return FastJSONResponse(content=portfolio, headers=etag_headers(portfolio))
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error fetching portfolio: {str(e)}")
+        logger.exception("Error fetching portfolio")
         raise HTTPException(status_code=500, detail=f"Error fetching portfolio: {str(e)}")
 
-@router.post("/", response_model=Portfolio)
+@router.post("/", responses={200: {"model": Portfolio}})
 async def create_portfolio(portfolio_data: PortfolioCreate, user=Depends(verify_token)):
     """Create a new portfolio"""
     try:
@@ -57,79 +96,159 @@ async def create_portfolio(portfolio_data: PortfolioCreate, user=Depends(verify_
         portfolio_dict = portfolio_data.model_dump()
         portfolio_dict["user_id"] = user.id
         
-        response = supabase.table("portfolios").insert(portfolio_dict).execute()
+        response = await supabase.table("portfolios").insert(portfolio_dict).execute()
+        await read_cache.invalidate(user.id, "portfolios")
         
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create portfolio")
-            
-        return response.data[0]
+        
+        await sync_portfolio_snapshot(supabase, response.data[0])
+        return FastJSONResponse(content=response.data[0])
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating portfolio: {str(e)}")
 
+async def check_unchanged(portfolio_id: str, user_id: str, version: Optional[int]) -> dict:
+    """The current row, or 404/412 when it's missing or not at `version`."""
+    portfolio = await load_portfolio(portfolio_id, user_id)
+    if portfolio is None:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    if version is not None and portfolio.get("version") != version:
+        raise precondition_failed(portfolio)
+    return portfolio
+
 @router.put("/{portfolio_id}")
 async def update_portfolio(
     portfolio_id: str, 
     portfolio_data: PortfolioUpdate, 
-    user=Depends(verify_token)
+    user=Depends(verify_token),
+    if_match: Optional[str] = Header(None),
 ):
-    """Update a portfolio"""
+    """Update a portfolio; with If-Match, only if it is still at that ETag"""
     try:
         supabase = get_supabase_client()
+        version = expected_version(if_match)
         
-        # Verify ownership
-        existing = supabase.table("portfolios")\
-            .select("*")\
-            .eq("id", portfolio_id)\
-            .eq("user_id", user.id)\
-            .execute()
-        
-        if not existing.data or len(existing.data) == 0:
-            raise HTTPException(status_code=404, detail="Portfolio not found")
-        
-        # Update portfolio
         portfolio_dict = portfolio_data.model_dump(exclude_unset=True)
+        if not portfolio_dict:
+            portfolio = await check_unchanged(portfolio_id, user.id, version)
+            return FastJSONResponse(content=portfolio, headers=etag_headers(portfolio))
         
-        response = supabase.table("portfolios")\
+        # Ownership (and the version, when given) is part of the filter: no
+        # row back means not found or modified in the meantime
+        query = supabase.table("portfolios")\
             .update(portfolio_dict)\
             .eq("id", portfolio_id)\
-            .eq("user_id", user.id)\
-            .execute()
+            .eq("user_id", user.id)
+        if version is not None:
+            query = query.eq("version", version)
+        response = await query.execute()
         
         if not response.data or len(response.data) == 0:
-            raise HTTPException(status_code=500, detail="Failed to update portfolio")
-            
-        return response.data[0]
+            await read_cache.invalidate(user.id, "portfolios")
+            await check_unchanged(portfolio_id, user.id, version)
+            raise precondition_failed()
+        
+        portfolio = response.data[0]
+        await read_cache.invalidate(user.id, "portfolios")
+        await sync_portfolio_snapshot(supabase, portfolio)
+        return FastJSONResponse(content=portfolio, headers=etag_headers(portfolio))
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error updating portfolio: {str(e)}")
+        logger.exception("Error updating portfolio")
         raise HTTPException(status_code=500, detail=f"Error updating portfolio: {str(e)}")
 
+@router.patch("/{portfolio_id}")
+async def patch_portfolio(
+    portfolio_id: str,
+    request: Request,
+    user=Depends(verify_token),
+    if_match: Optional[str] = Header(None),
+    prefer: Optional[str] = Header(None),
+):
+    """Apply a JSON merge patch (RFC 7396, application/merge-patch+json).
+
+    Only the changed parts are sent: top-level fields replace the stored
+    values and `data` is merged into the stored document in the database,
+    with null removing a key. With If-Match, the patch applies only if the
+    portfolio is still at that ETag (412 otherwise). `Prefer: return=minimal`
+    answers 204 with just the new ETag.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != MERGE_PATCH_TYPE:
+        raise HTTPException(status_code=415, detail=f"PATCH takes {MERGE_PATCH_TYPE}", headers={"Accept-Patch": MERGE_PATCH_TYPE})
+    try:
+        patch = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON in merge patch.")
+
+    fields, data_patch = split_merge_patch(patch)
+    version = expected_version(if_match)
+
+    try:
+        supabase = get_supabase_client()
+
+        if not fields and data_patch is None:
+            portfolio = await check_unchanged(portfolio_id, user.id, version)
+        else:
+            response = await supabase.rpc(
+                "patch_portfolio",
+                {
+                    "p_portfolio_id": portfolio_id,
+                    "p_user_id": user.id,
+                    "p_fields": fields,
+                    "p_data_patch": data_patch,
+                    "p_expected_version": version,
+                },
+            ).execute()
+
+            if not response.data or len(response.data) == 0:
+                raise HTTPException(status_code=404, detail="Portfolio not found")
+
+            portfolio = response.data[0]
+            await read_cache.invalidate(user.id, "portfolios")
+            await sync_portfolio_snapshot(supabase, portfolio)
+    except APIError as e:
+        if e.code == VERSION_CONFLICT:
+            # The function reports the current version as the error detail
+            await read_cache.invalidate(user.id, "portfolios")
+            raise precondition_failed({"version": e.details} if str(e.details).isdigit() else None)
+        logger.exception("Error patching portfolio")
+        raise HTTPException(status_code=500, detail=f"Error patching portfolio: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error patching portfolio")
+        raise HTTPException(status_code=500, detail=f"Error patching portfolio: {str(e)}")
+
+    if prefer and "return=minimal" in prefer:
+        return Response(status_code=204, headers=etag_headers(portfolio))
+    return FastJSONResponse(content=portfolio, headers=etag_headers(portfolio))
+
 @router.delete("/{portfolio_id}")
 async def delete_portfolio(portfolio_id: str, user=Depends(verify_token)):
     """Delete a portfolio"""
     try:
         supabase = get_supabase_client()
         
-        # Verify ownership before deleting
-        existing = supabase.table("portfolios")\
-            .select("*")\
-            .eq("id", portfolio_id)\
-            .eq("user_id", user.id)\
-            .execute()
+        # Ownership is part of the filter: no row back means not found
+        response = await supabase.table("portfolios").delete().eq("id", portfolio_id).eq("user_id", user.id).execute()
         
-        if not existing.data or len(existing.data) == 0:
+        if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Portfolio not found")
         
-        supabase.table("portfolios").delete().eq("id", portfolio_id).eq("user_id", user.id).execute()
+        await read_cache.invalidate(user.id, "portfolios")
+        # The snapshot row goes with the portfolio (ON DELETE CASCADE)
+        if response.data[0].get("slug"):
+            snapshot_store.forget(response.data[0]["slug"])
         
         return {"success": True, "message": "Portfolio deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error deleting portfolio: {str(e)}")
+        logger.exception("Error deleting portfolio")
         raise HTTPException(status_code=500, detail=f"Error deleting portfolio: {str(e)}")
 
 @router.patch("/{portfolio_id}/publish")
@@ -138,32 +257,22 @@ async def toggle_publish_portfolio(portfolio_id: str, user=Depends(verify_token)
     try:
         supabase = get_supabase_client()
         
-        # Get current status
-        existing = supabase.table("portfolios")\
-            .select("is_published")\
-            .eq("id", portfolio_id)\
-            .eq("user_id", user.id)\
-            .execute()
+        # Flip the flag in SQL so concurrent toggles can't both read the same value
+        response = await supabase.rpc(
+            "toggle_portfolio_published",
+            {"p_portfolio_id": portfolio_id, "p_user_id": user.id},
+        ).execute()
         
-        if not existing.data or len(existing.data) == 0:
+        if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Portfolio not found")
         
-        # Toggle publish status
-        new_status = not existing.data[0].get("is_published", False)
-        
-        response = supabase.table("portfolios")\
-            .update({"is_published": new_status})\
-            .eq("id", portfolio_id)\
-            .eq("user_id", user.id)\
-            .execute()
-        
-        if not response.data or len(response.data) == 0:
-            raise HTTPException(status_code=500, detail="Failed to update portfolio")
-            
-        return {"success": True, "is_published": new_status}
+        await read_cache.invalidate(user.id, "portfolios")
+        portfolio = response.data[0]
+        await sync_portfolio_snapshot(supabase, portfolio)
+        return {"success": True, "is_published": portfolio["is_published"], "slug": portfolio.get("slug")}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error toggling publish status: {str(e)}")
+        logger.exception("Error toggling publish status")
         raise HTTPException(status_code=500, detail=f"Error toggling publish status: {str(e)}")
 
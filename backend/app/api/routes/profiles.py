@@ -1,24 +1,33 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
+from postgrest.exceptions import APIError
 from app.api.deps import verify_token
+from app.core.json_response import FastJSONResponse
+from app.core.read_cache import read_cache
 from app.core.supabase_client import get_supabase_client
 from app.models.profiles import ProfileCreate, ProfileUpdate, Profile
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
+UNIQUE_VIOLATION = "23505"
+
 @router.get("/me")
 async def get_my_profile(user=Depends(verify_token)):
     """Get the current user's profile"""
     try:
         supabase = get_supabase_client()
-        response = supabase.table("profiles").select("*").eq("user_id", user.id).execute()
-        
-        if not response.data or len(response.data) == 0:
-            return None
-            
-        return response.data[0]
+
+        async def load():
+            response = await supabase.table("profiles").select("*").eq("user_id", user.id).execute()
+            return response.data[0] if response.data else None
+
+        return FastJSONResponse(content=await read_cache.get_or_load(user.id, "profiles", ("me",), load))
     except Exception as e:
-        print(f"Error fetching profile: {str(e)}")
+        logger.exception("Error fetching profile")
         raise HTTPException(status_code=500, detail=f"Error fetching profile: {str(e)}")
 
 @router.post("/me")
@@ -27,26 +36,27 @@ async def create_my_profile(profile_data: ProfileCreate, user=Depends(verify_tok
     try:
         supabase = get_supabase_client()
         
-        # Check if profile already exists
-        existing = supabase.table("profiles").select("*").eq("user_id", user.id).execute()
-        if existing.data and len(existing.data) > 0:
-            raise HTTPException(status_code=400, detail="Profile already exists. Use PUT to update.")
-        
-        # Create profile
         profile_dict = profile_data.model_dump(exclude_unset=True)
         profile_dict["user_id"] = user.id
         profile_dict["email"] = user.email
         
-        response = supabase.table("profiles").insert(profile_dict).execute()
+        # The UNIQUE(user_id) constraint rejects a second profile
+        try:
+            response = await supabase.table("profiles").insert(profile_dict).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(status_code=400, detail="Profile already exists. Use PUT to update.")
+            raise
+        await read_cache.invalidate(user.id, "profiles")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=500, detail="Failed to create profile")
             
-        return response.data[0]
+        return FastJSONResponse(content=response.data[0])
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error creating profile: {str(e)}")
+        logger.exception("Error creating profile")
         raise HTTPException(status_code=500, detail=f"Error creating profile: {str(e)}")
 
 @router.put("/me")
@@ -55,32 +65,31 @@ async def update_my_profile(profile_data: ProfileUpdate, user=Depends(verify_tok
     try:
         supabase = get_supabase_client()
         
-        # Check if profile exists
-        existing = supabase.table("profiles").select("*").eq("user_id", user.id).execute()
-        if not existing.data or len(existing.data) == 0:
-            # Create profile if it doesn't exist
-            profile_dict = profile_data.model_dump(exclude_unset=True)
-            profile_dict["user_id"] = user.id
-            profile_dict["email"] = user.email
-            
-            response = supabase.table("profiles").insert(profile_dict).execute()
-            if not response.data or len(response.data) == 0:
-                raise HTTPException(status_code=500, detail="Failed to create profile")
-            return response.data[0]
-        
-        # Update existing profile
+        # Update only the sent fields; create the profile if there is none,
+        # taking the email from the account (an existing one keeps its own)
         profile_dict = profile_data.model_dump(exclude_unset=True)
         
-        response = supabase.table("profiles").update(profile_dict).eq("user_id", user.id).execute()
+        response = await supabase.table("profiles").update(profile_dict).eq("user_id", user.id).execute()
+        if not response.data:
+            try:
+                response = await supabase.table("profiles").insert(
+                    {**profile_dict, "user_id": user.id, "email": user.email}
+                ).execute()
+            except APIError as e:
+                # Created concurrently since the update: update that one
+                if e.code != UNIQUE_VIOLATION:
+                    raise
+                response = await supabase.table("profiles").update(profile_dict).eq("user_id", user.id).execute()
+        await read_cache.invalidate(user.id, "profiles")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=500, detail="Failed to update profile")
             
-        return response.data[0]
+        return FastJSONResponse(content=response.data[0])
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error updating profile: {str(e)}")
+        logger.exception("Error updating profile")
         raise HTTPException(status_code=500, detail=f"Error updating profile: {str(e)}")
 
 @router.delete("/me")
@@ -89,7 +98,8 @@ async def delete_my_profile(user=Depends(verify_token)):
     try:
         supabase = get_supabase_client()
         
-        response = supabase.table("profiles").delete().eq("user_id", user.id).execute()
+        response = await supabase.table("profiles").delete().eq("user_id", user.id).execute()
+        await read_cache.invalidate(user.id, "profiles")
         
         return {"success": True, "message": "Profile deleted successfully"}
     except Exception as e:
@@ -0,0 +1,37 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse
+
+from app.core.portfolio_snapshots import public_cache_control, snapshot_store
+from app.core.storage_stream import etag_matches
+
+
+router = APIRouter(prefix="/p", tags=["public"])
+
+@router.get("/{slug}")
+async def get_published_portfolio(slug: str, request: Request, format: Literal["html", "json"] = "html"):
+    """Serve a published portfolio from its pre-rendered snapshot.
+
+    No authentication. `format=json` returns the view model instead of the
+    rendered page. Responses carry a strong ETag and are cacheable by CDNs.
+    """
+    try:
+        snapshot = await snapshot_store.get(slug)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching portfolio: {str(e)}")
+
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    etag = snapshot.json_etag if format == "json" else snapshot.html_etag
+    headers = {"ETag": etag, "Cache-Control": public_cache_control()}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if format == "json":
+        return Response(content=snapshot.view_json, media_type="application/json", headers=headers)
+    return HTMLResponse(content=snapshot.html, headers=headers)
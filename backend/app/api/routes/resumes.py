@@ -1,76 +1,328 @@
+import asyncio
+import json
+import time
 import uuid
+from contextlib import AsyncExitStack
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse, Response
-from starlette.status import HTTP_201_CREATED
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.status import HTTP_201_CREATED, HTTP_202_ACCEPTED
 
 from app.api.deps import verify_token
+from app.core.bulk_import import bulk_import, collect_uploads
+from app.core.config import settings
+from app.core.job_queue import get_job_queue
+from app.core.json_response import FastJSONResponse
+from app.core.metrics import RESUME_STREAM_SECONDS
+from app.core.pagination import keyset_page, select_columns, split_page
+from app.core.read_cache import read_cache
+from app.core.resume_diff import section_fingerprints
+from app.core.resume_prefill import extract_prefill
+from app.core.resume_stream import FieldTracker
+from app.core.resume_pipeline import (
+    ALLOWED_TYPES,
+    insert_resume,
+    parse_text,
+    remove_file,
+    reparse_text,
+    resume_file_path,
+    store_file,
+)
+from app.core.storage_stream import object_key, object_meta_cache, stream_object
 from app.core.supabase_client import get_supabase_client
 from app.core.text_extract import extract_text_from_upload
-from app.core.resume_parser import parse_resume_with_openai
-from app.models.resumes import ResumeSchema, Resume
+from app.core.uploads import spooled_upload
+from app.models.resumes import ResumeSchema, Resume, ResumeJob
 
 
 router = APIRouter(prefix="/resumes", tags=["resumes"])
 
+SUMMARY_COLUMNS = ("id", "title", "created_at")
+LIST_FIELDS = frozenset({"user_id", "file_path", "data", "previous_id"})
+
 @router.get("/")
-async def list_resumes(user=Depends(verify_token), limit: int = 50, offset: int = 0):
-    """List all resumes for the authenticated user."""
+async def list_resumes(
+    user=Depends(verify_token),
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """List resume summaries for the authenticated user, newest first.
+
+    Pass `fields=data,...` for extra columns. When there are more results the
+    X-Next-Cursor header holds the `cursor` for the next page.
+    """
+    columns = select_columns(SUMMARY_COLUMNS, LIST_FIELDS, fields)
 
     try:
         supabase = get_supabase_client()
-        response = supabase.table("resumes")\
-            .select("*")\
-            .eq("user_id", user.id)\
-            .order("created_at", desc=True)\
-            .limit(limit)\
-            .offset(offset)\
-            .execute()
-
-        return response.data
+
+        async def load():
+            query = supabase.table("resumes").select(columns).eq("user_id", user.id)
+            response = await keyset_page(query, limit, cursor).execute()
+            return response.data
+
+        rows = await read_cache.get_or_load(user.id, "resumes", ("list", limit, cursor, columns), load)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
+
+    page, next_cursor = split_page(rows, limit)
+    return FastJSONResponse(content=page, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+@router.post("/jobs", status_code=HTTP_202_ACCEPTED)
+async def submit_resume_job(
+    file: UploadFile = File(...),
+    no_cache: bool = False,
+    user=Depends(verify_token),
+):
+    """Store the upload and queue it for background parsing.
+
+    Returns 202 with a job ID; poll GET /resumes/jobs/{job_id} for progress.
+    """
+    supabase = get_supabase_client()
+
+    if not file.filename:
+        raise HTTPException(400, "No file uploaded.")
+    if file.content_type not in ALLOWED_TYPES:
+        raise HTTPException(400, "Only PDF and DOCX files are allowed.")
+
+    resume_id = str(uuid.uuid4())
+    file_path = resume_file_path(user.id, resume_id, file.content_type)
+
+    async with spooled_upload(file, settings.resume_max_bytes) as upload:
+        await store_file(supabase, file_path, upload.source, file.content_type)
+
+    try:
+        job = await get_job_queue().submit(ResumeJob(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            title=file.filename,
+            file_path=file_path,
+            content_type=file.content_type,
+            resume_id=resume_id,
+            use_cache=not no_cache,
+        ))
+    except Exception as e:
+        await remove_file(supabase, file_path)
+        raise HTTPException(status_code=500, detail=f"Failed to queue resume: {str(e)}")
+
+    return FastJSONResponse(
+        status_code=HTTP_202_ACCEPTED,
+        content=job.model_dump(mode="json"),
+        headers={"Location": f"/resumes/jobs/{job.id}"},
+    )
+
+@router.post("/bulk")
+async def bulk_upload_resumes(
+    files: List[UploadFile] = File(...),
+    no_cache: bool = False,
+    fast: bool = False,
+    user=Depends(verify_token),
+):
+    """Import many resumes (PDF/DOCX files and/or zip archives) at once.
+
+    Streams newline-delimited JSON progress events; the last one is a
+    summary with a result for every file. `fast=true` skips the LLM (see
+    upload_resume).
+    """
+    supabase = get_supabase_client()
+
+    stack = AsyncExitStack()
+    try:
+        uploads, rejected = await collect_uploads(files, stack)
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def events():
+        async with stack:
+            async for event in bulk_import(supabase, user.id, uploads, rejected, use_cache=not no_cache, fast=fast):
+                yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/stream")
+async def upload_resume_stream(
+    file: UploadFile = File(...),
+    no_cache: bool = False,
+    fast: bool = False,
+    user=Depends(verify_token),
+):
+    """Upload and parse a resume, streaming the parse as Server-Sent Events.
+
+    Events: `stage` as extraction and parsing start, `prefill` with the
+    contact details, education and skills read by rules right after
+    extraction, `field` for each part of the resume as soon as the model has
+    generated it (name and contact details first), then `done` with the
+    stored resume row and timings, or `error` with a status and detail.
+    Prefill and field values are provisional; the row in `done` is the
+    validated result. `fast=true` skips the LLM (see upload_resume).
+    """
+    supabase = get_supabase_client()
+
+    if not file.filename:
+        raise HTTPException(400, "No file uploaded.")
+    if file.content_type not in ALLOWED_TYPES:
+        raise HTTPException(400, "Only PDF and DOCX files are allowed.")
+
+    resume_id = str(uuid.uuid4())
+    file_path = resume_file_path(user.id, resume_id, file.content_type)
+
+    stack = AsyncExitStack()
+    try:
+        upload = await stack.enter_async_context(spooled_upload(file, settings.resume_max_bytes))
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def events():
+        queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        tracker = FieldTracker(lambda path, value: queue.put_nowait(sse_event("field", {
+            "path": path,
+            "value": value,
+            "elapsed_ms": round((time.perf_counter() - tracker.started) * 1000, 1),
+        })))
+
+        async def run():
+            uploaded = False
+            try:
+                async with stack:
+                    queue.put_nowait(sse_event("stage", {"stage": "extracting"}))
+                    text = await extract_text_from_upload(upload)
+                    prefill = extract_prefill(text)
+                    queue.put_nowait(sse_event("prefill", {
+                        "fields": prefill.fields(),
+                        "elapsed_ms": round((time.perf_counter() - tracker.started) * 1000, 1),
+                    }))
+                    queue.put_nowait(sse_event("stage", {"stage": "parsing"}))
+                    parsed_resume = await parse_text(
+                        text, use_cache=not no_cache, tracker=tracker, prefill=prefill, fast=fast
+                    )
+
+                    await store_file(supabase, file_path, upload.source, file.content_type)
+                    uploaded = True
+
+                row = await insert_resume(supabase, Resume(
+                    id=resume_id,
+                    user_id=user.id,
+                    title=file.filename,
+                    file_path=file_path,
+                    data=parsed_resume,
+                    section_fingerprints=None if fast else section_fingerprints(text),
+                ))
+
+                total = time.perf_counter() - tracker.started
+                first_field = tracker.time_to_first_field
+                RESUME_STREAM_SECONDS.labels("total").observe(total)
+                if first_field is not None:
+                    RESUME_STREAM_SECONDS.labels("first_field").observe(first_field)
+                queue.put_nowait(sse_event("done", {
+                    "resume": row,
+                    "timings": {
+                        "first_field_ms": None if first_field is None else round(first_field * 1000, 1),
+                        "total_ms": round(total * 1000, 1),
+                    },
+                }))
+            except asyncio.CancelledError:
+                if uploaded:
+                    await remove_file(supabase, file_path)
+                raise
+            except Exception as e:
+                if uploaded:
+                    await remove_file(supabase, file_path)
+                if isinstance(e, HTTPException):
+                    status, detail = e.status_code, e.detail
+                else:
+                    status, detail = 500, f"Upload failed: {str(e)}"
+                queue.put_nowait(sse_event("error", {"status": status, "detail": detail}))
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            # The client went away mid-parse
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            await stack.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/jobs/{job_id}")
+async def get_resume_job(job_id: str, user=Depends(verify_token)):
+    """Report the status of a background parsing job."""
+
+    try:
+        job = await get_job_queue().get(job_id, user.id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
 
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return FastJSONResponse(content=job.model_dump(mode="json"))
+
 @router.get("/{resume_id}")
 async def get_resume(resume_id: str, user=Depends(verify_token)):
     """Get a specific resume by ID for the authenticated user."""
 
     try:
         supabase = get_supabase_client()
-        response = supabase.from_("resumes").select("*").eq("id", resume_id).eq("user_id", user.id).execute()
 
-        if not response.data or len(response.data) == 0:
-            raise HTTPException(status_code=404, detail="Resume not found")
+        async def load():
+            response = await supabase.from_("resumes").select("*").eq("id", resume_id).eq("user_id", user.id).execute()
+            return response.data[0] if response.data else None
 
-        return response.data[0]
+        resume = await read_cache.get_or_load(user.id, "resumes", ("item", resume_id), load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
 
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    return FastJSONResponse(content=resume)
+
 @router.get("/{resume_id}/download")
-async def download_resume(resume_id: str, user=Depends(verify_token)):
-    """Download the resume file by ID for the authenticated user."""
+async def download_resume(resume_id: str, request: Request, user=Depends(verify_token)):
+    """Download the resume file by ID for the authenticated user.
+
+    The file is streamed from storage; Range and If-None-Match are supported.
+    """
 
     try:
         supabase = get_supabase_client()
-        response = supabase.from_("resumes").select("*").eq("id", resume_id).eq("user_id", user.id).execute()
+        # Only the columns needed to find the file, used as-is: validating the
+        # whole row would parse the resume document for nothing
+        response = await supabase.from_("resumes").select("title,file_path").eq("id", resume_id).eq("user_id", user.id).execute()
 
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Resume not found")
 
-        resume = Resume.model_validate(response.data[0])
-        file_path = resume.file_path
-
-        download_response = supabase.storage.from_("users").download(file_path)
+        resume = response.data[0]
 
-        if not download_response:
-            raise HTTPException(status_code=404, detail="File not found in storage")
-
-        return Response(
-            content=download_response,
-            media_type="application/octet-stream",
-            headers={"Content-Disposition": f"attachment; filename={resume.title}"}
+        return await stream_object(
+            request,
+            "users",
+            resume["file_path"],
+            cache_control="private, no-cache",
+            filename=resume["title"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
 
@@ -80,96 +332,116 @@ async def delete_resume(resume_id: str, user=Depends(verify_token)):
 
     try:
         supabase = get_supabase_client()
-        response = supabase.from_("resumes").select("*").eq("id", resume_id).eq("user_id", user.id).execute()
+
+        # Row first: if removing the file fails the resume is still gone,
+        # rather than left pointing at a missing file
+        response = await supabase.from_("resumes").delete().eq("id", resume_id).eq("user_id", user.id).execute()
 
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Resume not found")
 
-        resume = Resume.model_validate(response.data[0])
-        file_path = resume.file_path
-
-        # Delete from storage
-        supabase.storage.from_("users").remove([file_path])
+        await read_cache.invalidate(user.id, "resumes")
 
-        # Delete from database
-        supabase.from_("resumes").delete().eq("id", resume_id).eq("user_id", user.id).execute()
+        file_path = response.data[0]["file_path"]
+        await supabase.storage.from_("users").remove([file_path])
+        object_meta_cache.invalidate(object_key("users", file_path))
 
         return Response(status_code=204)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
 
 
 
+async def get_previous_version(supabase, previous_id: str, user_id: str) -> Resume:
+    try:
+        response = await supabase.from_("resumes").select("*").eq("id", previous_id).eq("user_id", user_id).execute()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
+    if not response.data:
+        raise HTTPException(status_code=404, detail="Previous resume not found")
+    return Resume.model_validate(response.data[0])
+
+
 @router.post("/", status_code=HTTP_201_CREATED)
 async def upload_resume(
     file: UploadFile = File(...),
+    no_cache: bool = False,
+    previous_id: Optional[str] = None,
+    fast: bool = False,
     user=Depends(verify_token),
 ):
-    supabase = get_supabase_client()
+    """Upload and parse a resume.
 
-    allowed_types = {
-        "application/pdf": ".pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
-    }
+    Pass `previous_id` when this is a new version of an existing resume: only
+    the sections that changed since that version are re-parsed. `fast=true`
+    skips the LLM: the resume holds only what rules can read (name, contact
+    details, education, skills, summary), with no experience or projects.
+    """
+    supabase = get_supabase_client()
 
     if not file.filename:
         raise HTTPException(400, "No file uploaded.")
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_TYPES:
         raise HTTPException(400, "Only PDF and DOCX files are allowed.")
 
-    ext = allowed_types[file.content_type]
-    resume_id = str(uuid.uuid4())
-    file_path = f"{user.id}/resumes/{resume_id}{ext}"
+    previous = await get_previous_version(supabase, previous_id, user.id) if previous_id else None
 
-    file_bytes = await file.read()
-
-    text = extract_text_from_upload(file, file_bytes)
+    resume_id = str(uuid.uuid4())
+    file_path = resume_file_path(user.id, resume_id, file.content_type)
 
-    uploaded = False  # Track if storage file exists
+    async with spooled_upload(file, settings.resume_max_bytes) as upload:
 
-    try:
+        text = await extract_text_from_upload(upload)
 
-        # Parse resume with OpenAI
-        parsed_resume: ResumeSchema = parse_resume_with_openai(text)
-
-        # Upload file to Supabase Storage
-        supabase.storage.from_("users").upload(
-            file_path,
-            file_bytes,
-            {
-                "content-type": file.content_type
-            }
-        )
+        uploaded = False  # Track if storage file exists
 
-        uploaded = True
+        try:
 
-        # Insert row into database
-        resume_entry = Resume(
-            id=resume_id,
-            user_id=user.id,
-            title=file.filename,
-            file_path=file_path,
-            data=parsed_resume,
+            # Parse resume with OpenAI
+            if fast:
+                parsed_resume = await parse_text(text, fast=True)
+                # Without fingerprints the next version gets a full parse
+                # rather than keeping this one's empty sections
+                fingerprints = None
+            elif previous is not None and previous.data is not None:
+                parsed_resume, fingerprints = await reparse_text(
+                    text, previous.data, previous.section_fingerprints, use_cache=not no_cache
                 )
-
-        payload = resume_entry.model_dump()
-
-        result = supabase.table("resumes").insert(payload).execute()
-        if not result.data or len(result.data) == 0:
-            raise Exception("No data returned from insert.")
-
-        return JSONResponse(status_code=HTTP_201_CREATED, content=result.data[0])
-
-    except Exception as e:
-        # Roll back storage file if created
-        if uploaded:
-            try:
-                supabase.storage.from_("users").remove([file_path])
-            except:
-                pass
-
-        raise HTTPException(
-            status_code=500,
-            detail=f"Upload failed: {str(e)}"
-        )
+            else:
+                parsed_resume: ResumeSchema = await parse_text(text, use_cache=not no_cache)
+                fingerprints = section_fingerprints(text)
+
+            # Upload file to Supabase Storage
+            await store_file(supabase, file_path, upload.source, file.content_type)
+
+            uploaded = True
+
+            # Insert row into database
+            resume_entry = Resume(
+                id=resume_id,
+                user_id=user.id,
+                title=file.filename,
+                file_path=file_path,
+                data=parsed_resume,
+                previous_id=previous_id,
+                section_fingerprints=fingerprints,
+                    )
+
+            row = await insert_resume(supabase, resume_entry)
+
+            return FastJSONResponse(status_code=HTTP_201_CREATED, content=row)
+
+        except Exception as e:
+            # Roll back storage file if created
+            if uploaded:
+                await remove_file(supabase, file_path)
+
+            if isinstance(e, HTTPException):
+                raise
+            raise HTTPException(
+                status_code=500,
+                detail=f"Upload failed: {str(e)}"
+            )
@@ -0,0 +1,60 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.deps import verify_token
+from app.core.json_response import FastJSONResponse
+from app.core.pagination import check_limit, decode_ranked_cursor, encode_ranked_cursor, split_page
+from app.core.supabase_client import get_supabase_client
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+KINDS = ("resume", "portfolio")
+MAX_QUERY_LENGTH = 256
+MAX_SKILLS = 20
+
+@router.get("/")
+async def search(
+    user=Depends(verify_token),
+    q: Optional[str] = None,
+    skills: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+):
+    """Search the current user's resumes and portfolios, best match first.
+
+    `q` takes web-search syntax ("quoted phrase", OR, -word) over skills,
+    summaries, experience and projects. `skills=python,go` keeps only
+    entries listing all of those skills. `kind` narrows to resume or
+    portfolio. When there are more results the X-Next-Cursor header holds
+    the `cursor` for the next page.
+    """
+    check_limit(limit)
+    if q is not None and len(q) > MAX_QUERY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"q must be at most {MAX_QUERY_LENGTH} characters")
+    skill_list = sorted({s.strip().lower() for s in skills.split(",") if s.strip()}) if skills else []
+    if len(skill_list) > MAX_SKILLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SKILLS} skills")
+    if not (q and q.strip()) and not skill_list:
+        raise HTTPException(status_code=400, detail="Pass q and/or skills")
+    if kind is not None and kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(KINDS)}")
+
+    params = {
+        "p_user_id": user.id,
+        "p_query": q,
+        "p_skills": skill_list or None,
+        "p_kinds": [kind] if kind else list(KINDS),
+        "p_limit": limit + 1,
+    }
+    if cursor:
+        params["p_after_rank"], params["p_after_created_at"], params["p_after_id"] = decode_ranked_cursor(cursor)
+
+    try:
+        response = await get_supabase_client().rpc("search_documents", params).execute()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+    page, next_cursor = split_page(response.data or [], limit, encode_ranked_cursor)
+    return FastJSONResponse(content=page, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
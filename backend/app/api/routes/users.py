@@ -1,22 +1,40 @@
-from fastapi import APIRouter, UploadFile, File, Depends, Response, HTTPException
-
-from app.api.deps import verify_token
+import asyncio
+import hashlib
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Depends, Request, Response, HTTPException
+
+from app.api.deps import verify_token, verify_token_remote
+from app.core.config import settings
+from app.core.executors import run_in_process, run_stage
+from app.core.images import PFP_PIPELINE_VERSION, pick_size, process_profile_picture
+from app.core.json_response import FastJSONResponse
+from app.core.read_cache import read_cache
+from app.core.storage_stream import object_key, object_meta_cache, stream_object
 from app.core.supabase_client import get_supabase_client
+from app.core.uploads import spooled_upload
 from app.models.users import UserUpdate
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/")
 async def read_user(user=Depends(verify_token)):
     supabase = get_supabase_client()
-    response = supabase.table("users").select("*").eq("id", user.id).execute()
-    return {"success": True, "data": response.data[0] if response.data else None}
+
+    async def load():
+        response = await supabase.table("users").select("*").eq("id", user.id).execute()
+        return response.data[0] if response.data else None
+
+    data = await read_cache.get_or_load(user.id, "users", ("me",), load)
+    return FastJSONResponse(content={"success": True, "data": data})
 
 @router.patch("/")
 async def patch_user(
     payload: UserUpdate,
-    user=Depends(verify_token)
+    user=Depends(verify_token_remote)
 ):
     try:
         supabase = get_supabase_client()
@@ -27,13 +45,14 @@ async def patch_user(
         if not update_data:
             raise HTTPException(400, "No fields provided to update")
 
-        response = (
+        response = await (
             supabase
             .from_("users")
             .update(update_data)
             .eq("id", user.id)
             .execute()
         )
+        await read_cache.invalidate(user.id, "users")
         return Response(status_code=200, content=f"User updated successfully : {response.data}")
 
     except HTTPException:
@@ -41,31 +60,89 @@ async def patch_user(
     except Exception as e:
         raise HTTPException(500, f"Supabase error: {str(e)}")
 
+async def current_pfp_hash(user_id: str) -> Optional[str]:
+    supabase = get_supabase_client()
+
+    async def load():
+        response = await supabase.table("users").select("pfp_hash").eq("id", user_id).execute()
+        return response.data[0]["pfp_hash"] if response.data else None
+
+    return await read_cache.get_or_load(user_id, "users", ("pfp",), load)
+
+def pfp_variant_path(user_id: str, pfp_hash: str, size: int) -> str:
+    return f"{user_id}/profile/{pfp_hash}/{size}.webp"
+
 @router.post("/pfp")
 async def upload_pfp(file: UploadFile = File(...), user=Depends(verify_token)):
-    """Endpoint to upload profile picture to Supabase Storage"""
+    """Upload a profile picture.
+
+    The image is re-encoded (EXIF stripped, downscaled) into WebP variants for
+    each configured size, stored under a content-hash path.
+    """
 
     try:
-        contents = await file.read()
         if file.content_type not in ["image/jpeg", "image/png"]:
             return {"error": "Unsupported file type. Please upload a JPEG or PNG image."}
 
 
         supabase = get_supabase_client()
-
-
-        path = f"{user.id}/profile/profile_picture"
-
-        supabase.storage.from_("users").update(
-            path,
-            file=contents,
-            file_options={
-                "upsert": "true",
-                "content-type": file.content_type,
-                }
-        )
-
-        return Response(status_code=201)
+        sizes = settings.pfp_sizes
+
+        async with spooled_upload(file, settings.pfp_max_bytes) as upload:
+            try:
+                variants = await run_stage(
+                    "Image processing",
+                    run_in_process(
+                        process_profile_picture,
+                        upload.source,
+                        sizes,
+                        settings.pfp_quality,
+                        settings.pfp_max_pixels,
+                    ),
+                    settings.pfp_process_timeout,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
+
+            pfp_hash = hashlib.sha256(
+                f"{PFP_PIPELINE_VERSION}:{sorted(sizes)}:{settings.pfp_quality}:{upload.sha256}".encode()
+            ).hexdigest()[:16]
+
+        previous_hash = await current_pfp_hash(user.id)
+
+        await asyncio.gather(*(
+            supabase.storage.from_("users").upload(
+                pfp_variant_path(user.id, pfp_hash, size),
+                file=data,
+                file_options={
+                    "upsert": "true",
+                    "content-type": "image/webp",
+                    "cache-control": str(settings.pfp_immutable_cache_seconds),
+                },
+            )
+            for size, data in variants.items()
+        ))
+
+        await supabase.table("users").update({"pfp_hash": pfp_hash}).eq("id", user.id).execute()
+        await read_cache.invalidate(user.id, "users")
+
+        # Drop the replaced variants and any legacy unprocessed original
+        if previous_hash != pfp_hash:
+            stale = [f"{user.id}/profile/profile_picture"]
+            if previous_hash:
+                stale += [pfp_variant_path(user.id, previous_hash, size) for size in sizes]
+            try:
+                await supabase.storage.from_("users").remove(stale)
+            except Exception:
+                logger.exception("Error removing old profile pictures")
+            object_meta_cache.invalidate(object_key("users", stale[0]))
+
+        return FastJSONResponse(status_code=201, content={
+            "hash": pfp_hash,
+            "urls": {str(size): f"/users/pfp/{pfp_hash}/{size}" for size in sorted(sizes)},
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -73,33 +150,69 @@ async def upload_pfp(file: UploadFile = File(...), user=Depends(verify_token)):
         )
 
 @router.get("/pfp")
-def get_profile_picture(user=Depends(verify_token)):
-    supabase = get_supabase_client()
+async def get_profile_picture(request: Request, size: Optional[int] = None, user=Depends(verify_token)):
+    """Serve the current profile picture at the smallest variant >= `size`.
 
+    Content-Location points at the immutable content-hash URL for that variant.
+    """
     try:
-        path = f"{user.id}/profile/"
-        files = supabase.storage.from_("users").list(
-            path,
-            options={"limit": 1, "search": "profile_picture"}
+        pfp_hash = await current_pfp_hash(user.id)
+        cache_control = f"private, max-age={settings.pfp_cache_seconds}"
+
+        if pfp_hash is None:
+            # Uploaded before processing existed: only the original is stored
+            return await stream_object(
+                request,
+                "users",
+                f"{user.id}/profile/profile_picture",
+                cache_control=cache_control,
+            )
+
+        variant = pick_size(settings.pfp_sizes, size)
+        response = await stream_object(
+            request,
+            "users",
+            pfp_variant_path(user.id, pfp_hash, variant),
+            cache_control=cache_control,
         )
-        if not files:
+        response.headers["Content-Location"] = f"/users/pfp/{pfp_hash}/{variant}"
+        return response
+
+    except HTTPException as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Profile picture not found")
+        raise
 
-        mimetype = files[0]["metadata"]["mimetype"]
+    except Exception:
+        logger.exception("Error retrieving profile picture")
 
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve profile picture"
+        )
 
-        resp = supabase.storage.from_("users").download(path + "profile_picture")
+@router.get("/pfp/{pfp_hash}/{size}")
+async def get_profile_picture_variant(pfp_hash: str, size: int, request: Request, user=Depends(verify_token)):
+    """Serve one processed variant by content hash; safe to cache forever."""
 
-        if resp is None:
-            raise HTTPException(status_code=404, detail="Profile picture missing")
+    if size not in settings.pfp_sizes or not pfp_hash.isalnum():
+        raise HTTPException(status_code=404, detail="Profile picture not found")
 
-        return Response(content=resp, media_type=mimetype)
+    try:
+        return await stream_object(
+            request,
+            "users",
+            pfp_variant_path(user.id, pfp_hash, size),
+            cache_control=f"private, max-age={settings.pfp_immutable_cache_seconds}, immutable",
+        )
 
-    except HTTPException:
+    except HTTPException as e:
+        if e.status_code == 404:
+            raise HTTPException(status_code=404, detail="Profile picture not found")
         raise
 
-    except Exception as e:
-        print(f"Error retrieving profile picture: {str(e)}")
+    except Exception:
+        logger.exception("Error retrieving profile picture")
 
         raise HTTPException(
             status_code=500,
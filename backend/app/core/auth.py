@@ -0,0 +1,118 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import jwt
+from jwt import PyJWKClient
+
+from app.core.config import settings
+from app.models.users import AuthUser
+
+
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class VerifiedTokenCache:
+    """Small LRU of verified tokens, keyed by token hash and expiring at `exp`."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[AuthUser, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[AuthUser]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def put(self, token: str, user: AuthUser) -> None:
+        if self.max_size <= 0 or user.exp is None:
+            return
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (user, float(user.exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# The JWK set is fetched on first use and cached; PyJWKClient refetches it
+# when a token carries a key ID that is not in the cached set (key rotation).
+jwks_client = PyJWKClient(
+    f"{settings.supabase_url}/auth/v1/.well-known/jwks.json",
+    cache_jwk_set=True,
+    lifespan=settings.auth_jwks_cache_seconds,
+    headers={"apikey": settings.supabase_pub_key},
+)
+
+token_cache = VerifiedTokenCache(settings.auth_token_cache_size)
+
+
+def _decode(token: str) -> dict:
+    header = jwt.get_unverified_header(token)
+    alg = header.get("alg")
+
+    if alg == "HS256":
+        if not settings.supabase_jwt_secret:
+            raise InvalidToken("HS256 token but no JWT secret configured")
+        key = settings.supabase_jwt_secret
+        algorithms = ["HS256"]
+    elif alg in ASYMMETRIC_ALGORITHMS:
+        key = jwks_client.get_signing_key_from_jwt(token).key
+        algorithms = [alg]
+    else:
+        raise InvalidToken(f"Unsupported signing algorithm: {alg}")
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        audience=settings.supabase_jwt_audience,
+        options={"require": ["exp", "sub"]},
+    )
+
+
+def verify_access_token(token: str) -> AuthUser:
+    """Verify a Supabase access token locally (signature, expiry, audience)."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    try:
+        claims = _decode(token)
+    except InvalidToken:
+        raise
+    except Exception as e:
+        raise InvalidToken(str(e))
+
+    user = AuthUser(
+        id=claims["sub"],
+        email=claims.get("email"),
+        role=claims.get("role"),
+        app_metadata=claims.get("app_metadata") or {},
+        exp=claims["exp"],
+    )
+    token_cache.put(token, user)
+    return user
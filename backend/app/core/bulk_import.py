@@ -0,0 +1,267 @@
+import asyncio
+import os
+import uuid
+import zipfile
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.core.resume_diff import section_fingerprints
+from app.core.resume_pipeline import (
+    ALLOWED_TYPES,
+    error_message,
+    insert_resumes,
+    parse_text,
+    remove_file,
+    resume_file_path,
+    store_file,
+)
+from app.core.text_extract import extract_text_from_upload
+from app.core.uploads import SpooledUpload, open_source, spooled_upload
+from app.models.resumes import Resume
+
+ZIP_TYPES = {"application/zip", "application/x-zip-compressed"}
+EXTENSION_TYPES = {ext: content_type for content_type, ext in ALLOWED_TYPES.items()}
+
+
+def _rejected(filename: str, error: str) -> Dict[str, Any]:
+    return {"filename": filename, "status": "failed", "error": error}
+
+
+def _expand_zip(
+    source: Union[bytes, str],
+    archive_name: str,
+    budget: int,
+) -> Tuple[List[SpooledUpload], List[Dict[str, Any]], int]:
+    """Spool every PDF/DOCX entry of an archive. Runs in a worker thread.
+
+    Entry sizes are checked against what is actually decompressed, not the
+    sizes the archive claims. Returns the uploads, rejected entries, and the
+    uncompressed bytes used.
+    """
+    uploads: List[SpooledUpload] = []
+    rejected: List[Dict[str, Any]] = []
+    used = 0
+    try:
+        with open_source(source) as fp, zipfile.ZipFile(fp) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or info.filename.startswith("__MACOSX/"):
+                    continue
+
+                label = f"{archive_name}/{info.filename}"
+                content_type = EXTENSION_TYPES.get(os.path.splitext(name)[1].lower())
+                if content_type is None:
+                    rejected.append(_rejected(label, "Only PDF and DOCX files are allowed."))
+                    continue
+
+                upload = SpooledUpload(name, content_type, settings.upload_spool_threshold)
+                uploads.append(upload)
+                with archive.open(info) as entry:
+                    while chunk := entry.read(settings.upload_chunk_size):
+                        used += len(chunk)
+                        if used > budget:
+                            raise HTTPException(413, "Archive contents exceed the bulk import size limit.")
+                        if upload.size + len(chunk) > settings.resume_max_bytes:
+                            break
+                        upload.write_sync(chunk)
+                    else:
+                        upload.finish()
+                        continue
+
+                uploads.pop().close()
+                rejected.append(_rejected(label, "File too large."))
+    except zipfile.BadZipFile:
+        rejected.append(_rejected(archive_name, "Not a valid zip archive."))
+    except BaseException:
+        for upload in uploads:
+            upload.close()
+        raise
+    return uploads, rejected, used
+
+
+async def collect_uploads(
+    files: List[UploadFile],
+    stack: AsyncExitStack,
+) -> Tuple[List[SpooledUpload], List[Dict[str, Any]]]:
+    """Spool the request's files (expanding zip archives) into `stack`."""
+    uploads: List[SpooledUpload] = []
+    rejected: List[Dict[str, Any]] = []
+    budget = settings.bulk_max_uncompressed_bytes
+
+    for file in files:
+        filename = file.filename or ""
+        if file.content_type in ZIP_TYPES or filename.lower().endswith(".zip"):
+            archive = await stack.enter_async_context(spooled_upload(file, settings.bulk_max_request_bytes))
+            entries, skipped, used = await run_in_threadpool(_expand_zip, archive.source, filename, budget)
+            budget -= used
+            for entry in entries:
+                stack.callback(entry.close)
+            uploads.extend(entries)
+            rejected.extend(skipped)
+        elif file.content_type in ALLOWED_TYPES:
+            upload = await stack.enter_async_context(spooled_upload(file, settings.resume_max_bytes))
+            uploads.append(upload)
+        else:
+            rejected.append(_rejected(filename, "Only PDF and DOCX files are allowed."))
+
+        if len(uploads) > settings.bulk_max_files:
+            raise HTTPException(413, f"Too many files. Maximum is {settings.bulk_max_files} per import.")
+
+    return uploads, rejected
+
+
+@dataclass
+class _Prepared:
+    upload: SpooledUpload
+    resume: Optional[Resume] = None
+    error: Optional[str] = None
+
+
+async def _prepare(
+    supabase: AsyncClient,
+    user_id: str,
+    upload: SpooledUpload,
+    use_cache: bool,
+    fast: bool,
+    file_slots: asyncio.Semaphore,
+    parse_slots: asyncio.Semaphore,
+) -> _Prepared:
+    """Extract, parse and store one file; the row is inserted in a batch later."""
+    resume_id = str(uuid.uuid4())
+    file_path = resume_file_path(user_id, resume_id, upload.content_type)
+    storing = uploaded = False
+    try:
+        async with file_slots:
+            text = await extract_text_from_upload(upload)
+            if fast:
+                parsed = await parse_text(text, fast=True)
+            else:
+                async with parse_slots:
+                    parsed = await parse_text(text, use_cache=use_cache)
+            storing = True
+            await store_file(supabase, file_path, upload.source, upload.content_type)
+            uploaded = True
+        return _Prepared(upload, resume=Resume(
+            id=resume_id,
+            user_id=user_id,
+            title=upload.filename,
+            file_path=file_path,
+            data=parsed,
+            section_fingerprints=None if fast else section_fingerprints(text),
+        ))
+    except asyncio.CancelledError:
+        # The import was abandoned; a store cut short may still have landed
+        if storing:
+            await remove_file(supabase, file_path)
+        raise
+    except Exception as e:
+        if uploaded:
+            await remove_file(supabase, file_path)
+        return _Prepared(upload, error=error_message(e))
+
+
+async def _flush(supabase: AsyncClient, batch: List[_Prepared]) -> List[Dict[str, Any]]:
+    resumes = [item.resume for item in batch if item.resume is not None]
+    try:
+        await insert_resumes(supabase, resumes)
+    except Exception as e:
+        await asyncio.gather(*(remove_file(supabase, resume.file_path) for resume in resumes))
+        return [
+            _rejected(item.upload.filename, f"Database insert failed: {error_message(e)}")
+            for item in batch
+        ]
+    return [
+        {"filename": item.upload.filename, "status": "done", "resume_id": item.resume.id}
+        for item in batch if item.resume is not None
+    ]
+
+
+async def _discard(supabase: AsyncClient, batch: List[_Prepared], unread: Set[asyncio.Task]) -> None:
+    """Remove the files of an abandoned import: the unflushed batch and files
+    that finished but were never read (_prepare removes the ones cancelled
+    while being stored)."""
+    leftovers = await asyncio.gather(*unread, return_exceptions=True)
+    orphaned = batch + [item for item in leftovers if isinstance(item, _Prepared)]
+    await asyncio.gather(*(
+        remove_file(supabase, item.resume.file_path) for item in orphaned if item.resume is not None
+    ))
+
+
+async def bulk_import(
+    supabase: AsyncClient,
+    user_id: str,
+    uploads: List[SpooledUpload],
+    rejected: List[Dict[str, Any]],
+    use_cache: bool = True,
+    fast: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Import many resumes, yielding progress events as they happen.
+
+    Files are extracted, parsed and stored concurrently (BULK_CONCURRENCY
+    files in flight, BULK_PARSE_CONCURRENCY OpenAI calls); rows are
+    inserted BULK_INSERT_BATCH_SIZE at a time. Emits `started`, then
+    `parsed` / `file` events per file, and a final `summary` with every
+    file's result. With fast=True nothing goes to the LLM (see
+    parse_text), so only BULK_CONCURRENCY applies.
+    """
+    results: List[Dict[str, Any]] = list(rejected)
+    yield {"event": "started", "total": len(uploads) + len(rejected)}
+    for result in rejected:
+        yield {"event": "file", **result}
+
+    file_slots = asyncio.Semaphore(settings.bulk_concurrency)
+    parse_slots = asyncio.Semaphore(settings.bulk_parse_concurrency)
+    tasks = [
+        asyncio.create_task(_prepare(supabase, user_id, upload, use_cache, fast, file_slots, parse_slots))
+        for upload in uploads
+    ]
+
+    batch: List[_Prepared] = []
+    unread = set(tasks)
+    try:
+        while unread:
+            finished, _ = await asyncio.wait(unread, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                unread.discard(task)
+                item = task.result()
+                if item.error is not None:
+                    result = _rejected(item.upload.filename, item.error)
+                    results.append(result)
+                    yield {"event": "file", **result}
+                    continue
+
+                batch.append(item)
+                yield {"event": "parsed", "filename": item.upload.filename}
+
+                if len(batch) >= settings.bulk_insert_batch_size:
+                    flushing, batch = batch, []
+                    for result in await _flush(supabase, flushing):
+                        results.append(result)
+                        yield {"event": "file", **result}
+
+        if batch:
+            flushing, batch = batch, []
+            for result in await _flush(supabase, flushing):
+                results.append(result)
+                yield {"event": "file", **result}
+    finally:
+        for task in unread:
+            task.cancel()
+        # Shielded: on a disconnect the request's own task is being cancelled
+        # and would cut the cleanup short
+        await asyncio.shield(_discard(supabase, batch, unread))
+
+    succeeded = sum(1 for result in results if result["status"] == "done")
+    yield {
+        "event": "summary",
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
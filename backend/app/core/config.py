@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +8,115 @@ class Settings(BaseSettings):
     supabase_pub_key: str
     supabase_service_role_key: str
 
+    # Auth: tokens are verified locally against the project's JWKS (or the
+    # legacy HS256 secret when set); remote get_user is the fallback.
+    supabase_jwt_secret: Optional[str] = None
+    supabase_jwt_audience: str = "authenticated"
+    auth_remote_verify: bool = False
+    auth_jwks_cache_seconds: int = 600
+    auth_token_cache_size: int = 1024
+
+    # Shared Supabase HTTP connection pool
+    supabase_pool_max_connections: int = 50
+    supabase_pool_max_keepalive: int = 20
+    supabase_pool_keepalive_expiry: float = 30.0
+    supabase_http_timeout: float = 30.0
+
+    # Upload pipeline: worker pool size and per-stage timeouts (seconds)
+    extract_workers: int = 2
+    extract_max_pending: int = 8
+    extract_timeout: float = 20.0
+
+    # Text extraction limits and pdfminer layout parameters
+    pdf_max_pages: int = 10
+    pdf_pages_per_task: int = 1
+    extract_max_chars: int = 30000
+    pdf_char_margin: float = 2.0
+    pdf_line_margin: float = 0.5
+    pdf_word_margin: float = 0.1
+    pdf_boxes_flow: Optional[float] = 0.5
+    openai_timeout: float = 90.0
+    llm_input_token_budget: int = 6000
+
+    # OpenAI governor: rate limits, concurrency, retries, circuit breaker and
+    # fallback model. openai_timeout above bounds the whole governed call.
+    openai_fallback_model: Optional[str] = "gpt-4o-mini"
+    openai_max_in_flight: int = 8
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 30000
+    openai_expected_output_tokens: int = 1500
+    openai_attempt_timeout: float = 30.0
+    openai_max_retries: int = 3
+    openai_backoff_base: float = 0.5
+    openai_backoff_max: float = 8.0
+    openai_circuit_failures: int = 5
+    openai_circuit_cooldown: float = 30.0
+    storage_timeout: float = 30.0
+    db_timeout: float = 10.0
+
+    # Background resume jobs: "supabase" in production, "sqlite" locally
+    job_queue_backend: str = "supabase"
+    job_queue_sqlite_path: str = ":memory:"
+    job_workers: int = 2
+    job_poll_interval: float = 2.0
+    job_stale_seconds: int = 600
+
+    # Resume parse cache: in-memory LRU in front of the resume_parse_cache table
+    parse_cache_size: int = 256
+    parse_cache_persistent: bool = True
+    # Persistent entries unused for this long are deleted every PARSE_CACHE_PRUNE_INTERVAL seconds (0 keeps them)
+    parse_cache_ttl_days: int = 30
+    parse_cache_prune_interval: float = 3600.0
+
+    # Upload limits (bytes). Uploads are read in chunks and spooled to disk
+    # above the threshold; the request body cap is enforced while receiving.
+    max_request_bytes: int = 16 * 1024 * 1024
+    resume_max_bytes: int = 10 * 1024 * 1024
+    pfp_max_bytes: int = 5 * 1024 * 1024
+    upload_spool_threshold: int = 1024 * 1024
+    upload_chunk_size: int = 64 * 1024
+
+    # Bulk import (POST /resumes/bulk)
+    bulk_max_request_bytes: int = 200 * 1024 * 1024
+    bulk_max_files: int = 200
+    bulk_max_uncompressed_bytes: int = 500 * 1024 * 1024
+    bulk_concurrency: int = 8
+    bulk_parse_concurrency: int = 4
+    bulk_insert_batch_size: int = 25
+
+    # Storage downloads: object metadata cache and client cache lifetimes
+    storage_meta_cache_size: int = 2048
+    storage_meta_cache_seconds: int = 300
+    pfp_cache_seconds: int = 300
+
+    # Profile pictures are re-encoded as WebP at these sizes (px, longest side)
+    pfp_sizes: List[int] = [48, 96, 256, 512]
+    pfp_quality: int = 80
+    pfp_max_pixels: int = 40_000_000
+    pfp_process_timeout: float = 15.0
+    pfp_immutable_cache_seconds: int = 31536000
+
+    # Per-user read cache for dashboard reads: "memory", "redis" or "sqlite"
+    # (a local stand-in for the shared backend)
+    read_cache_backend: str = "memory"
+    read_cache_ttl: int = 60
+    read_cache_max_entries: int = 10000
+    read_cache_redis_url: str = "redis://localhost:6379/0"
+    read_cache_sqlite_path: str = "read_cache.sqlite3"
+
+    # Public portfolio pages (GET /p/{slug}): browser, CDN and stale windows,
+    # and the in-process snapshot cache
+    public_cache_seconds: int = 60
+    public_cdn_cache_seconds: int = 300
+    public_stale_seconds: int = 86400
+    snapshot_cache_size: int = 1024
+    snapshot_cache_seconds: int = 30
+
+    # Background warm-up after start-up (see /readiness): failed steps are
+    # retried with backoff up to this many seconds apart
+    warmup_enabled: bool = True
+    warmup_retry_max: float = 30.0
+
     model_config = SettingsConfigDict(
             env_file=".env",
     )
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# CPU-bound work (text extraction) runs here instead of on the event loop.
+# The pool is created by the app lifespan; the semaphore bounds how many jobs
+# may be queued on it so a burst of uploads can't pile up unbounded work.
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pending: Optional[asyncio.Semaphore] = None
+
+def init_process_pool() -> ProcessPoolExecutor:
+    global _process_pool, _pending
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.extract_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    if _pending is None:
+        _pending = asyncio.Semaphore(settings.extract_max_pending)
+    return _process_pool
+
+def shutdown_process_pool() -> None:
+    global _process_pool, _pending
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+    _process_pool = None
+    _pending = None
+
+def _retire_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill a pool's workers; the next job starts a fresh pool.
+
+    A worker can't be interrupted, so this is the only way to stop one stuck
+    on a pathological file. Other jobs still running on the pool fail with
+    BrokenProcessPool.
+    """
+    global _process_pool
+    if _process_pool is pool:
+        _process_pool = None
+    logger.warning("Extraction worker overran its timeout; recycling the process pool")
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+# Cancel message for a job whose result the caller no longer needs (e.g.
+# pages past the character cap), as opposed to one it gave up waiting on
+UNNEEDED = "result no longer needed"
+
+async def run_in_process(fn: Callable[..., T], *args: Any) -> T:
+    """Run fn in the extraction pool, holding one EXTRACT_MAX_PENDING slot.
+
+    Cancelling the caller (e.g. a timeout) only abandons a job that is still
+    running; its slot stays taken until the worker is done with it. One still
+    running EXTRACT_TIMEOUT after it was abandoned gets the pool recycled,
+    unless it was cancelled with the UNNEEDED message: a job cancelled only
+    because its result isn't wanted says nothing about the worker.
+    """
+    pool = init_process_pool()
+    pending = _pending
+    assert pending is not None
+    await pending.acquire()
+    try:
+        future = pool.submit(fn, *args)
+    except BaseException:
+        pending.release()
+        raise
+
+    loop = asyncio.get_running_loop()
+
+    def release(_: Future) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(pending.release)
+
+    future.add_done_callback(release)
+
+    def reap() -> None:
+        if not future.done():
+            _retire_process_pool(pool)
+
+    try:
+        # Cancelling the wrapper cancels the job too if it hasn't started yet
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError as e:
+        if not future.done() and e.args != (UNNEEDED,):
+            loop.call_later(settings.extract_timeout, reap)
+        raise
+
+async def run_stage(stage: str, awaitable: Awaitable[T], timeout: float) -> T:
+    """Await one pipeline stage, turning a timeout into a 504."""
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"{stage} timed out after {timeout:g}s"
+        )
@@ -0,0 +1,60 @@
+from io import BytesIO
+from typing import Dict, Sequence, Union
+
+from app.core.uploads import open_source
+
+# Bump when the output of process_profile_picture changes, so content-hash
+# URLs of previously processed pictures are not reused for new output.
+PFP_PIPELINE_VERSION = "1"
+
+ACCEPTED_FORMATS = {"JPEG", "PNG"}
+
+
+def process_profile_picture(
+    source: Union[bytes, str],
+    sizes: Sequence[int],
+    quality: int,
+    max_pixels: int,
+) -> Dict[int, bytes]:
+    """Decode an uploaded picture and re-encode it as WebP at each size.
+
+    Runs in the process pool. Orientation from EXIF is applied to the pixels
+    and no metadata is written out. Images are fit within size x size and
+    never upscaled. Raises ValueError for anything that isn't a JPEG/PNG.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    with open_source(source) as f:
+        try:
+            image = Image.open(f)
+            if image.format not in ACCEPTED_FORMATS:
+                raise ValueError(f"unsupported image format {image.format}")
+            if image.width * image.height > max_pixels:
+                raise ValueError("image dimensions are too large")
+            image.load()
+        except UnidentifiedImageError:
+            raise ValueError("not a JPEG or PNG image")
+        except (OSError, Image.DecompressionBombError) as e:
+            raise ValueError(f"could not decode image: {e}")
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants: Dict[int, bytes] = {}
+    for size in sorted(sizes, reverse=True):
+        # Downscale from the previous (larger) variant to keep resampling cheap
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        out = BytesIO()
+        image.save(out, format="WEBP", quality=quality, method=4)
+        variants[size] = out.getvalue()
+    return variants
+
+
+def pick_size(sizes: Sequence[int], requested: Union[int, None]) -> int:
+    """Smallest available size covering `requested`; the largest by default."""
+    if requested is not None:
+        for size in sorted(sizes):
+            if size >= requested:
+                return size
+    return max(sizes)
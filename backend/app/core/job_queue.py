@@ -0,0 +1,185 @@
+import asyncio
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.supabase_client import get_supabase_client
+from app.models.resumes import ResumeJob, ResumeJobStatus
+
+
+class JobQueue(ABC):
+    """Storage for background resume parsing jobs.
+
+    `claim` must hand each job to exactly one worker: it atomically moves the
+    oldest pending job to `extracting` and returns it.
+    """
+
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+
+    @abstractmethod
+    async def create(self, job: ResumeJob) -> ResumeJob: ...
+
+    @abstractmethod
+    async def get(self, job_id: str, user_id: str) -> Optional[ResumeJob]: ...
+
+    @abstractmethod
+    async def claim(self) -> Optional[ResumeJob]: ...
+
+    @abstractmethod
+    async def update(self, job_id: str, **fields: Any) -> None: ...
+
+    async def submit(self, job: ResumeJob) -> ResumeJob:
+        created = await self.create(job)
+        self._wakeup.set()
+        return created
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep until a job is submitted in this process or `timeout` passes."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+class SupabaseJobQueue(JobQueue):
+    """Jobs live in the `resume_jobs` table; see migrations/002."""
+
+    async def create(self, job: ResumeJob) -> ResumeJob:
+        payload = job.model_dump(mode="json", exclude_none=True)
+        response = await get_supabase_client().table("resume_jobs").insert(payload).execute()
+        return ResumeJob.model_validate(response.data[0])
+
+    async def get(self, job_id: str, user_id: str) -> Optional[ResumeJob]:
+        response = await get_supabase_client().table("resume_jobs")\
+            .select("*")\
+            .eq("id", job_id)\
+            .eq("user_id", user_id)\
+            .execute()
+        if not response.data:
+            return None
+        return ResumeJob.model_validate(response.data[0])
+
+    async def claim(self) -> Optional[ResumeJob]:
+        response = await get_supabase_client()\
+            .rpc("claim_resume_job", {"p_stale_seconds": settings.job_stale_seconds})\
+            .execute()
+        if not response.data:
+            return None
+        return ResumeJob.model_validate(response.data[0])
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        await get_supabase_client().table("resume_jobs").update(fields).eq("id", job_id).execute()
+
+
+class SQLiteJobQueue(JobQueue):
+    """Local stand-in for SupabaseJobQueue, for development and tests."""
+
+    COLUMNS = ("id", "user_id", "status", "title", "file_path", "content_type",
+               "resume_id", "use_cache", "error", "created_at", "updated_at")
+
+    def __init__(self, path: str = ":memory:"):
+        super().__init__()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resume_jobs (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    content_type TEXT NOT NULL,
+                    resume_id TEXT NOT NULL,
+                    use_cache INTEGER NOT NULL DEFAULT 1,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+    def _row(self, row: Optional[sqlite3.Row]) -> Optional[ResumeJob]:
+        return ResumeJob.model_validate(dict(row)) if row else None
+
+    def _create(self, job: ResumeJob) -> ResumeJob:
+        now = datetime.now(timezone.utc)
+        job = job.model_copy(update={"id": job.id or str(uuid.uuid4()), "created_at": now, "updated_at": now})
+        values = job.model_dump(mode="json")
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO resume_jobs ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+                [values[c] for c in self.COLUMNS],
+            )
+        return job
+
+    def _get(self, job_id: str, user_id: str) -> Optional[ResumeJob]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM resume_jobs WHERE id = ? AND user_id = ?", (job_id, user_id)
+            ).fetchone()
+        return self._row(row)
+
+    def _claim(self) -> Optional[ResumeJob]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT * FROM resume_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (ResumeJobStatus.PENDING.value,),
+            ).fetchone()
+            if row is None:
+                return None
+            row = self._conn.execute(
+                "UPDATE resume_jobs SET status = ?, updated_at = ? WHERE id = ? RETURNING *",
+                (ResumeJobStatus.EXTRACTING.value, self._now(), row["id"]),
+            ).fetchone()
+        return self._row(row)
+
+    def _update(self, job_id: str, fields: dict) -> None:
+        fields = {**fields, "updated_at": self._now()}
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE resume_jobs SET {assignments} WHERE id = ?",
+                [*fields.values(), job_id],
+            )
+
+    async def create(self, job: ResumeJob) -> ResumeJob:
+        return await run_in_threadpool(self._create, job)
+
+    async def get(self, job_id: str, user_id: str) -> Optional[ResumeJob]:
+        return await run_in_threadpool(self._get, job_id, user_id)
+
+    async def claim(self) -> Optional[ResumeJob]:
+        return await run_in_threadpool(self._claim)
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        await run_in_threadpool(self._update, job_id, fields)
+
+
+_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        if settings.job_queue_backend == "sqlite":
+            _queue = SQLiteJobQueue(settings.job_queue_sqlite_path)
+        elif settings.job_queue_backend == "supabase":
+            _queue = SupabaseJobQueue()
+        else:
+            raise ValueError(f"Unknown job queue backend: {settings.job_queue_backend}")
+    return _queue
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from postgrest.exceptions import APIError
+
+from app.core.config import settings
+from app.core.job_queue import JobQueue, get_job_queue
+from app.core.resume_diff import section_fingerprints
+from app.core.resume_pipeline import error_message, insert_resume, parse_text, remove_file
+from app.core.supabase_client import get_supabase_client
+from app.core.text_extract import extract_text_async
+from app.models.resumes import Resume, ResumeJob, ResumeJobStatus
+
+logger = logging.getLogger(__name__)
+
+UNIQUE_VIOLATION = "23505"
+
+
+async def _resume_stored(supabase, resume_id: str) -> bool:
+    response = await supabase.table("resumes").select("id").eq("id", resume_id).execute()
+    return bool(response.data)
+
+
+async def _file_referenced(supabase, file_path: str) -> bool:
+    response = await supabase.table("resumes").select("id").eq("file_path", file_path).limit(1).execute()
+    return bool(response.data)
+
+
+async def process_job(queue: JobQueue, job: ResumeJob) -> None:
+    """Run one claimed job: download, extract, parse, insert the resume row.
+
+    The stored file is removed on failure only if no resume row points at
+    it: a stale run of the same job may still be working on it, and its
+    insert can land while this run fails. A job reclaimed after its row went
+    in (the worker died before marking it done) is just marked done.
+    """
+    supabase = get_supabase_client()
+    try:
+        stored = await _resume_stored(supabase, job.resume_id)
+    except Exception:
+        # Unknown whether the file is referenced: leave the job to be
+        # reclaimed once it goes stale rather than remove it
+        logger.exception("Error checking resume job %s", job.id)
+        return
+
+    if not stored:
+        try:
+            file_bytes = await supabase.storage.from_("users").download(job.file_path)
+            text = await extract_text_async(job.content_type, file_bytes)
+
+            await queue.update(job.id, status=ResumeJobStatus.PARSING.value)
+            parsed_resume = await parse_text(text, use_cache=job.use_cache)
+
+            try:
+                await insert_resume(supabase, Resume(
+                    id=job.resume_id,
+                    user_id=job.user_id,
+                    title=job.title,
+                    file_path=job.file_path,
+                    data=parsed_resume,
+                    section_fingerprints=section_fingerprints(text),
+                ))
+            except APIError as e:
+                # Another run of the same job got there first
+                if e.code != UNIQUE_VIOLATION:
+                    raise
+        except Exception as e:
+            try:
+                referenced = await _file_referenced(supabase, job.file_path)
+            except Exception:
+                # Unknown whether the file is referenced: keep it
+                logger.exception("Error checking resume job %s", job.id)
+                referenced = None
+            if not referenced:
+                if referenced is False:
+                    await remove_file(supabase, job.file_path)
+                await queue.update(job.id, status=ResumeJobStatus.FAILED.value, error=error_message(e))
+                return
+            # Another run of the same job inserted the row meanwhile
+
+    # If this fails the job goes stale and its next claim lands here again
+    await queue.update(job.id, status=ResumeJobStatus.DONE.value)
+
+
+class JobWorkerPool:
+    """A fixed number of asyncio workers draining the job queue."""
+
+    def __init__(self, queue: JobQueue, size: int):
+        self.queue = queue
+        self.size = size
+        self._tasks: List[asyncio.Task] = []
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await self.queue.claim()
+            except Exception:
+                logger.exception("Error claiming resume job")
+                job = None
+
+            if job is None:
+                await self.queue.wait(settings.job_poll_interval)
+                continue
+
+            try:
+                await process_job(self.queue, job)
+            except Exception:
+                logger.exception("Error processing resume job %s", job.id)
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.size)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+_pool: Optional[JobWorkerPool] = None
+
+def start_job_workers() -> None:
+    global _pool
+    if _pool is None and settings.job_workers > 0:
+        _pool = JobWorkerPool(get_job_queue(), settings.job_workers)
+        _pool.start()
+
+async def stop_job_workers() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+    _pool = None
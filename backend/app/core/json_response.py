@@ -0,0 +1,29 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback; same output, slower
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed.
+
+    The app's default response class. Route handlers that return DB rows
+    wrap them in this directly: the rows came out of PostgREST as JSON, so
+    they are already JSON-safe and need neither response_model validation
+    nor FastAPI's jsonable_encoder pass. Anything else (Pydantic models,
+    datetimes) should be returned normally or dumped with mode="json" first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
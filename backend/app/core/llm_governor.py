@@ -0,0 +1,235 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import (
+    OPENAI_CIRCUIT_OPEN,
+    OPENAI_FALLBACKS,
+    OPENAI_IN_FLIGHT,
+    OPENAI_QUEUE_DEPTH,
+    OPENAI_QUEUE_WAIT,
+    OPENAI_REQUEST_SECONDS,
+    OPENAI_RETRIES,
+)
+
+T = TypeVar("T")
+
+
+class LLMUnavailable(Exception):
+    """Every model was rate-limited, failing, or behind an open circuit."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, up to one minute's worth."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive failures; after `cooldown` seconds
+    a single trial call is let through (half-open)."""
+
+    def __init__(self, name: str, failures: int, cooldown: float):
+        self.name = name
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.retry_after() > 0 or self._trial_running:
+            return False
+        self._trial_running = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        OPENAI_CIRCUIT_OPEN.labels(self.name).set(0)
+
+    def release_trial(self) -> None:
+        """The trial call ended without an outcome (it was cancelled); let
+        the next call be the trial instead."""
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            OPENAI_CIRCUIT_OPEN.labels(self.name).set(1)
+
+
+def _failure_reason(e: BaseException) -> Optional[str]:
+    """Why a call failed, for retryable failures; None if not retryable."""
+    # Imported here to keep openai out of app start-up; it is loaded by the
+    # time any call can fail.
+    import openai
+
+    if isinstance(e, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError)):
+        return "timeout"
+    if isinstance(e, openai.APIConnectionError):
+        return "connection"
+    if isinstance(e, openai.APIStatusError) and e.status_code >= 500:
+        return "server_error"
+    return None
+
+
+def _retry_after_header(e: BaseException) -> Optional[float]:
+    response = getattr(e, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMGovernor:
+    """Admission control and failure handling for OpenAI calls.
+
+    Each attempt waits for an in-flight slot and for request/token budget
+    from the per-minute token buckets. Server errors and dropped connections
+    are retried with full-jitter exponential backoff. If the primary model
+    is rate-limited or slow, or its circuit is open, the call moves to the
+    fallback model.
+    """
+
+    def __init__(self, primary: str, fallback: Optional[str]):
+        self.models: List[str] = [primary] + ([fallback] if fallback and fallback != primary else [])
+        self.slots = asyncio.Semaphore(settings.openai_max_in_flight)
+        self.requests = TokenBucket(settings.openai_requests_per_minute)
+        self.tokens = TokenBucket(settings.openai_tokens_per_minute)
+        self.breakers: Dict[str, CircuitBreaker] = {
+            model: CircuitBreaker(model, settings.openai_circuit_failures, settings.openai_circuit_cooldown)
+            for model in self.models
+        }
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        ceiling = min(settings.openai_backoff_max, settings.openai_backoff_base * (2 ** attempt))
+        return max(retry_after or 0.0, random.uniform(0, ceiling))
+
+    async def _attempt(self, model: str, call: Callable[[str], Awaitable[T]], estimated_tokens: int) -> T:
+        OPENAI_QUEUE_DEPTH.inc()
+        queued_at = time.monotonic()
+        try:
+            await self.slots.acquire()
+            try:
+                await self.requests.acquire(1)
+                await self.tokens.acquire(estimated_tokens)
+            except BaseException:
+                self.slots.release()
+                raise
+        finally:
+            OPENAI_QUEUE_DEPTH.dec()
+            OPENAI_QUEUE_WAIT.observe(time.monotonic() - queued_at)
+
+        OPENAI_IN_FLIGHT.inc()
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(call(model), timeout=settings.openai_attempt_timeout)
+            outcome = "ok"
+            return result
+        except BaseException as e:
+            outcome = _failure_reason(e) or "error"
+            raise
+        finally:
+            OPENAI_REQUEST_SECONDS.labels(model, outcome).observe(time.monotonic() - started)
+            OPENAI_IN_FLIGHT.dec()
+            self.slots.release()
+
+    async def run(self, call: Callable[[str], Awaitable[T]], estimated_tokens: int) -> Tuple[T, str]:
+        """Run `call(model)` under the governor; returns (result, model used)."""
+        last_reason: Optional[str] = None
+        retry_after: Optional[float] = None
+
+        for index, model in enumerate(self.models):
+            is_last = index == len(self.models) - 1
+            breaker = self.breakers[model]
+            if not breaker.allow():
+                if not is_last:
+                    OPENAI_FALLBACKS.labels("circuit_open").inc()
+                retry_after = breaker.retry_after()
+                continue
+
+            attempt = 0
+            while True:
+                try:
+                    result = await self._attempt(model, call, estimated_tokens)
+                    breaker.record_success()
+                    return result, model
+                except Exception as e:
+                    reason = _failure_reason(e)
+                    if reason is None:
+                        # e.g. a 400: the request itself is bad, no model will help
+                        breaker.record_success()
+                        raise
+                    breaker.record_failure()
+                    last_reason = reason
+                    retry_after = _retry_after_header(e)
+
+                    slow_or_limited = reason in ("rate_limited", "timeout")
+                    if (slow_or_limited and not is_last) or attempt >= settings.openai_max_retries or not breaker.allow():
+                        if not is_last:
+                            OPENAI_FALLBACKS.labels(reason).inc()
+                        break
+
+                    OPENAI_RETRIES.labels(model, reason).inc()
+                    await asyncio.sleep(self._backoff(attempt, retry_after))
+                    attempt += 1
+                except BaseException:
+                    # Cancelled (a stage timeout, a client gone away): says
+                    # nothing about the model, but a half-open trial must not
+                    # stay claimed or the circuit never closes again
+                    breaker.release_trial()
+                    raise
+
+        raise LLMUnavailable(
+            f"OpenAI unavailable: {last_reason or 'circuit open'}",
+            retry_after=retry_after,
+        )
+
+
+_governor: Optional[LLMGovernor] = None
+
+def get_llm_governor(primary: str) -> LLMGovernor:
+    global _governor
+    if _governor is None:
+        _governor = LLMGovernor(primary, settings.openai_fallback_model)
+    return _governor
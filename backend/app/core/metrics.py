@@ -0,0 +1,131 @@
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 6000, 8000, 12000, 16000, 32000)
+
+PARSE_CACHE_LOOKUPS = Counter(
+    "resume_parse_cache_lookups_total",
+    "Resume parse cache lookups by outcome",
+    ["result"],  # memory_hit, persistent_hit, miss, bypass
+)
+PARSE_CACHE_EVICTIONS = Counter(
+    "resume_parse_cache_evictions_total",
+    "Entries evicted from the in-memory resume parse cache",
+)
+
+RESUME_TEXT_TOKENS = Histogram(
+    "resume_text_tokens",
+    "Resume text size in tokens before and after preprocessing",
+    ["stage"],  # raw, prepared
+    buckets=TOKEN_BUCKETS,
+)
+OPENAI_PARSE_TOKENS = Histogram(
+    "openai_parse_tokens",
+    "OpenAI tokens used per resume parse",
+    ["model", "kind"],  # kind: input, output
+    buckets=TOKEN_BUCKETS,
+)
+
+RESUME_REPARSES = Counter(
+    "resume_reparses_total",
+    "Uploads of a new resume version by how much was re-parsed",
+    ["mode"],  # unchanged, partial, full
+)
+RESUME_REPARSE_GROUPS = Counter(
+    "resume_reparse_groups_total",
+    "Resume section groups re-parsed for new versions",
+    ["group"],
+)
+
+OPENAI_QUEUE_DEPTH = Gauge(
+    "openai_queue_depth",
+    "OpenAI calls waiting for a concurrency slot or rate-limit budget",
+)
+OPENAI_QUEUE_WAIT = Histogram(
+    "openai_queue_wait_seconds",
+    "Time OpenAI calls spent waiting for a slot and rate-limit budget",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+OPENAI_IN_FLIGHT = Gauge(
+    "openai_in_flight",
+    "OpenAI calls currently in flight",
+)
+OPENAI_REQUEST_SECONDS = Histogram(
+    "openai_request_seconds",
+    "OpenAI call latency per attempt",
+    ["model", "outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 15, 20, 30, 45, 60, 90),
+)
+OPENAI_RETRIES = Counter(
+    "openai_retries_total",
+    "OpenAI call retries",
+    ["model", "reason"],
+)
+OPENAI_FALLBACKS = Counter(
+    "openai_fallbacks_total",
+    "Calls moved from the primary to the fallback model",
+    ["reason"],
+)
+OPENAI_CIRCUIT_OPEN = Gauge(
+    "openai_circuit_open",
+    "1 while the circuit breaker for a model is open",
+    ["model"],
+)
+
+READ_CACHE_LOOKUPS = Counter(
+    "read_cache_lookups_total",
+    "Per-user read cache lookups by resource and outcome",
+    ["resource", "result"],  # hit, miss
+)
+READ_CACHE_SECONDS = Histogram(
+    "read_cache_seconds",
+    "Cached read latency (lookup plus load on a miss)",
+    ["resource", "result"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+STAGE_SECONDS = Histogram(
+    "request_stage_duration_seconds",
+    "Time spent per pipeline stage",
+    ["stage"],  # auth, db, storage, extraction, llm
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_IN_FLIGHT = Gauge(
+    "request_stage_in_flight",
+    "Stage operations currently running",
+    ["stage"],
+)
+RESUME_STREAM_SECONDS = Histogram(
+    "resume_stream_seconds",
+    "Streamed resume uploads: time from request to the first parsed field and to the stored resume",
+    ["phase"],  # first_field, total
+    buckets=LATENCY_BUCKETS,
+)
+RESUME_PREFILL_FIELDS = Counter(
+    "resume_prefill_fields_total",
+    "Resume fields the rule-based pre-extraction found or missed (core/resume_prefill.py)",
+    ["field", "result"],  # found, missing
+)
+
+# Start-up warm-up (core/warmup.py)
+WARMUP_SECONDS = Gauge(
+    "warmup_step_seconds",
+    "Time the last successful run of each warm-up step took",
+    ["step"],
+)
+
+
+def metrics_response() -> Response:
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,4 +1,34 @@
-from openai import OpenAI
+import threading
+from typing import TYPE_CHECKING, Optional
+
 from app.core.config import settings
 
-gpt_client = OpenAI(api_key=settings.openai_api_key)
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# The openai package is the heaviest import in the app, so it is only loaded
+# when the client is first needed (normally by the warm-up task started in the
+# app lifespan, see core/warmup.py). Retries are handled by the governor in
+# core/llm_governor.py.
+_client: "Optional[AsyncOpenAI]" = None
+_lock = threading.Lock()
+
+def get_openai_client() -> "AsyncOpenAI":
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from openai import AsyncOpenAI
+
+                _client = AsyncOpenAI(
+                    api_key=settings.openai_api_key,
+                    timeout=settings.openai_attempt_timeout,
+                    max_retries=0,
+                )
+    return _client
+
+async def close_openai_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+    _client = None
@@ -0,0 +1,94 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+MAX_PAGE_SIZE = 100
+
+
+def _encode(values: List[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past `row` in (created_at, id) DESC order."""
+    return _encode([row["created_at"], row["id"]])
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, row_id = _decode(cursor)
+        # Both values end up inside a PostgREST filter; only accept what we issue
+        datetime.fromisoformat(created_at)
+        uuid.UUID(row_id)
+        return created_at, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_ranked_cursor(row: Dict[str, Any]) -> str:
+    """Cursor pointing just past `row` in (rank, created_at, id) DESC order."""
+    return _encode([row["rank"], row["created_at"], row["id"]])
+
+
+def decode_ranked_cursor(cursor: str) -> Tuple[float, str, str]:
+    try:
+        rank, created_at, row_id = _decode(cursor)
+        datetime.fromisoformat(created_at)
+        uuid.UUID(row_id)
+        return float(rank), created_at, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def check_limit(limit: int) -> None:
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def select_columns(summary: Tuple[str, ...], allowed: FrozenSet[str], fields: Optional[str]) -> str:
+    """Summary columns plus any extra columns requested via `fields=a,b`."""
+    columns = list(summary)
+    if fields:
+        for field in (f.strip() for f in fields.split(",")):
+            if not field or field in columns:
+                continue
+            if field not in allowed:
+                raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+            columns.append(field)
+    return ",".join(columns)
+
+
+def keyset_page(query, limit: int, cursor: Optional[str]):
+    """Order newest first and resume after `cursor`.
+
+    Fetches one row more than `limit` so `split_page` can tell whether
+    there is a next page without a count query.
+    """
+    check_limit(limit)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt."{row_id}")'
+        )
+    return query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+
+
+def split_page(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    encode: Callable[[Dict[str, Any]], str] = encode_cursor,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode(page[-1])
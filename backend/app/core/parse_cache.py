@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import PARSE_CACHE_EVICTIONS, PARSE_CACHE_LOOKUPS
+from app.core.resume_parser import MODEL, PROMPT_VERSION
+from app.core.supabase_client import get_supabase_client
+from app.models.resumes import ResumeSchema
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(text: str, model: str = MODEL, prompt_version: str = PROMPT_VERSION) -> str:
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, normalize_text(text)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Content-addressed cache of OpenAI resume parses.
+
+    Two tiers: an in-process LRU, and the `resume_parse_cache` table shared
+    by every worker. Persistent-tier errors are logged and treated as misses.
+    The memory tier hands out copies, so callers may modify what they get.
+    Table rows expire PARSE_CACHE_TTL_DAYS after they were last stored or hit.
+    """
+
+    def __init__(self, max_size: int, persistent: bool):
+        self.max_size = max_size
+        self.persistent = persistent
+        self._entries: "OrderedDict[str, ResumeSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_memory(self, key: str) -> Optional[ResumeSchema]:
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is None:
+                return None
+            self._entries.move_to_end(key)
+        return parsed.model_copy(deep=True)
+
+    def _put_memory(self, key: str, parsed: ResumeSchema) -> None:
+        if self.max_size <= 0:
+            return
+        parsed = parsed.model_copy(deep=True)
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                PARSE_CACHE_EVICTIONS.inc()
+
+    async def get(self, text: str) -> Optional[ResumeSchema]:
+        key = cache_key(text)
+
+        parsed = self._get_memory(key)
+        if parsed is not None:
+            PARSE_CACHE_LOOKUPS.labels("memory_hit").inc()
+            return parsed
+
+        if self.persistent:
+            try:
+                # Reading through an update refreshes accessed_at in the same round trip
+                response = await get_supabase_client().table("resume_parse_cache")\
+                    .update({"accessed_at": _now()})\
+                    .eq("key", key)\
+                    .execute()
+                if response.data:
+                    parsed = ResumeSchema.model_validate(response.data[0]["data"])
+                    self._put_memory(key, parsed)
+                    PARSE_CACHE_LOOKUPS.labels("persistent_hit").inc()
+                    return parsed
+            except Exception:
+                logger.exception("Error reading resume parse cache")
+
+        PARSE_CACHE_LOOKUPS.labels("miss").inc()
+        return None
+
+    async def put(self, text: str, parsed: ResumeSchema) -> None:
+        key = cache_key(text)
+        self._put_memory(key, parsed)
+
+        if self.persistent:
+            try:
+                await get_supabase_client().table("resume_parse_cache").upsert({
+                    "key": key,
+                    "model": MODEL,
+                    "prompt_version": PROMPT_VERSION,
+                    "data": parsed.model_dump(),
+                    "accessed_at": _now(),
+                }).execute()
+            except Exception:
+                logger.exception("Error writing resume parse cache")
+
+    async def prune(self, ttl_days: int) -> int:
+        """Delete table rows not stored or hit in ttl_days; returns how many."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=ttl_days)
+        response = await get_supabase_client().table("resume_parse_cache")\
+            .delete()\
+            .lt("accessed_at", cutoff.isoformat())\
+            .execute()
+        return len(response.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+parse_cache = ParseCache(settings.parse_cache_size, settings.parse_cache_persistent)
+
+_prune_task: Optional[asyncio.Task] = None
+
+async def _prune_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.parse_cache_prune_interval)
+        try:
+            removed = await parse_cache.prune(settings.parse_cache_ttl_days)
+            if removed:
+                logger.info("Pruned %d expired resume parse cache entries", removed)
+        except Exception:
+            logger.exception("Error pruning resume parse cache")
+
+def start_parse_cache_pruning() -> None:
+    global _prune_task
+    if _prune_task is None and parse_cache.persistent and settings.parse_cache_ttl_days > 0:
+        _prune_task = asyncio.create_task(_prune_periodically())
+
+async def stop_parse_cache_pruning() -> None:
+    global _prune_task
+    if _prune_task is not None:
+        _prune_task.cancel()
+        await asyncio.gather(_prune_task, return_exceptions=True)
+    _prune_task = None
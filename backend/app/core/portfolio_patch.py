@@ -0,0 +1,72 @@
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.models.portfolios import PortfolioUpdate
+
+MERGE_PATCH_TYPE = "application/merge-patch+json"
+# SQLSTATE raised by patch_portfolio() on a version mismatch (migration 009)
+VERSION_CONFLICT = "PT412"
+
+_VERSION_TAG_RE = re.compile(r'^"v(\d+)"$')
+
+
+def portfolio_etag(portfolio: Dict[str, Any]) -> Optional[str]:
+    """Strong ETag for a portfolio row: its version, bumped on every update."""
+    version = portfolio.get("version")
+    return f'"v{version}"' if version is not None else None
+
+
+def etag_headers(portfolio: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    etag = portfolio_etag(portfolio)
+    return {"ETag": etag} if etag else None
+
+
+def expected_version(if_match: Optional[str]) -> Optional[int]:
+    """The version an If-Match header requires; None when any version will do.
+
+    Only the first entity tag is considered. If-Match uses strong comparison,
+    so a weak or unrecognised tag can never match and fails right away.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    match = _VERSION_TAG_RE.match(if_match.split(",")[0].strip())
+    if not match:
+        raise precondition_failed()
+    return int(match.group(1))
+
+
+def precondition_failed(current: Optional[Dict[str, Any]] = None) -> HTTPException:
+    return HTTPException(
+        status_code=412,
+        detail="Portfolio was modified since it was read; fetch it again and retry.",
+        headers=etag_headers(current) if current else None,
+    )
+
+
+def split_merge_patch(patch: Any) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Split an RFC 7396 patch of a portfolio into (column values, data patch).
+
+    Columns are validated like a PUT body. None of them can be removed, so a
+    null at the top level is rejected; nulls inside `data` remove keys.
+    """
+    if not isinstance(patch, dict):
+        raise HTTPException(status_code=400, detail="A portfolio merge patch must be a JSON object.")
+
+    unknown = set(patch) - set(PortfolioUpdate.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown portfolio fields: {', '.join(sorted(unknown))}")
+    removed = [key for key, value in patch.items() if value is None]
+    if removed:
+        raise HTTPException(status_code=400, detail=f"Portfolio fields cannot be removed: {', '.join(sorted(removed))}")
+
+    try:
+        validated = PortfolioUpdate.model_validate(patch)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    fields = validated.model_dump(exclude_unset=True, exclude={"data"})
+    return fields, patch.get("data")
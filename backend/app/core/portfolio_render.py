@@ -0,0 +1,186 @@
+import re
+from html import escape
+from typing import Any, Dict, List
+
+# Mirrors the frontend's preview defaults
+DEFAULT_MAIN_COLOR = "#2563EB"
+BACKGROUNDS = {"light": "#F8FAFC", "dark": "#0B1220"}
+TEXT_COLORS = {"light": "#1a202c", "dark": "#ffffff"}
+
+# Colors end up in inline CSS; only accept plain hex or named colors
+COLOR_RE = re.compile(r"^(#[0-9a-fA-F]{3,8}|[a-zA-Z]{3,20})$")
+
+TEMPLATE_CSS = {
+    # Modern Minimalist
+    "1": """
+    .container { max-width: 760px; }
+    h1 { font-weight: 300; font-size: 2.75rem; }
+    h2 { border-bottom-width: 1px; font-weight: 400; }
+    """,
+    # Classic Professional
+    "2": """
+    body { font-family: Georgia, 'Times New Roman', serif; }
+    header { background: var(--main); color: #fff; padding: 32px; border-radius: 4px; }
+    header h1 { color: #fff; }
+    """,
+    # Creative Bold
+    "3": """
+    h1 { font-size: 3.5rem; font-weight: 900; text-transform: uppercase; }
+    h2 { border: none; background: var(--main); color: #fff; display: inline-block; padding: 4px 12px; }
+    .skills li { background: var(--main); color: #fff; border-color: var(--main); }
+    """,
+    # Elegant Sophisticated
+    "4": """
+    body { font-family: 'Palatino Linotype', Palatino, serif; letter-spacing: 0.02em; }
+    header { text-align: center; }
+    h2 { text-align: center; border-bottom-width: 1px; font-weight: 400; letter-spacing: 0.15em; text-transform: uppercase; }
+    """,
+}
+
+
+def _str(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def build_view_model(portfolio: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a portfolio row: the resume document reduced to what the
+    templates display, plus the resolved theme."""
+    data = _dict(portfolio.get("data"))
+    personal = _dict(data.get("personal_information"))
+    contact = _dict(personal.get("contact_info"))
+    education = _dict(personal.get("education"))
+    overview = _dict(data.get("overview"))
+
+    color = _str(portfolio.get("color"))
+    display_mode = portfolio.get("display_mode") if portfolio.get("display_mode") in BACKGROUNDS else "light"
+
+    return {
+        "slug": portfolio.get("slug"),
+        "name": _str(portfolio.get("name")),
+        "template_id": _str(portfolio.get("template_id")),
+        "theme": {
+            "main_color": color if COLOR_RE.match(color) else DEFAULT_MAIN_COLOR,
+            "background_color": BACKGROUNDS[display_mode],
+            "text_color": TEXT_COLORS[display_mode],
+            "display_mode": display_mode,
+        },
+        "personal_information": {
+            "full_name": _str(personal.get("full_name")),
+            "contact_info": {key: _str(contact.get(key)) for key in ("email", "linkedin", "phone", "address")},
+            "education": {
+                "school": _str(education.get("school")),
+                "majors": [_str(m) for m in _list(education.get("majors")) if _str(m)],
+                "minors": [_str(m) for m in _list(education.get("minors")) if _str(m)],
+                "expected_grad": _str(education.get("expected_grad")),
+            },
+        },
+        "overview": {
+            "career_name": _str(overview.get("career_name")),
+            "resume_summary": _str(overview.get("resume_summary")),
+        },
+        "experience": [
+            {key: _str(item.get(key)) for key in ("company", "description", "employed_dates")}
+            for item in map(_dict, _list(data.get("experience")))
+        ],
+        "projects": [
+            {key: _str(item.get(key)) for key in ("title", "description")}
+            for item in map(_dict, _list(data.get("projects")))
+        ],
+        "skills": [_str(skill) for skill in _list(data.get("skills")) if _str(skill)],
+        "updated_at": portfolio.get("updated_at"),
+    }
+
+
+def _section(title: str, body: str) -> str:
+    if not body:
+        return ""
+    return f'<section><h2>{escape(title)}</h2>{body}</section>'
+
+
+def render_html(view: Dict[str, Any]) -> str:
+    """Static HTML for a view model in its template and theme."""
+    theme = view["theme"]
+    person = view["personal_information"]
+    contact = person["contact_info"]
+    education = person["education"]
+    overview = view["overview"]
+    title = person["full_name"] or view["name"] or "Portfolio"
+
+    contact_items = "".join(
+        f"<li>{escape(contact[key])}</li>" for key in ("email", "phone", "address", "linkedin") if contact[key]
+    )
+    experience = "".join(
+        f'<article><h3>{escape(item["company"])}</h3>'
+        f'<p class="meta">{escape(item["employed_dates"])}</p>'
+        f'<p>{escape(item["description"])}</p></article>'
+        for item in view["experience"]
+    )
+    projects = "".join(
+        f'<article><h3>{escape(item["title"])}</h3><p>{escape(item["description"])}</p></article>'
+        for item in view["projects"]
+    )
+    skills = "".join(f"<li>{escape(skill)}</li>" for skill in view["skills"])
+    degree = ", ".join(education["majors"])
+    if education["minors"]:
+        degree += f' (minor: {", ".join(education["minors"])})'
+    education_body = ""
+    if education["school"]:
+        education_body = (
+            f'<article><h3>{escape(education["school"])}</h3>'
+            f'<p>{escape(degree)}</p>'
+            f'<p class="meta">{escape(education["expected_grad"])}</p></article>'
+        )
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>{escape(title)}</title>
+  <meta name="description" content="{escape(overview["resume_summary"][:160])}">
+  <style>
+    :root {{ --main: {theme["main_color"]}; }}
+    * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+    body {{
+      font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+      background: {theme["background_color"]};
+      color: {theme["text_color"]};
+      padding: 20px;
+      line-height: 1.6;
+    }}
+    .container {{ max-width: 1200px; margin: 0 auto; }}
+    h1 {{ color: var(--main); margin-bottom: 10px; }}
+    h2 {{ color: var(--main); margin: 20px 0 10px; border-bottom: 2px solid var(--main); padding-bottom: 5px; }}
+    h3 {{ margin-top: 12px; }}
+    section {{ margin: 20px 0; }}
+    .meta {{ opacity: 0.7; font-size: 0.9em; }}
+    ul {{ list-style: none; }}
+    .contact li {{ display: inline; margin-right: 16px; }}
+    .skills li {{ display: inline-block; margin: 4px; padding: 2px 10px; border: 1px solid var(--main); border-radius: 999px; }}
+    {TEMPLATE_CSS.get(view["template_id"], "")}
+  </style>
+</head>
+<body>
+  <div class="container">
+    <header>
+      <h1>{escape(title)}</h1>
+      <p class="meta">{escape(overview["career_name"])}</p>
+      <ul class="contact">{contact_items}</ul>
+    </header>
+    {_section("About", f'<p>{escape(overview["resume_summary"])}</p>' if overview["resume_summary"] else "")}
+    {_section("Experience", experience)}
+    {_section("Projects", projects)}
+    {_section("Skills", f'<ul class="skills">{skills}</ul>' if skills else "")}
+    {_section("Education", education_body)}
+  </div>
+</body>
+</html>
+"""
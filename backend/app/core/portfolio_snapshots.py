@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.core.executors import run_stage
+from app.core.portfolio_render import build_view_model, render_html
+from app.core.supabase_client import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PortfolioSnapshot:
+    slug: str
+    etag: str
+    view_json: bytes
+    html: str
+
+    @property
+    def html_etag(self) -> str:
+        return f'"{self.etag}"'
+
+    @property
+    def json_etag(self) -> str:
+        return f'"{self.etag}-json"'
+
+
+def build_snapshot(portfolio: Dict[str, Any]) -> PortfolioSnapshot:
+    view = build_view_model(portfolio)
+    view_json = json.dumps(view, separators=(",", ":"), sort_keys=True, default=str).encode()
+    html = render_html(view)
+    digest = hashlib.sha256(view_json + b"\0" + html.encode()).hexdigest()[:32]
+    return PortfolioSnapshot(slug=portfolio["slug"], etag=digest, view_json=view_json, html=html)
+
+
+class SnapshotStore:
+    """Published portfolio snapshots, served to anonymous traffic.
+
+    Snapshots are rendered when a portfolio is published or edited (or on
+    first view if that never happened) and kept in the portfolio_snapshots
+    table; reads go through a small in-process
+    TTL cache (which also remembers unknown slugs) so repeat views and
+    CDN revalidations rarely reach the database.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[PortfolioSnapshot], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, slug: str):
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                return False, None
+            snapshot, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[slug]
+                return False, None
+            self._entries.move_to_end(slug)
+            return True, snapshot
+
+    def _remember(self, slug: str, snapshot: Optional[PortfolioSnapshot]) -> None:
+        with self._lock:
+            self._entries[slug] = (snapshot, time.monotonic() + self.ttl)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def forget(self, slug: str) -> None:
+        with self._lock:
+            self._entries.pop(slug, None)
+
+    async def get(self, slug: str) -> Optional[PortfolioSnapshot]:
+        hit, snapshot = self._cached(slug)
+        if hit:
+            return snapshot
+
+        response = await run_stage(
+            "Database read",
+            get_supabase_client().table("portfolio_snapshots")
+                .select("slug,etag,view,html")
+                .eq("slug", slug)
+                .execute(),
+            settings.db_timeout,
+        )
+        if response.data:
+            row = response.data[0]
+            snapshot = PortfolioSnapshot(
+                slug=row["slug"],
+                etag=row["etag"],
+                view_json=json.dumps(row["view"], separators=(",", ":"), sort_keys=True).encode(),
+                html=row["html"],
+            )
+            self._remember(slug, snapshot)
+            return snapshot
+        return await self._render_missing(slug)
+
+    async def _render_missing(self, slug: str) -> Optional[PortfolioSnapshot]:
+        """Render a published portfolio that has no snapshot yet.
+
+        Covers portfolios published before snapshots existed (migration 006
+        only backfills their slugs) and a snapshot write that failed.
+        """
+        supabase = get_supabase_client()
+        response = await run_stage(
+            "Database read",
+            supabase.table("portfolios").select("*").eq("slug", slug).eq("is_published", True).execute(),
+            settings.db_timeout,
+        )
+        if not response.data:
+            self._remember(slug, None)
+            return None
+        return await self.publish(supabase, response.data[0])
+
+    async def publish(self, supabase: AsyncClient, portfolio: Dict[str, Any]) -> PortfolioSnapshot:
+        snapshot = build_snapshot(portfolio)
+        await run_stage(
+            "Database write",
+            supabase.table("portfolio_snapshots").upsert({
+                "portfolio_id": portfolio["id"],
+                "slug": snapshot.slug,
+                "etag": snapshot.etag,
+                "view": json.loads(snapshot.view_json),
+                "html": snapshot.html,
+            }, on_conflict="portfolio_id").execute(),
+            settings.db_timeout,
+        )
+        self._remember(snapshot.slug, snapshot)
+        return snapshot
+
+    async def withdraw(self, supabase: AsyncClient, portfolio: Dict[str, Any]) -> None:
+        await run_stage(
+            "Database write",
+            supabase.table("portfolio_snapshots").delete().eq("portfolio_id", portfolio["id"]).execute(),
+            settings.db_timeout,
+        )
+        self.forget(portfolio["slug"])
+
+
+snapshot_store = SnapshotStore(settings.snapshot_cache_size, settings.snapshot_cache_seconds)
+
+
+async def sync_portfolio_snapshot(supabase: AsyncClient, portfolio: Dict[str, Any]) -> None:
+    """Bring the public snapshot in line with a freshly written portfolio row.
+
+    Best effort: the write itself has already succeeded.
+    """
+    if not portfolio.get("slug"):
+        return
+    try:
+        if portfolio.get("is_published"):
+            await snapshot_store.publish(supabase, portfolio)
+        else:
+            await snapshot_store.withdraw(supabase, portfolio)
+    except Exception:
+        logger.exception("Error syncing portfolio snapshot")
+
+
+def public_cache_control() -> str:
+    return (
+        f"public, max-age={settings.public_cache_seconds}, "
+        f"s-maxage={settings.public_cdn_cache_seconds}, "
+        f"stale-while-revalidate={settings.public_stale_seconds}"
+    )
@@ -0,0 +1,230 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import READ_CACHE_LOOKUPS, READ_CACHE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Key/value store behind ReadCache.
+
+    `incr` counters hold namespace versions and must never go back to a
+    value they held before a later increment, so they can't simply expire
+    or be evicted (see MemoryCacheBackend for a way to bound them).
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int) -> None: ...
+
+    @abstractmethod
+    async def get_counter(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process TTL + LRU store. Values are kept as-is, not serialized.
+
+    Counters are bounded by LRU too. Their values come from one clock that
+    only moves forward, and a missing counter reads as the clock's value
+    when the last one was evicted. So an evicted counter comes back at or
+    above where it was, never at a version from before its last increment.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._counters: "OrderedDict[str, int]" = OrderedDict()
+        self._clock = 0
+        self._evicted_at = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_counter(self, key: str) -> int:
+        with self._lock:
+            if key not in self._counters:
+                return self._evicted_at
+            self._counters.move_to_end(key)
+            return self._counters[key]
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._clock += 1
+            self._counters[key] = self._clock
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_entries:
+                self._counters.popitem(last=False)
+                self._evicted_at = self._clock
+            return self._clock
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared backend for multi-worker deployments. Needs the `redis` package."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("READ_CACHE_BACKEND=redis requires the 'redis' package")
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Any:
+        raw = await self._redis.get(key)
+        return MISSING if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self._redis.set(key, json.dumps(value, default=str), ex=ttl)
+
+    async def get_counter(self, key: str) -> int:
+        raw = await self._redis.get(key)
+        return int(raw) if raw is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Local stand-in for the shared backend: a SQLite file that every worker
+    process on the machine can open, for development and tests."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS read_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM read_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return MISSING if row is None else json.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO read_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), expires_at),
+            )
+
+    def _incr(self, key: str) -> int:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "INSERT INTO read_cache (key, value, expires_at) VALUES (?, '1', NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1 "
+                "RETURNING value",
+                (key,),
+            ).fetchone()
+        return int(row[0])
+
+    async def get(self, key: str) -> Any:
+        return await run_in_threadpool(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await run_in_threadpool(self._set, key, value, ttl)
+
+    async def get_counter(self, key: str) -> int:
+        value = await run_in_threadpool(self._get, key)
+        return 0 if value is MISSING else int(value)
+
+    async def incr(self, key: str) -> int:
+        return await run_in_threadpool(self._incr, key)
+
+
+class ReadCache:
+    """Per-user cache for dashboard reads, invalidated by writes.
+
+    Entries are namespaced by (user, resource) with a version counter in
+    the key; a write bumps the version, which orphans every cached read of
+    that resource for that user (lists and single items alike) without
+    having to enumerate them. Orphans age out through TTL/LRU.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _version_key(user_id: str, resource: str) -> str:
+        return f"v:{user_id}:{resource}"
+
+    async def get_or_load(
+        self,
+        user_id: str,
+        resource: str,
+        key: Tuple[Any, ...],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        started = time.perf_counter()
+        version = await self.backend.get_counter(self._version_key(user_id, resource))
+        cache_key = f"{user_id}:{resource}:{version}:" + ":".join(str(part) for part in key)
+
+        value = await self.backend.get(cache_key)
+        if value is not MISSING:
+            READ_CACHE_LOOKUPS.labels(resource, "hit").inc()
+            READ_CACHE_SECONDS.labels(resource, "hit").observe(time.perf_counter() - started)
+            return value
+
+        value = await load()
+        await self.backend.set(cache_key, value, self.ttl)
+        READ_CACHE_LOOKUPS.labels(resource, "miss").inc()
+        READ_CACHE_SECONDS.labels(resource, "miss").observe(time.perf_counter() - started)
+        return value
+
+    async def invalidate(self, user_id: str, *resources: str) -> None:
+        for resource in resources:
+            try:
+                await self.backend.incr(self._version_key(user_id, resource))
+            except Exception:
+                logger.exception("Error invalidating read cache")
+
+
+def _create_backend() -> CacheBackend:
+    if settings.read_cache_backend == "memory":
+        return MemoryCacheBackend(settings.read_cache_max_entries)
+    if settings.read_cache_backend == "redis":
+        return RedisCacheBackend(settings.read_cache_redis_url)
+    if settings.read_cache_backend == "sqlite":
+        return SQLiteCacheBackend(settings.read_cache_sqlite_path)
+    raise ValueError(f"Unknown read cache backend: {settings.read_cache_backend}")
+
+
+read_cache = ReadCache(_create_backend(), settings.read_cache_ttl)
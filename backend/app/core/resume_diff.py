@@ -0,0 +1,123 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from app.core.resume_text import clean_resume_text, split_sections
+from app.models.resumes import ContactInfo, Education, Experience, Overview, Project, ResumeSchema
+
+# Which part of ResumeSchema each section heading feeds. The preamble (text
+# before the first heading) holds the name and contact details; headings not
+# listed here feed no field directly and are fingerprinted together as OTHER.
+SECTION_GROUPS: Dict[Optional[str], str] = {
+    None: "contact",
+    "summary": "overview",
+    "profile": "overview",
+    "objective": "overview",
+    "about": "overview",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "work history": "experience",
+    "education": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "projects": "projects",
+}
+OTHER = "other"
+
+# The fields parsed for each group, flattened out of ResumeSchema
+GROUP_FIELDS: Dict[str, Dict[str, Tuple[Any, Any]]] = {
+    "contact": {"full_name": (str, ...), "contact_info": (ContactInfo, ...)},
+    "education": {"education": (Education, ...)},
+    "overview": {"overview": (Overview, ...)},
+    "experience": {"experience": (List[Experience], ...)},
+    "skills": {"skills": (List[str], ...)},
+    "projects": {"projects": (List[Project], ...)},
+}
+
+
+def _group_texts(text: str) -> Dict[str, List[str]]:
+    texts: Dict[str, List[str]] = {}
+    for heading, body in split_sections(clean_resume_text(text)):
+        texts.setdefault(SECTION_GROUPS.get(heading, OTHER), []).append(body)
+    return texts
+
+
+def section_fingerprints(text: str) -> Dict[str, str]:
+    """A hash of the section text feeding each group present in the resume.
+
+    Stored with every resume so the next version can be diffed against it
+    without keeping the old text around.
+    """
+    return {
+        group: hashlib.sha256("\n\n".join(bodies).encode()).hexdigest()
+        for group, bodies in _group_texts(text).items()
+    }
+
+
+@dataclass
+class ReparsePlan:
+    """What to send back to the LLM for a new version of a resume.
+
+    `groups` empty means nothing changed; None means parse the whole text.
+    """
+    fingerprints: Dict[str, str]
+    groups: Optional[Set[str]]
+    text: str = ""
+
+
+def plan_reparse(text: str, previous: Optional[Dict[str, str]]) -> ReparsePlan:
+    """Diff a new version's sections against the previous version's fingerprints."""
+    texts = _group_texts(text)
+    fingerprints = section_fingerprints(text)
+    if not previous:
+        return ReparsePlan(fingerprints, None)
+
+    changed = {group for group in set(fingerprints) | set(previous) if fingerprints.get(group) != previous.get(group)}
+    if not changed:
+        return ReparsePlan(fingerprints, set())
+
+    # Groups without a section of their own were read from the preamble, so
+    # they go along with it. The overview is generated from the whole resume
+    # when there is no summary, and unlisted sections may feed any field: for
+    # those only a full parse will do.
+    absent = set(GROUP_FIELDS) - set(texts)
+    groups = changed | (absent - {"overview"} if "contact" in changed else set())
+    if OTHER in groups or ("overview" in groups and "overview" in absent):
+        return ReparsePlan(fingerprints, None)
+    groups &= set(GROUP_FIELDS)
+    if groups == set(GROUP_FIELDS):
+        return ReparsePlan(fingerprints, None)
+
+    sources = ["contact"] if groups & (absent | {"contact"}) else []
+    sources += [group for group in GROUP_FIELDS if group in groups and group in texts and group != "contact"]
+    excerpt = "\n\n".join(body for group in sources for body in texts.get(group, []))
+    return ReparsePlan(fingerprints, groups, excerpt)
+
+
+def sections_model(groups: Set[str]) -> Type[BaseModel]:
+    """A structured-output model holding only the fields of `groups`."""
+    fields: Dict[str, Any] = {}
+    for group in GROUP_FIELDS:
+        if group in groups:
+            fields.update(GROUP_FIELDS[group])
+    return create_model("ResumeSections", **fields)
+
+
+def merge_sections(previous: ResumeSchema, sections: BaseModel) -> ResumeSchema:
+    """The previous parse with the re-parsed fields swapped in."""
+    merged = previous.model_copy(deep=True)
+    values = dict(sections)
+    info = merged.personal_information
+    if "full_name" in values:
+        info.full_name = values["full_name"]
+        info.contact_info = values["contact_info"]
+    if "education" in values:
+        info.education = values["education"]
+    for field in ("overview", "experience", "skills", "projects"):
+        if field in values:
+            setattr(merged, field, values[field])
+    return merged
@@ -1,22 +1,126 @@
-from app.core.openai_client import gpt_client
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.llm_governor import get_llm_governor
+from app.core.metrics import OPENAI_PARSE_TOKENS
+from app.core.openai_client import get_openai_client
+from app.core.resume_text import count_tokens
+from app.core.tracing import span
 from app.models.resumes import ResumeSchema
 
+MODEL = "gpt-4o"
+# Bump whenever the prompt changes so cached parses are not reused.
+PROMPT_VERSION = "2"
+
+SYSTEM_PROMPTS = [
+    "You are a resume parser.",
+    "if nothing is parsed for the overview section, automatically generate only the overview, and leave career_name empty",
+]
+# For re-parsing the changed sections of a new resume version (see core/resume_diff.py)
+SECTION_PROMPTS = [
+    *SYSTEM_PROMPTS,
+    "The text is an excerpt of a resume; fill in only the requested fields from it.",
+]
+# Fields read from the text by rules beforehand (see core/resume_prefill.py)
+PREFILL_PROMPT = (
+    "These fields were already read from the resume text, keyed by their path in the output; "
+    "use them as given unless the text clearly contradicts them: {fields}"
+)
 
-def parse_resume_with_openai(resume_text: str) -> ResumeSchema:
-    # OpenAI call
-    response = gpt_client.responses.parse(
-        model="gpt-4o",
-        input=[
-            {"role": "system", "content": "You are a resume parser."},
-            {"role": "system", "content": "if nothing is parsed for the overview section, automatically generate only the overview, and leave career_name empty"},
-            {"role": "user", "content": f"""
+M = TypeVar("M", bound=BaseModel)
+
+
+def build_input(
+    resume_text: str,
+    prompts: Sequence[str] = SYSTEM_PROMPTS,
+    prefilled: Optional[Dict[str, Any]] = None,
+) -> List[dict]:
+    if prefilled:
+        prompts = [*prompts, PREFILL_PROMPT.format(fields=json.dumps(prefilled, ensure_ascii=False))]
+    return [
+        *({"role": "system", "content": prompt} for prompt in prompts),
+        {"role": "user", "content": f"""
                 Parse this resume text: {resume_text}
              """}
-        ],
-        text_format=ResumeSchema
+    ]
+
+
+async def parse_resume(
+    resume_text: str,
+    text_format: Type[M] = ResumeSchema,
+    prompts: Sequence[str] = SYSTEM_PROMPTS,
+    prefilled: Optional[Dict[str, Any]] = None,
+) -> Tuple[M, str]:
+    """Parse resume text through the governor; returns (resume, model used).
+
+    The model is the fallback model when the primary was unavailable. Pass a
+    narrower `text_format` (and prompts) to parse only some fields, and
+    `prefilled` for fields already known (path -> value).
+    """
+    messages = build_input(resume_text, prompts, prefilled)
+    estimated_tokens = (
+        sum(count_tokens(message["content"]) for message in messages)
+        + settings.openai_expected_output_tokens
     )
+
+    async def call(model: str):
+        return await get_openai_client().responses.parse(
+            model=model,
+            input=messages,
+            text_format=text_format
+        )
+
+    async with span("llm"):
+        response, model = await get_llm_governor(MODEL).run(call, estimated_tokens)
+    return _output(response, model), model
+
+
+async def parse_resume_stream(
+    resume_text: str,
+    on_snapshot: Callable[[str], None],
+    prefilled: Optional[Dict[str, Any]] = None,
+) -> Tuple[ResumeSchema, str]:
+    """parse_resume over the streaming API.
+
+    `on_snapshot` gets the JSON text generated so far after every delta. A
+    retried attempt starts its snapshots over from the beginning.
+    """
+    messages = build_input(resume_text, prefilled=prefilled)
+    estimated_tokens = (
+        sum(count_tokens(message["content"]) for message in messages)
+        + settings.openai_expected_output_tokens
+    )
+
+    async def call(model: str):
+        async with get_openai_client().responses.stream(
+            model=model,
+            input=messages,
+            text_format=ResumeSchema,
+        ) as stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    on_snapshot(event.snapshot)
+            return await stream.get_final_response()
+
+    async with span("llm"):
+        response, model = await get_llm_governor(MODEL).run(call, estimated_tokens)
+    return _output(response, model), model
+
+
+def _output(response, model: str):
     if not response or not response.output_parsed:
         raise ValueError("No response from OpenAI")
 
-    parsed_resume: ResumeSchema = response.output_parsed
+    if response.usage:
+        OPENAI_PARSE_TOKENS.labels(model, "input").observe(response.usage.input_tokens)
+        OPENAI_PARSE_TOKENS.labels(model, "output").observe(response.usage.output_tokens)
+
+    return response.output_parsed
+
+
+async def parse_resume_with_openai(resume_text: str) -> ResumeSchema:
+    parsed_resume, _ = await parse_resume(resume_text)
     return parsed_resume
@@ -0,0 +1,194 @@
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from supabase import AsyncClient
+
+from app.core.config import settings
+from app.core.executors import run_stage
+from app.core.metrics import (
+    PARSE_CACHE_LOOKUPS,
+    RESUME_PREFILL_FIELDS,
+    RESUME_REPARSE_GROUPS,
+    RESUME_REPARSES,
+    RESUME_TEXT_TOKENS,
+)
+from app.core.parse_cache import parse_cache
+from app.core.read_cache import read_cache
+from app.core.llm_governor import LLMUnavailable
+from app.core.resume_diff import merge_sections, plan_reparse, sections_model
+from app.core.resume_parser import MODEL, SECTION_PROMPTS, parse_resume, parse_resume_stream
+from app.core.resume_prefill import Prefill, extract_prefill
+from app.core.resume_stream import FieldTracker
+from app.core.resume_text import prepare_resume_text
+from app.models.resumes import Resume, ResumeSchema
+
+
+ALLOWED_TYPES = {
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+}
+
+
+def resume_file_path(user_id: str, resume_id: str, content_type: str) -> str:
+    return f"{user_id}/resumes/{resume_id}{ALLOWED_TYPES[content_type]}"
+
+
+async def parse_text(
+    text: str,
+    use_cache: bool = True,
+    tracker: Optional[FieldTracker] = None,
+    prefill: Optional[Prefill] = None,
+    fast: bool = False,
+) -> ResumeSchema:
+    """Parse extracted resume text, reusing a cached parse of the same text.
+
+    Contact details and education are read with rules first (pass `prefill`
+    if the caller already has them) and given to the model as known fields;
+    email, phone and LinkedIn are kept exactly as read. With fast=True the
+    model is skipped and the result is the prefill alone.
+
+    The text is cleaned and fitted to the token budget before parsing; the
+    cache is keyed on the cleaned text. With use_cache=False the lookup is
+    skipped but the fresh parse is still written back, so a forced re-parse
+    also refreshes the cache. With a tracker the parse is streamed and each
+    field is reported to it as soon as it is complete.
+    """
+    if prefill is None:
+        prefill = extract_prefill(text)
+    _observe_prefill(prefill)
+    if fast:
+        parsed = prefill.to_resume()
+        if tracker is not None:
+            tracker.finish(parsed)
+        return parsed
+
+    prepared = prepare_resume_text(text)
+    RESUME_TEXT_TOKENS.labels("raw").observe(prepared.raw_tokens)
+    RESUME_TEXT_TOKENS.labels("prepared").observe(prepared.tokens)
+    text = prepared.text
+
+    if use_cache:
+        cached = await parse_cache.get(text)
+        if cached is not None:
+            if tracker is not None:
+                tracker.finish(cached)
+            return cached
+    else:
+        PARSE_CACHE_LOOKUPS.labels("bypass").inc()
+
+    if tracker is None:
+        parsed, model = await _parse(parse_resume(text, prefilled=prefill.hints()))
+    else:
+        parsed, model = await _parse(parse_resume_stream(text, tracker.feed, prefilled=prefill.hints()))
+    parsed = prefill.apply(parsed)
+    if tracker is not None:
+        tracker.finish(parsed)
+
+    # Don't let a fallback model's parse stand in for the primary model's
+    if model == MODEL:
+        await parse_cache.put(text, parsed)
+    return parsed
+
+
+def _observe_prefill(prefill: Prefill) -> None:
+    for name, value in asdict(prefill).items():
+        RESUME_PREFILL_FIELDS.labels(name, "found" if value else "missing").inc()
+
+
+async def _parse(awaitable):
+    try:
+        return await run_stage("Resume parsing", awaitable, settings.openai_timeout)
+    except LLMUnavailable as e:
+        headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after else None
+        raise HTTPException(
+            status_code=503,
+            detail="Resume parsing is temporarily unavailable, please retry shortly.",
+            headers=headers,
+        )
+
+
+async def reparse_text(
+    text: str,
+    previous: ResumeSchema,
+    previous_fingerprints: Optional[Dict[str, str]],
+    use_cache: bool = True,
+) -> Tuple[ResumeSchema, Dict[str, str]]:
+    """Parse a new version of a resume, re-parsing only the changed sections.
+
+    Sections are diffed against the previous version's fingerprints; the
+    changed ones are parsed on their own and merged into the previous parse.
+    Falls back to a full parse_text when the diff can't be trusted (no
+    fingerprints, unlisted sections changed, or everything changed). Returns
+    the parse and the new version's fingerprints.
+    """
+    plan = plan_reparse(text, previous_fingerprints)
+    if plan.groups is None:
+        RESUME_REPARSES.labels("full").inc()
+        return await parse_text(text, use_cache=use_cache), plan.fingerprints
+    if not plan.groups:
+        RESUME_REPARSES.labels("unchanged").inc()
+        return previous.model_copy(deep=True), plan.fingerprints
+
+    RESUME_REPARSES.labels("partial").inc()
+    for group in plan.groups:
+        RESUME_REPARSE_GROUPS.labels(group).inc()
+    excerpt = prepare_resume_text(plan.text)
+    RESUME_TEXT_TOKENS.labels("prepared").observe(excerpt.tokens)
+    sections, _ = await _parse(parse_resume(excerpt.text, sections_model(plan.groups), SECTION_PROMPTS))
+    return extract_prefill(text).apply(merge_sections(previous, sections)), plan.fingerprints
+
+
+async def store_file(supabase: AsyncClient, file_path: str, source: Union[bytes, str], content_type: str) -> None:
+    """Upload to storage from bytes or, for spooled uploads, a file path."""
+    await run_stage(
+        "Storage upload",
+        supabase.storage.from_("users").upload(
+            file_path,
+            source,
+            {
+                "content-type": content_type
+            }
+        ),
+        settings.storage_timeout,
+    )
+
+
+async def remove_file(supabase: AsyncClient, file_path: str) -> None:
+    """Best-effort removal, used to roll back a failed upload."""
+    try:
+        await supabase.storage.from_("users").remove([file_path])
+    except Exception:
+        pass
+
+
+async def insert_resume(supabase: AsyncClient, resume: Resume) -> dict:
+    result = await run_stage(
+        "Database insert",
+        supabase.table("resumes").insert(resume.model_dump()).execute(),
+        settings.db_timeout,
+    )
+    await read_cache.invalidate(resume.user_id, "resumes")
+    if not result.data or len(result.data) == 0:
+        raise Exception("No data returned from insert.")
+    return result.data[0]
+
+
+async def insert_resumes(supabase: AsyncClient, resumes: List[Resume]) -> List[dict]:
+    """Insert several resume rows in one statement."""
+    result = await run_stage(
+        "Database insert",
+        supabase.table("resumes").insert([resume.model_dump() for resume in resumes]).execute(),
+        settings.db_timeout,
+    )
+    for user_id in {resume.user_id for resume in resumes}:
+        await read_cache.invalidate(user_id, "resumes")
+    if not result.data or len(result.data) != len(resumes):
+        raise Exception("Batch insert returned an unexpected number of rows.")
+    return result.data
+
+
+def error_message(e: Exception) -> str:
+    if isinstance(e, HTTPException):
+        return str(e.detail)
+    return str(e)
@@ -0,0 +1,254 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.resume_text import clean_resume_text, split_sections
+from app.models.resumes import ContactInfo, Education, Overview, PersonalInformation, ResumeSchema
+
+# Fields the rules read exactly as written; these replace the model's values.
+# The rest of the prefill is passed to the model as hints only.
+EXACT_FIELDS = ("email", "phone", "linkedin")
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+_LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w%-]+/?", re.IGNORECASE)
+_PHONE_RE = re.compile(r"(?<![\w/.])(?:\+\d{1,3}[ .-]?)?(?:\(\d{2,4}\) ?|\d{2,4}[ .-])(?:\d{2,4}[ .-]){0,2}\d{3,4}(?![\w/])")
+_YEAR_RANGE_RE = re.compile(r"^(19|20)\d\d\s*[-–]\s*(19|20)\d\d$")
+_ADDRESS_RE = re.compile(
+    r"^(?:\d+\s+[\w .'-]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Way|Ct|Court)\b\.?,?\s*)?"
+    r"[A-Z][A-Za-z .'-]+,\s*[A-Z]{2}(?:\s+\d{5}(?:-\d{4})?)?$"
+)
+_SEGMENT_SPLIT_RE = re.compile(r"\s*(?:\||•|·|◦|\s[-–—]\s)\s*")
+_NAME_WORD = r"[^\W\d_]+(?:['-][^\W\d_]+)*\.?"
+_NAME_RE = re.compile(r"^" + _NAME_WORD + r"(?:\s+" + _NAME_WORD + r"){1,4}$")
+
+_SCHOOL_RE = re.compile(r"\b(University|College|Institute|School|Academy|Polytechnic)\b")
+_DEGREE = (
+    r"(?:B\.?\s?S\.?|B\.?\s?A\.?|B\.?\s?Sc\.?|B\.?\s?Eng\.?|M\.?\s?S\.?|M\.?\s?A\.?|M\.?\s?Eng\.?|Ph\.?\s?D\.?"
+    r"|(?:Bachelor|Master|Associate)(?:'s)?(?:\s+of\s+[A-Z][a-z]+(?:\s+in)?)?)"
+)
+# Spaces only: a degree never continues onto the next line, and "Boston, MA\n..."
+# must not read as a Master of Arts
+_MAJOR_RE = re.compile(
+    r"(?<![A-Za-z])" + _DEGREE + r"(?:[ \t]+in|[ \t]*,|[ \t]*:)?[ \t]+(?!in\b)([A-Z][A-Za-z&/ \t]*?[A-Za-z])"
+    r"(?=[ \t]*(?:,|;|\(|\||[ \t][-–—][ \t]|(?i:\bminor|\bwith\b|\bexpected\b)|$))",
+    re.MULTILINE,
+)
+_MAJORS_LIST_RE = re.compile(r"\bmajors?\s*(?::|in)\s*([^;|\n(]+)", re.IGNORECASE)
+_MINORS_RE = re.compile(r"\bminors?\s*(?::|in)\s*([^;|\n(]+)", re.IGNORECASE)
+_MONTHS = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?|Spring|Summer|Fall|Autumn|Winter)"
+_DATE = r"(?:" + _MONTHS + r"\.?\s+)?(?:19|20)\d\d"
+_EXPECTED_RE = re.compile(r"(?:expected|anticipated|graduating|graduation|class of)\s*:?\s*(" + _DATE + r")", re.IGNORECASE)
+_DATE_RE = re.compile(_DATE)
+# Where a list of majors or minors ends and the graduation date begins
+_LIST_END_RE = re.compile(r",?\s*\b(?:minors?|expected|anticipated|graduat\w*|class of)\b|,\s*(?=" + _DATE + r")", re.IGNORECASE)
+_SKILL_LABEL_RE = re.compile(r"^[A-Za-z][\w /&+-]{0,30}:\s*")
+_SKILL_SPLIT_RE = re.compile(r"\s*(?:,|;|\||•|·|◦|\t)\s*")
+
+# A title line ("Curriculum Vitae", "Professional Resume") reads like a name
+_TITLE_WORDS = {"resume", "résumé", "resumé", "cv", "curriculum", "vitae", "vita", "portfolio"}
+# All-caps words whose title case can't be guessed: MACDONALD is MacDonald
+# or Macdonald, MACK is Mack
+_AMBIGUOUS_CASE_RE = re.compile(r"^MAC[A-Z]{3,}$")
+
+_SUMMARY_HEADINGS = ("summary", "profile", "objective", "about")
+_SKILLS_HEADINGS = ("skills", "technical skills")
+
+
+@dataclass
+class Prefill:
+    """Resume fields read from the text by rules, before any LLM call.
+
+    A field the rules could not find is None (or empty, for lists).
+    """
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    linkedin: Optional[str] = None
+    address: Optional[str] = None
+    school: Optional[str] = None
+    majors: List[str] = field(default_factory=list)
+    minors: List[str] = field(default_factory=list)
+    expected_grad: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    summary: Optional[str] = None
+
+    def hints(self) -> Dict[str, Any]:
+        """Found name, contact and education fields, by ResumeSchema path."""
+        paths = {
+            "personal_information.full_name": self.full_name,
+            "personal_information.contact_info.email": self.email,
+            "personal_information.contact_info.phone": self.phone,
+            "personal_information.contact_info.linkedin": self.linkedin,
+            "personal_information.contact_info.address": self.address,
+            "personal_information.education.school": self.school,
+            "personal_information.education.majors": self.majors,
+            "personal_information.education.minors": self.minors,
+            "personal_information.education.expected_grad": self.expected_grad,
+        }
+        return {path: value for path, value in paths.items() if value}
+
+    def fields(self) -> Dict[str, Any]:
+        """Everything found, by ResumeSchema path; what the client is sent."""
+        found = self.hints()
+        if self.skills:
+            found["skills"] = self.skills
+        if self.summary:
+            found["overview.resume_summary"] = self.summary
+        return found
+
+    def apply(self, parsed: ResumeSchema) -> ResumeSchema:
+        """The model's parse with the exactly-read fields put back."""
+        contact = parsed.personal_information.contact_info
+        for name in EXACT_FIELDS:
+            value = getattr(self, name)
+            if value:
+                setattr(contact, name, value)
+        return parsed
+
+    def to_resume(self) -> ResumeSchema:
+        """A minimal ResumeSchema from the prefill alone (fast mode).
+
+        Experience and projects need the model and are left empty.
+        """
+        return ResumeSchema(
+            resume_pdf="",
+            portfolio_id="",
+            personal_information=PersonalInformation(
+                full_name=self.full_name or "",
+                contact_info=ContactInfo(
+                    email=self.email or "",
+                    linkedin=self.linkedin or "",
+                    phone=self.phone or "",
+                    address=self.address or "",
+                ),
+                education=Education(
+                    school=self.school or "",
+                    majors=self.majors,
+                    minors=self.minors,
+                    expected_grad=self.expected_grad or "",
+                ),
+            ),
+            overview=Overview(career_name="", resume_summary=self.summary or ""),
+            projects=[],
+            skills=self.skills,
+            experience=[],
+        )
+
+
+def _segments(lines: List[str]) -> List[str]:
+    return [segment for line in lines for segment in _SEGMENT_SPLIT_RE.split(line) if segment]
+
+
+def _phone(text: str) -> Optional[str]:
+    for match in _PHONE_RE.finditer(text):
+        candidate = match.group(0).strip()
+        digits = sum(c.isdigit() for c in candidate)
+        if 7 <= digits <= 15 and not _YEAR_RANGE_RE.match(candidate):
+            return candidate
+    return None
+
+
+def _title_case(name: str) -> str:
+    """MCDONALD -> McDonald, O'BRIEN -> O'Brien; as written if it's unclear."""
+    words = name.split()
+    if any(_AMBIGUOUS_CASE_RE.match(word) for word in words):
+        return name
+    cased = []
+    for word in words:
+        word = word.title()
+        if word.startswith("Mc") and len(word) > 2:
+            word = "Mc" + word[2:].capitalize()
+        cased.append(word)
+    return " ".join(cased)
+
+
+def _name(lines: List[str]) -> Optional[str]:
+    for segment in _segments(lines[:3]):
+        if "@" in segment or any(c.isdigit() for c in segment) or not _NAME_RE.match(segment):
+            continue
+        if any(word.strip(".").lower() in _TITLE_WORDS for word in segment.split()):
+            continue
+        # An all-caps heading-style name reads better in title case
+        return _title_case(segment) if segment.isupper() else segment
+    return None
+
+
+def _split_list(value: str) -> List[str]:
+    items = re.split(r"\s*(?:,|/|&|\band\b)\s*", value.strip().rstrip("."))
+    return [item for item in (i.strip() for i in items) if item and not _DATE_RE.fullmatch(item)]
+
+
+def _education(body: str, prefill: Prefill) -> None:
+    lines = [line for line in body.split("\n")[1:] if line.strip()]
+    for line in lines:
+        match = _SCHOOL_RE.search(line)
+        if match:
+            segment = next(s for s in _SEGMENT_SPLIT_RE.split(line) if _SCHOOL_RE.search(s))
+            # "State University, Springfield, IL": the school ends at the comma
+            # unless the keyword comes after it ("Springfield, University of X" is rare)
+            prefill.school = segment.split(",")[0].strip() if _SCHOOL_RE.search(segment.split(",")[0]) else segment.strip()
+            break
+
+    text = "\n".join(lines)
+    majors = _MAJORS_LIST_RE.search(text)
+    if majors:
+        prefill.majors = _split_list(_LIST_END_RE.split(majors.group(1))[0])
+    else:
+        prefill.majors = list(dict.fromkeys(m.group(1).strip() for m in _MAJOR_RE.finditer(text)))
+    minors = _MINORS_RE.search(text)
+    if minors:
+        prefill.minors = _split_list(_LIST_END_RE.split(minors.group(1))[0])
+
+    expected = _EXPECTED_RE.search(text)
+    if expected:
+        prefill.expected_grad = expected.group(1)
+    else:
+        # The latest date in the section: a range's end, or the only date
+        dates = _DATE_RE.findall(text)
+        if dates:
+            prefill.expected_grad = max(dates, key=lambda d: d[-4:])
+
+
+def _skills(body: str) -> List[str]:
+    skills: Dict[str, str] = {}
+    for line in body.split("\n")[1:]:
+        line = _SKILL_LABEL_RE.sub("", line.strip().lstrip("-*•· "))
+        for item in _SKILL_SPLIT_RE.split(line):
+            item = item.strip().rstrip(".")
+            if item and len(item) <= 40:
+                skills.setdefault(item.lower(), item)
+    return list(skills.values())
+
+
+def extract_prefill(text: str) -> Prefill:
+    """Read contact details, education, skills and summary with rules.
+
+    Cheap enough (well under a millisecond for a typical resume) to run on
+    the request path between text extraction and the LLM call.
+    """
+    prefill = Prefill()
+    sections = split_sections(clean_resume_text(text))
+    if not sections:
+        return prefill
+
+    preamble = sections[0][1] if sections[0][0] is None else ""
+    lines = [line for line in preamble.split("\n") if line.strip()]
+
+    email = _EMAIL_RE.search(preamble)
+    prefill.email = email.group(0) if email else None
+    linkedin = _LINKEDIN_RE.search(preamble)
+    prefill.linkedin = linkedin.group(0).rstrip("/") if linkedin else None
+    remainder = _LINKEDIN_RE.sub(" ", _EMAIL_RE.sub(" ", preamble))
+    prefill.phone = _phone(remainder)
+    prefill.full_name = _name(lines)
+    prefill.address = next((s for s in _segments(lines) if _ADDRESS_RE.match(s)), None)
+
+    for heading, body in sections:
+        if heading == "education" and prefill.school is None:
+            _education(body, prefill)
+        elif heading in _SKILLS_HEADINGS and not prefill.skills:
+            prefill.skills = _skills(body)
+        elif heading in _SUMMARY_HEADINGS and prefill.summary is None:
+            summary = " ".join(line.strip() for line in body.split("\n")[1:] if line.strip())
+            prefill.summary = summary or None
+    return prefill
@@ -0,0 +1,93 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jiter import from_json
+
+from app.models.resumes import ResumeSchema
+
+# The parts of ResumeSchema sent to the client as soon as each is complete,
+# in the order the model generates them. Name and contact details come first.
+STREAM_FIELDS: List[Tuple[str, ...]] = [
+    ("personal_information", "full_name"),
+    ("personal_information", "contact_info"),
+    ("personal_information", "education"),
+    ("overview",),
+    ("projects",),
+    ("skills",),
+    ("experience",),
+]
+
+Emit = Callable[[str, Any], None]
+
+
+def _lookup(obj: Any, path: Tuple[str, ...]) -> Tuple[bool, Any]:
+    """(complete, value) for `path` in a partially generated object.
+
+    Object keys are generated in schema order, so a value is complete once
+    a later sibling of it, or of one of its parents, has started.
+    """
+    complete = False
+    for key in path:
+        if not isinstance(obj, dict) or key not in obj:
+            return False, None
+        keys = list(obj)
+        complete = complete or keys.index(key) < len(keys) - 1
+        obj = obj[key]
+    return complete, obj
+
+
+class FieldTracker:
+    """Turns the growing JSON text of a streamed parse into completed fields.
+
+    Each field in STREAM_FIELDS is emitted once, as "a.b" path and value.
+    Values from the streamed text are provisional; the final validated
+    object is what gets stored.
+    """
+
+    def __init__(self, emit: Emit):
+        self.emit = emit
+        self.started = time.perf_counter()
+        self.first_field_at: Optional[float] = None
+        self._pending = list(STREAM_FIELDS)
+        self._length = 0
+
+    def _emit(self, path: Tuple[str, ...], value: Any) -> None:
+        if self.first_field_at is None:
+            self.first_field_at = time.perf_counter()
+        self.emit(".".join(path), value)
+
+    def feed(self, snapshot: str) -> None:
+        # A new key can only have started if the text grew past a delimiter
+        if not self._pending or len(snapshot) < self._length:
+            self._length = len(snapshot)
+            return
+        grown = snapshot[self._length:]
+        self._length = len(snapshot)
+        if "," not in grown and "}" not in grown and ":" not in grown:
+            return
+        try:
+            partial = from_json(snapshot.encode(), partial_mode=True)
+        except ValueError:
+            return
+        still_pending = []
+        for path in self._pending:
+            complete, value = _lookup(partial, path)
+            if complete:
+                self._emit(path, value)
+            else:
+                still_pending.append(path)
+        self._pending = still_pending
+
+    def finish(self, parsed: ResumeSchema) -> None:
+        """Emit whatever is left from the final object."""
+        data: Dict[str, Any] = parsed.model_dump(mode="json")
+        for path in self._pending:
+            value: Any = data
+            for key in path:
+                value = value[key]
+            self._emit(path, value)
+        self._pending = []
+
+    @property
+    def time_to_first_field(self) -> Optional[float]:
+        return None if self.first_field_at is None else self.first_field_at - self.started
@@ -0,0 +1,200 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+# Section headings, in the order their content is kept when the prompt is
+# over budget. The text before the first heading (name, contact details)
+# always ranks first; unknown sections rank after all of these.
+SECTION_PRIORITY = [
+    "summary", "profile", "objective", "about",
+    "experience", "work experience", "professional experience", "employment", "work history",
+    "education",
+    "skills", "technical skills",
+    "projects",
+    "certifications", "awards", "honors", "leadership", "activities", "publications", "volunteer",
+    "languages", "interests", "hobbies", "references",
+]
+
+_HEADING_RE = re.compile(
+    r"^\s*(%s)\s*:?\s*$" % "|".join(re.escape(h) for h in sorted(SECTION_PRIORITY, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+_PAGE_NUMBER_RE = re.compile(r"^\s*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?\s*$", re.IGNORECASE)
+_HYPHENATED_RE = re.compile(r"\b([A-Za-z]*[a-z])-\n([a-z]+)")
+# Hyphenated compounds that can break at a line end ("self-\nmotivated",
+# "data-\ndriven"): these keep their hyphen rather than being joined
+_COMPOUND_FIRST = {
+    "self", "well", "high", "low", "long", "short", "full", "part", "cross", "real", "fast", "open",
+    "end", "front", "back", "non", "multi", "cloud", "data", "user", "customer",
+    "client", "server", "team", "detail", "results", "goal", "mission", "fault", "hands", "state",
+}
+_COMPOUND_SECOND = {
+    "based", "driven", "oriented", "facing", "focused", "level", "time", "scale", "stack", "end",
+    "source", "side", "known", "motivated", "term", "solving", "world", "native", "friendly",
+    "depth", "house", "like", "made", "minded",
+}
+_CONTACT_RE = re.compile(r"@|https?://|www\.|linkedin\.com|\d{3}[ .-]?\d{3,4}")
+_INLINE_SPACE_RE = re.compile(r"[ \t\u00a0\u200b]+")
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0e-\x1f\x7f]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count for the LLM prompt; ~4 chars/token if tiktoken is missing."""
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _edge_key(line: str) -> str:
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+
+def remove_page_furniture(text: str) -> str:
+    """Drop page numbers and header/footer lines repeated across pages.
+
+    pdfminer separates pages with form feeds; a line counts as a header or
+    footer when it is within the first/last two lines of at least two pages.
+    The first copy of each is kept.
+    """
+    pages = [page.split("\n") for page in text.split("\f")]
+
+    def edges(lines: List[str]) -> List[str]:
+        content = [line for line in lines if line.strip()]
+        return content[:2] + content[-2:]
+
+    repeated = set()
+    if len(pages) > 1:
+        counts = Counter(key for page in pages for key in {_edge_key(line) for line in edges(page)})
+        repeated = {key for key, n in counts.items() if n >= 2}
+
+    # A repeated edge line is kept where it first appears and dropped on
+    # later pages: resumes often repeat the name and contact line as a
+    # running header, and the first copy is the one the parse needs
+    kept = []
+    seen = set()
+    for number, page in enumerate(pages):
+        page_edges = {_edge_key(line) for line in edges(page)}
+        for line in page:
+            key = _edge_key(line)
+            if _PAGE_NUMBER_RE.match(line):
+                continue
+            if key in repeated and key in page_edges:
+                if key in seen and not (number == 0 and _CONTACT_RE.search(line)):
+                    continue
+                seen.add(key)
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def normalize_whitespace(text: str) -> str:
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n")
+    text = _CONTROL_RE.sub("", text)
+    lines = [_INLINE_SPACE_RE.sub(" ", line).strip() for line in text.split("\n")]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _join_hyphenated(match: "re.Match[str]") -> str:
+    first, second = match.group(1), match.group(2)
+    if first.lower() in _COMPOUND_FIRST or second in _COMPOUND_SECOND:
+        return f"{first}-{second}"
+    return first + second
+
+
+def dehyphenate(text: str) -> str:
+    """Rejoin words broken across lines ("develop-\nment"), keeping the
+    hyphen of compounds that happened to break there ("self-\nmotivated")."""
+    return _HYPHENATED_RE.sub(_join_hyphenated, text)
+
+
+def split_sections(text: str) -> List[Tuple[Optional[str], str]]:
+    """Split into (heading, body) pairs; the preamble has heading None."""
+    sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    for line in text.split("\n"):
+        match = _HEADING_RE.match(line)
+        if match:
+            sections.append((match.group(1).lower(), [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, "\n".join(lines).strip("\n")) for heading, lines in sections if any(l.strip() for l in lines)]
+
+
+def _priority(heading: Optional[str]) -> int:
+    if heading is None:
+        return -1
+    return SECTION_PRIORITY.index(heading) if heading in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+
+def _truncate(body: str, budget: int) -> str:
+    if budget <= 0:
+        return ""
+    kept: List[str] = []
+    used = 0
+    for line in body.split("\n"):
+        tokens = count_tokens(line + "\n")
+        if used + tokens > budget:
+            break
+        kept.append(line)
+        used += tokens
+    return "\n".join(kept)
+
+
+def fit_token_budget(text: str, budget: int) -> str:
+    """Trim to `budget` tokens, giving the budget to sections by priority.
+
+    Each section keeps whole lines from its start until its share runs out;
+    sections are reassembled in their original order.
+    """
+    if count_tokens(text) <= budget:
+        return text
+
+    sections = split_sections(text)
+    remaining = budget
+    kept = {}
+    for index in sorted(range(len(sections)), key=lambda i: _priority(sections[i][0])):
+        body = sections[index][1]
+        tokens = count_tokens(body + "\n\n")
+        kept[index] = body if tokens <= remaining else _truncate(body, remaining)
+        remaining -= min(tokens, remaining)
+
+    return "\n\n".join(kept[i] for i in range(len(sections)) if kept[i].strip())
+
+
+def clean_resume_text(text: str) -> str:
+    """Strip page furniture and normalize whitespace and hyphenation."""
+    cleaned = remove_page_furniture(text)
+    cleaned = normalize_whitespace(cleaned)
+    return dehyphenate(cleaned)
+
+
+@dataclass
+class PreparedText:
+    text: str
+    raw_tokens: int
+    tokens: int
+
+
+def prepare_resume_text(text: str, budget: Optional[int] = None) -> PreparedText:
+    """Clean extracted resume text and fit it to the LLM input token budget."""
+    budget = settings.llm_input_token_budget if budget is None else budget
+    raw_tokens = count_tokens(text)
+    cleaned = fit_token_budget(clean_resume_text(text), budget)
+
+    return PreparedText(text=cleaned, raw_tokens=raw_tokens, tokens=count_tokens(cleaned))
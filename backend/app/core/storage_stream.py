@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import settings
+from app.core.supabase_client import get_http_client
+
+# Response headers passed through from Supabase Storage. The body is relayed
+# as sent (still encoded), so the length and encoding go through together.
+PASSTHROUGH_HEADERS = (
+    "content-type", "content-length", "content-encoding", "content-range", "etag", "last-modified",
+)
+
+
+@dataclass
+class ObjectMeta:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: str
+
+
+class ObjectMetaCache:
+    """TTL + LRU cache of storage object metadata, keyed by bucket/path.
+
+    Lets a conditional request be answered with 304 without a storage call.
+    Entries must be invalidated whenever the object is replaced or removed.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[ObjectMeta, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[ObjectMeta]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            meta, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return meta
+
+    def put(self, key: str, meta: ObjectMeta) -> None:
+        with self._lock:
+            self._entries[key] = (meta, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+object_meta_cache = ObjectMetaCache(settings.storage_meta_cache_size, settings.storage_meta_cache_seconds)
+
+
+def object_key(bucket: str, path: str) -> str:
+    return f"{bucket}/{path}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    strip_weak = lambda tag: tag.strip().removeprefix("W/")
+    return strip_weak(etag) in {strip_weak(tag) for tag in if_none_match.split(",")}
+
+
+def _not_modified(meta: ObjectMeta, cache_control: str) -> Response:
+    headers = {"Cache-Control": cache_control}
+    if meta.etag:
+        headers["ETag"] = meta.etag
+    if meta.last_modified:
+        headers["Last-Modified"] = meta.last_modified
+    return Response(status_code=304, headers=headers)
+
+
+async def stream_object(
+    request: Request,
+    bucket: str,
+    path: str,
+    cache_control: str,
+    filename: Optional[str] = None,
+) -> Response:
+    """Stream a storage object to the client.
+
+    Forwards Range, conditional and Accept-Encoding headers to Supabase
+    Storage and relays 206/304 responses, with the body as sent. A matching
+    If-None-Match on a cached ETag is answered locally.
+    """
+    key = object_key(bucket, path)
+    range_header = request.headers.get("range")
+    if_none_match = request.headers.get("if-none-match")
+
+    meta = object_meta_cache.get(key)
+    if meta is not None and range_header is None and etag_matches(if_none_match, meta.etag):
+        return _not_modified(meta, cache_control)
+
+    upstream_headers = {
+        "Authorization": f"Bearer {settings.supabase_service_role_key}",
+        "apikey": settings.supabase_service_role_key,
+    }
+    for name in ("range", "if-range", "if-none-match", "if-modified-since"):
+        value = request.headers.get(name)
+        if value is not None:
+            upstream_headers[name] = value
+    # Only ask for an encoding the client can decode (httpx would otherwise
+    # ask for gzip on its behalf)
+    upstream_headers["accept-encoding"] = request.headers.get("accept-encoding", "identity")
+
+    client = get_http_client()
+    url = f"{settings.supabase_url}/storage/v1/object/{bucket}/{quote(path)}"
+    upstream = await client.send(client.build_request("GET", url, headers=upstream_headers), stream=True)
+
+    if upstream.status_code in (400, 404):
+        await upstream.aclose()
+        object_meta_cache.invalidate(key)
+        raise HTTPException(status_code=404, detail="File not found in storage")
+    if upstream.status_code not in (200, 206, 304):
+        await upstream.aclose()
+        raise HTTPException(status_code=502, detail=f"Storage returned {upstream.status_code}")
+
+    meta = ObjectMeta(
+        etag=upstream.headers.get("etag") or (meta.etag if meta else None),
+        last_modified=upstream.headers.get("last-modified") or (meta.last_modified if meta else None),
+        content_type=upstream.headers.get("content-type") or (meta.content_type if meta else "application/octet-stream"),
+    )
+    object_meta_cache.put(key, meta)
+
+    if upstream.status_code == 304:
+        await upstream.aclose()
+        return _not_modified(meta, cache_control)
+
+    headers: Dict[str, str] = {
+        name: upstream.headers[name] for name in PASSTHROUGH_HEADERS if name in upstream.headers
+    }
+    headers["Accept-Ranges"] = "bytes"
+    headers["Cache-Control"] = cache_control
+    if "content-encoding" in headers:
+        headers["Vary"] = "Accept-Encoding"
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+
+    return StreamingResponse(
+        upstream.aiter_raw(settings.upload_chunk_size),
+        status_code=upstream.status_code,
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
@@ -1,7 +1,57 @@
-from supabase import create_client, Client
+from typing import Optional
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
 
 from app.core.config import settings
+from app.core.tracing import TracedTransport
+
+# One client per process, created by the app lifespan. All PostgREST, Storage
+# and Auth calls share its keep-alive connection pool.
+_client: Optional[AsyncClient] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+async def init_supabase_client() -> AsyncClient:
+    global _client, _http_client
+    if _client is not None:
+        return _client
+
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=settings.supabase_pool_max_connections,
+            max_keepalive_connections=settings.supabase_pool_max_keepalive,
+            keepalive_expiry=settings.supabase_pool_keepalive_expiry,
+        ),
+    )
+    _http_client = httpx.AsyncClient(
+        transport=TracedTransport(transport),
+        timeout=settings.supabase_http_timeout,
+    )
+    _client = await acreate_client(
+        settings.supabase_url,
+        settings.supabase_service_role_key,
+        options=AsyncClientOptions(
+            httpx_client=_http_client,
+            auto_refresh_token=False,
+            persist_session=False,
+        ),
+    )
+    return _client
+
+async def close_supabase_client() -> None:
+    global _client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _client = None
+    _http_client = None
+
+def get_supabase_client() -> AsyncClient:
+    if _client is None:
+        raise RuntimeError("Supabase client is not initialized; is the app lifespan running?")
+    return _client
 
-def get_supabase_client() -> Client:
-    supabase: Client = create_client(settings.supabase_url, settings.supabase_service_role_key)
-    return supabase
+def get_http_client() -> httpx.AsyncClient:
+    """The pooled HTTP client behind the Supabase client, for raw requests."""
+    if _http_client is None:
+        raise RuntimeError("Supabase client is not initialized; is the app lifespan running?")
+    return _http_client
@@ -1,32 +1,195 @@
-from io import BytesIO
-from docx import Document
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Union
 
-from fastapi import HTTPException, UploadFile
-from pdfminer.high_level import extract_text
+from fastapi import HTTPException
 
-def extract_text_from_upload(file: UploadFile, file_bytes: bytes) -> str:
-    if file.content_type == "application/pdf":
-        try:
-            bio = BytesIO(file_bytes)
-            text = extract_text(bio)
-            if not text.strip():
-                raise Exception("No extractable text found in PDF")
-            return text
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"PDF parsing failed: {str(e)}"
-            )
-    elif file.content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+from app.core.config import settings
+from app.core.executors import UNNEEDED, run_in_process, run_stage
+from app.core.tracing import span
+from app.core.uploads import SpooledUpload, open_source
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# pdfminer and python-docx are imported inside the worker functions below,
+# which run in the extraction process pool.
+
+
+def warm_worker() -> int:
+    """Pre-import the extraction libraries in a pool worker; returns its PID."""
+    import os
+
+    import docx  # noqa: F401
+    import pdfminer.high_level  # noqa: F401
+    import PIL.Image  # noqa: F401
+
+    return os.getpid()
+
+
+def pdf_laparams() -> Dict[str, Any]:
+    return {
+        "char_margin": settings.pdf_char_margin,
+        "line_margin": settings.pdf_line_margin,
+        "word_margin": settings.pdf_word_margin,
+        "boxes_flow": settings.pdf_boxes_flow,
+    }
+
+
+def count_pdf_pages(source: Union[bytes, str]) -> int:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    with open_source(source) as fp:
+        document = PDFDocument(PDFParser(fp))
         try:
-            bio = BytesIO(file_bytes)
-            doc = Document(bio)
-            text = "\n".join(p.text for p in doc.paragraphs)
-            return text
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"DOCX parsing failed: {str(e)}"
-            )
-    else:
+            return int(resolve1(resolve1(document.catalog["Pages"])["Count"]))
+        except Exception:
+            # Broken page tree: fall back to walking it
+            return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def extract_pdf_pages(source: Union[bytes, str], page_numbers: List[int], laparams: Dict[str, Any]) -> str:
+    from pdfminer.high_level import extract_text
+    from pdfminer.layout import LAParams
+
+    with open_source(source) as fp:
+        return extract_text(fp, page_numbers=page_numbers, laparams=LAParams(**laparams))
+
+
+def extract_docx_text(source: Union[bytes, str], max_chars: int) -> str:
+    """Body paragraphs and tables in document order, then headers/footers."""
+    from docx import Document
+    from docx.table import Table
+
+    def table_lines(table: Table) -> List[str]:
+        lines = []
+        for row in table.rows:
+            cells = []
+            for cell in row.cells:
+                text = cell.text.strip()
+                # Merged cells repeat across the row
+                if text and (not cells or cells[-1] != text):
+                    cells.append(text)
+            if cells:
+                lines.append(" | ".join(cells))
+        return lines
+
+    def block_lines(container: Any) -> List[str]:
+        lines = []
+        for block in container.iter_inner_content():
+            if isinstance(block, Table):
+                lines.extend(table_lines(block))
+            else:
+                lines.append(block.text)
+        return lines
+
+    with open_source(source) as fp:
+        doc = Document(fp)
+
+    lines = block_lines(doc)
+
+    seen = set()
+    for section in doc.sections:
+        for part in (section.header, section.footer):
+            if part.is_linked_to_previous:
+                continue
+            for line in block_lines(part):
+                if line.strip() and line not in seen:
+                    seen.add(line)
+                    lines.append(line)
+
+    return "\n".join(lines)[:max_chars]
+
+
+async def extract_pdf_text(source: Union[bytes, str]) -> str:
+    """Extract a PDF page-by-page across the process pool.
+
+    Caps pages at PDF_MAX_PAGES and text at EXTRACT_MAX_CHARS, stopping as
+    soon as the pages read so far (in order) reach the character cap; pages
+    are handed out one batch per worker at a time, so none past the cap are
+    started. Past
+    the EXTRACT_TIMEOUT deadline whatever leading pages are done are
+    returned; with none done the request fails with 504.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.extract_timeout
+
+    page_count = await run_stage(
+        "Text extraction",
+        run_in_process(count_pdf_pages, source),
+        settings.extract_timeout,
+    )
+    page_count = min(page_count, settings.pdf_max_pages)
+
+    per_task = max(1, settings.pdf_pages_per_task)
+    laparams = pdf_laparams()
+    batches = [list(range(start, min(start + per_task, page_count))) for start in range(0, page_count, per_task)]
+
+    # At most one batch per worker in flight, scheduled in page order, so
+    # nothing past the character cap is started
+    window: Deque[asyncio.Future] = deque()
+    next_batch = 0
+
+    def schedule() -> None:
+        nonlocal next_batch
+        while next_batch < len(batches) and len(window) < max(1, settings.extract_workers):
+            window.append(asyncio.ensure_future(run_in_process(extract_pdf_pages, source, batches[next_batch], laparams)))
+            next_batch += 1
+
+    parts: List[str] = []
+    length = 0
+    try:
+        schedule()
+        while window:
+            try:
+                text = await asyncio.wait_for(window.popleft(), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                if not parts:
+                    raise HTTPException(
+                        status_code=504,
+                        detail=f"Text extraction timed out after {settings.extract_timeout:g}s"
+                    )
+                break
+            parts.append(text)
+            length += len(text)
+            if length >= settings.extract_max_chars:
+                break
+            schedule()
+    finally:
+        for task in window:
+            task.cancel(UNNEEDED)
+
+    text = "".join(parts)[:settings.extract_max_chars]
+    if not text.strip():
+        raise ValueError("No extractable text found in PDF")
+    return text
+
+
+async def extract_text_async(content_type: str, source: Union[bytes, str]) -> str:
+    if content_type not in (PDF, DOCX):
         raise HTTPException(400, "Unsupported file encoding")
+
+    kind = "PDF" if content_type == PDF else "DOCX"
+    try:
+        async with span("extraction"):
+            if content_type == PDF:
+                return await extract_pdf_text(source)
+            return await run_stage(
+                "Text extraction",
+                run_in_process(extract_docx_text, source, settings.extract_max_chars),
+                settings.extract_timeout,
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"{kind} parsing failed: {str(e)}"
+        )
+
+
+async def extract_text_from_upload(upload: SpooledUpload) -> str:
+    return await extract_text_async(upload.content_type, upload.source)
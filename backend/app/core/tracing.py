@@ -0,0 +1,184 @@
+import json
+import logging
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, STAGE_IN_FLIGHT, STAGE_SECONDS
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON line per record, tagged with the current request's ID."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "event": "log",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = current_request_id()
+        if request_id is not None:
+            entry["request_id"] = request_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def _configure(name: str, formatter: logging.Formatter) -> logging.Logger:
+    configured = logging.getLogger(name)
+    if not configured.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(formatter)
+        configured.addHandler(handler)
+        configured.setLevel(logging.INFO)
+        configured.propagate = False
+    return configured
+
+
+# Module loggers (logging.getLogger(__name__)) under app.* log through here
+_configure("app", JSONLogFormatter())
+# The per-request line is already JSON
+logger = _configure("app.requests", logging.Formatter("%(message)s"))
+
+
+@dataclass
+class StageTiming:
+    seconds: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class Trace:
+    request_id: str
+    started: float = field(default_factory=time.perf_counter)
+    stages: Dict[str, StageTiming] = field(default_factory=dict)
+
+    def record(self, stage: str, seconds: float) -> None:
+        timing = self.stages.setdefault(stage, StageTiming())
+        timing.seconds += seconds
+        timing.count += 1
+
+    def server_timing(self) -> str:
+        # Concurrent spans of one stage are summed, so dur is time spent in the
+        # stage rather than wall-clock time
+        entries = [
+            f'{stage};dur={timing.seconds * 1000:.1f};desc="{timing.count} call(s)"'
+            for stage, timing in self.stages.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+@asynccontextmanager
+async def span(stage: str) -> AsyncIterator[None]:
+    """Time a block as one of the request stages (auth, db, storage, extraction, llm).
+
+    Always feeds the per-stage metrics; inside a request it is also added
+    to that request's Server-Timing header and log line.
+    """
+    started = time.perf_counter()
+    STAGE_IN_FLIGHT.labels(stage).inc()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_IN_FLIGHT.labels(stage).dec()
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.record(stage, elapsed)
+
+
+class TracedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records Supabase calls as db/storage spans."""
+
+    STAGES = (("/rest/v1/", "db"), ("/storage/v1/", "storage"))
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stage = next((name for prefix, name in self.STAGES if request.url.path.startswith(prefix)), None)
+        if stage is None:
+            return await self._transport.handle_async_request(request)
+        # Measures time to response headers; streamed bodies are read later
+        async with span(stage):
+            return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class TracingMiddleware:
+    """Assigns each request an ID, and reports its timings.
+
+    The ID comes from an incoming X-Request-ID header or is generated, and is
+    echoed back. Stage spans finished before the response starts go into a
+    Server-Timing header; the complete picture is logged as one JSON line
+    when the response ends, and request latency goes to /metrics.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode("latin-1")[:128] or uuid.uuid4().hex
+        trace = Trace(request_id=request_id)
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def traced_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers: List = list(message.get("headers", []))
+                response_headers.append((b"x-request-id", request_id.encode("latin-1")))
+                response_headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": response_headers}
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, traced_send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _current_trace.reset(token)
+            elapsed = time.perf_counter() - trace.started
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(elapsed)
+            logger.info(json.dumps({
+                "event": "request",
+                "request_id": request_id,
+                "method": scope["method"],
+                "route": route,
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 1),
+                "stages": {
+                    stage: {"ms": round(timing.seconds * 1000, 1), "count": timing.count}
+                    for stage, timing in trace.stages.items()
+                },
+            }))
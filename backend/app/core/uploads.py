@@ -0,0 +1,170 @@
+import hashlib
+import io
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import IO, AsyncIterator, Dict, Optional, Union
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+def open_source(source: Union[bytes, str]) -> IO[bytes]:
+    """Open an upload given as bytes or, for spooled uploads, a file path."""
+    return io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+
+
+class SpooledUpload:
+    """An upload copied out of the request in chunks.
+
+    Small files stay in memory; past `spool_threshold` bytes the data moves to
+    a temp file on disk. `source` is what extraction and storage uploads read
+    from: the bytes, or the temp file's path.
+    """
+
+    def __init__(self, filename: str, content_type: str, spool_threshold: int):
+        self.filename = filename
+        self.content_type = content_type
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file = None
+        self.path: Optional[str] = None
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        if self.path is not None:
+            return self.path
+        assert self._buffer is not None
+        return self._buffer.getvalue()
+
+    def _rollover(self) -> None:
+        assert self._buffer is not None
+        fd, self.path = tempfile.mkstemp(prefix="upload-")
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(self._buffer.getvalue())
+        self._buffer = None
+
+    def write_sync(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        if self._file is None and self.size > self.spool_threshold:
+            self._rollover()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            assert self._buffer is not None
+            self._buffer.write(chunk)
+
+    async def write(self, chunk: bytes) -> None:
+        if self._file is None and self.size + len(chunk) <= self.spool_threshold:
+            self.write_sync(chunk)
+        else:
+            await run_in_threadpool(self.write_sync, chunk)
+
+    def finish(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        self.finish()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self._buffer = None
+
+
+@asynccontextmanager
+async def spooled_upload(file: UploadFile, max_bytes: int) -> AsyncIterator[SpooledUpload]:
+    """Copy `file` into a SpooledUpload, failing with 413 past `max_bytes`."""
+    upload = SpooledUpload(
+        file.filename or "",
+        file.content_type or "",
+        settings.upload_spool_threshold,
+    )
+    try:
+        while True:
+            chunk = await file.read(settings.upload_chunk_size)
+            if not chunk:
+                break
+            if upload.size + len(chunk) > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {max_bytes / (1024 * 1024):.3g} MB."
+                )
+            await upload.write(chunk)
+        upload.finish()
+        yield upload
+    finally:
+        upload.close()
+
+
+class RequestTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it as a 413 rather
+    # than wrapping it in a generic 400.
+    def __init__(self):
+        super().__init__(status_code=413, detail="Request body too large")
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over `max_bytes` while they are being received.
+
+    Requests with a larger Content-Length are refused before reading; chunked
+    bodies are counted as they arrive and cut off once over the limit.
+    `path_limits` raises (or lowers) the limit for specific paths.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope["path"].rstrip("/"), self.max_bytes)
+        too_large = JSONResponse(status_code=413, content={"detail": RequestTooLarge().detail})
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > max_bytes:
+                await too_large(scope, receive, send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise RequestTooLarge()
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestTooLarge:
+            if not response_started:
+                await too_large(scope, receive, send)
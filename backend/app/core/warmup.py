@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.auth import jwks_client
+from app.core.config import settings
+from app.core.executors import run_in_process
+from app.core.metrics import WARMUP_SECONDS
+from app.core.openai_client import get_openai_client
+from app.core.resume_text import count_tokens
+from app.core.supabase_client import get_supabase_client
+from app.core.text_extract import warm_worker
+
+logger = logging.getLogger(__name__)
+
+# Heavy imports and first connections are paid here, in the background, after
+# the server has started accepting requests rather than before. /liveliness
+# answers as soon as the process is up; /readiness only once every step below
+# has succeeded.
+
+
+async def warm_openai() -> None:
+    # Imports the openai package and builds the shared client
+    await run_in_threadpool(get_openai_client)
+
+
+async def warm_tokenizer() -> None:
+    # Loads the tiktoken encoding used to size LLM prompts
+    await run_in_threadpool(count_tokens, "warm up")
+
+
+async def warm_extraction_pool() -> None:
+    # Spawns the pool workers and imports pdfminer/docx/Pillow in each
+    await asyncio.gather(*(run_in_process(warm_worker) for _ in range(settings.extract_workers)))
+
+
+async def warm_supabase() -> None:
+    # Opens a pooled connection (DNS, TLS) to PostgREST
+    await get_supabase_client().table("users").select("id").limit(1).execute()
+
+
+async def warm_auth_keys() -> None:
+    # HS256-only projects have no JWK set to fetch
+    if not settings.supabase_jwt_secret:
+        await run_in_threadpool(jwks_client.get_jwk_set)
+
+
+STEPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "openai": warm_openai,
+    "tokenizer": warm_tokenizer,
+    "extraction_pool": warm_extraction_pool,
+    "supabase": warm_supabase,
+    "auth_keys": warm_auth_keys,
+}
+
+
+class Warmup:
+    """Runs the warm-up steps concurrently, retrying failures with backoff."""
+
+    def __init__(self, steps: Dict[str, Callable[[], Awaitable[None]]]):
+        self.steps = steps
+        self.status: Dict[str, str] = {name: "pending" for name in steps}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(state == "ok" for state in self.status.values())
+
+    async def _run_step(self, name: str) -> None:
+        delay = 1.0
+        while True:
+            started = time.perf_counter()
+            try:
+                await self.steps[name]()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.status[name] = f"failed: {str(e)}"
+                logger.exception("Warm-up step %s failed, retrying in %gs", name, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.warmup_retry_max)
+                continue
+            WARMUP_SECONDS.labels(name).set(time.perf_counter() - started)
+            self.status[name] = "ok"
+            return
+
+    async def _run(self) -> None:
+        started = time.perf_counter()
+        await asyncio.gather(*(self._run_step(name) for name in self.steps))
+        logger.info("Warm-up finished in %.2fs", time.perf_counter() - started)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+
+warmup = Warmup(STEPS)
+
+def start_warmup() -> None:
+    if settings.warmup_enabled:
+        warmup.start()
+    else:
+        # Nothing is pre-warmed; everything loads on first use instead
+        warmup.status = {name: "ok" for name in warmup.steps}
+
+async def stop_warmup() -> None:
+    await warmup.stop()
@@ -1,9 +1,50 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.main import api_router
+from app.core.config import settings
+from app.core.executors import init_process_pool, shutdown_process_pool
+from app.core.json_response import FastJSONResponse
+from app.core.job_worker import start_job_workers, stop_job_workers
+from app.core.metrics import metrics_response
+from app.core.openai_client import close_openai_client
+from app.core.parse_cache import start_parse_cache_pruning, stop_parse_cache_pruning
+from app.core.supabase_client import init_supabase_client, close_supabase_client
+from app.core.tracing import TracingMiddleware
+from app.core.uploads import BodySizeLimitMiddleware
+from app.core.warmup import start_warmup, stop_warmup, warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_supabase_client()
+    init_process_pool()
+    start_job_workers()
+    start_parse_cache_pruning()
+    # Heavy imports and first connections happen in the background while
+    # requests are already being served; see /readiness
+    start_warmup()
+    yield
+    await stop_warmup()
+    await stop_parse_cache_pruning()
+    await stop_job_workers()
+    shutdown_process_pool()
+    await close_openai_client()
+    await close_supabase_client()
 
 
-app = FastAPI()
+# Routes returning DB rows use FastJSONResponse directly; see core/json_response.py
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Cap request bodies while they stream in (added before CORS so 413s still
+# carry CORS headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_request_bytes,
+    path_limits={"/resumes/bulk": settings.bulk_max_request_bytes},
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -17,10 +58,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "Server-Timing"],
 )
 
+# Outermost: request IDs, Server-Timing, request logs and latency metrics
+app.add_middleware(TracingMiddleware)
+
 app.include_router(api_router)
 
 @app.get("/liveliness")
 async def root():
     return {"ping": "pong"}
+
+@app.get("/readiness")
+async def readiness():
+    """503 until the background warm-up has finished; liveliness only says the process is up."""
+    return JSONResponse(
+        status_code=200 if warmup.ready else 503,
+        content={"ready": warmup.ready, "checks": warmup.status},
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
@@ -24,6 +24,7 @@ class PortfolioUpdate(BaseModel):
 class Portfolio(PortfolioBase):
     id: str
     user_id: str
+    slug: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -1,5 +1,7 @@
+from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel
-from typing import List, TypedDict, Any
+from typing import Dict, List, Optional, TypedDict, Any
 
 
 class ContactInfo(BaseModel):
@@ -48,6 +50,29 @@ class Resume(BaseModel):
     title: str
     file_path: str
     data: ResumeSchema | None
+    # The resume this one is a new version of
+    previous_id: Optional[str] = None
+    # Hash of the text feeding each part of `data`; see core/resume_diff.py
+    section_fingerprints: Optional[Dict[str, str]] = None
 
 
+class ResumeJobStatus(str, Enum):
+    PENDING = "pending"
+    EXTRACTING = "extracting"
+    PARSING = "parsing"
+    DONE = "done"
+    FAILED = "failed"
 
+
+class ResumeJob(BaseModel):
+    id: str
+    user_id: str
+    status: ResumeJobStatus = ResumeJobStatus.PENDING
+    title: str
+    file_path: str
+    content_type: str
+    resume_id: str
+    use_cache: bool = True
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
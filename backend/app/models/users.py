@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
 class User(BaseModel):
@@ -10,3 +10,11 @@ class UserUpdate(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
     role: Optional[str] = None
+
+class AuthUser(BaseModel):
+    """The authenticated caller, built from verified JWT claims."""
+    id: str
+    email: Optional[str] = None
+    role: Optional[str] = None
+    app_metadata: Dict[str, Any] = {}
+    exp: Optional[int] = None
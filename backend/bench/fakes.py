@@ -0,0 +1,584 @@
+"""Local stand-ins for Supabase (PostgREST, Storage, Auth) and OpenAI.
+
+They implement just the subset of each API the backend uses, keep all state
+in memory, and can inject latency and errors so the benchmark can see how
+the backend behaves when its dependencies are slow or flaky.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class Faults:
+    """Latency (mean +/- jitter, in ms) and error rate injected per request."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+    async def delay(self) -> None:
+        if self.latency_ms or self.jitter_ms:
+            ms = max(0.0, random.gauss(self.latency_ms, self.jitter_ms))
+            await asyncio.sleep(ms / 1000)
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# PostgREST
+
+# Columns the real schema keeps unique, for upserts and constraint errors
+UNIQUE_COLUMNS = {
+    "profiles": "user_id",
+    "portfolios": "slug",
+    "portfolio_snapshots": "portfolio_id",
+    "resume_parse_cache": "key",
+}
+CASCADES = {"portfolios": [("portfolio_snapshots", "portfolio_id")]}
+
+
+def _split_top_level(expr: str) -> List[str]:
+    """Split a PostgREST logic expression on commas outside quotes/parens."""
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in expr:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _compare(op: str, left: Any, right: str) -> bool:
+    if op == "is":
+        return (left is None) if right == "null" else str(left).lower() == right
+    if left is None:
+        return False
+    if isinstance(left, bool):
+        left = "true" if left else "false"
+    left = str(left)
+    if op == "eq":
+        return left == right
+    if op == "neq":
+        return left != right
+    if op == "in":
+        return left in [v.strip('"') for v in right.strip("()").split(",")]
+    if op == "lt":
+        return left < right
+    if op == "lte":
+        return left <= right
+    if op == "gt":
+        return left > right
+    if op == "gte":
+        return left >= right
+    raise ValueError(f"unsupported operator {op}")
+
+
+def _condition(expr: str) -> Callable[[Dict[str, Any]], bool]:
+    for kind, combine in (("and(", all), ("or(", any)):
+        if expr.startswith(kind):
+            children = [_condition(part) for part in _split_top_level(expr[len(kind):-1])]
+            return lambda row: combine(child(row) for child in children)
+    column, op, value = expr.split(".", 2)
+    value = value.strip('"')
+    return lambda row: _compare(op, row.get(column), value)
+
+
+def _filters(params) -> List[Callable[[Dict[str, Any]], bool]]:
+    conditions = []
+    for key, value in params.multi_items():
+        if key in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+            continue
+        if key in ("or", "and"):
+            conditions.append(_condition(f"{key}{value}"))
+        else:
+            conditions.append(_condition(f"{key}.{value}"))
+    return conditions
+
+
+def _project(row: Dict[str, Any], select: Optional[str]) -> Dict[str, Any]:
+    if not select or select == "*":
+        return dict(row)
+    return {column: row.get(column) for column in select.split(",")}
+
+
+def _slugify(name: str, row_id: str) -> str:
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", name or "").strip("-").lower()[:48]
+    return f"{slug}-{row_id[:8]}" if slug else row_id[:8]
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+
+    def table(self, name: str) -> List[Dict[str, Any]]:
+        return self.tables.setdefault(name, [])
+
+    def _defaults(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", now_iso())
+        row.setdefault("updated_at", row["created_at"])
+        if table == "portfolios":
+            row.setdefault("is_published", False)
+            row.setdefault("version", 1)
+        return self._triggers(table, row)
+
+    def _touch(self, table: str, row: Dict[str, Any]) -> None:
+        row["updated_at"] = now_iso()
+        # Mirrors bump_portfolio_version() from migration 009
+        if table == "portfolios":
+            row["version"] = row.get("version", 1) + 1
+
+    def _triggers(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        # Mirrors assign_portfolio_slug() from migration 006
+        if table == "portfolios" and row.get("is_published") and not row.get("slug"):
+            row["slug"] = _slugify(row.get("name", ""), row["id"])
+        return row
+
+    def select(self, table: str, params) -> List[Dict[str, Any]]:
+        conditions = _filters(params)
+        rows = [row for row in self.table(table) if all(c(row) for c in conditions)]
+        for term in reversed((params.get("order") or "").split(",")):
+            if term:
+                column, _, direction = term.partition(".")
+                rows.sort(key=lambda r: (r.get(column) is None, str(r.get(column))), reverse=direction.startswith("desc"))
+        offset = int(params.get("offset") or 0)
+        limit = params.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit else rows[offset:]
+        return [_project(row, params.get("select")) for row in rows]
+
+    def insert(self, table: str, rows: List[Dict[str, Any]], upsert_on: Optional[str]) -> List[Dict[str, Any]]:
+        stored = self.table(table)
+        unique = upsert_on or UNIQUE_COLUMNS.get(table)
+        result = []
+        for row in rows:
+            existing = None
+            if unique and row.get(unique) is not None:
+                existing = next((r for r in stored if r.get(unique) == row[unique]), None)
+            if existing is not None:
+                if not upsert_on:
+                    raise ConflictError(f'duplicate key value violates unique constraint on "{unique}"')
+                existing.update(row)
+                self._touch(table, existing)
+                result.append(dict(self._triggers(table, existing)))
+            else:
+                new = self._defaults(table, row)
+                stored.append(new)
+                result.append(dict(new))
+        return result
+
+    def update(self, table: str, params, changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+        conditions = _filters(params)
+        result = []
+        for row in self.table(table):
+            if all(c(row) for c in conditions):
+                row.update(changes)
+                self._touch(table, row)
+                result.append(dict(self._triggers(table, row)))
+        return result
+
+    def delete(self, table: str, params) -> List[Dict[str, Any]]:
+        conditions = _filters(params)
+        rows = self.table(table)
+        removed = [row for row in rows if all(c(row) for c in conditions)]
+        self.tables[table] = [row for row in rows if row not in removed]
+        for child, column in CASCADES.get(table, []):
+            ids = {row["id"] for row in removed}
+            self.tables[child] = [row for row in self.table(child) if row.get(column) not in ids]
+        return removed
+
+    def rpc(self, name: str, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if name == "toggle_portfolio_published":
+            for row in self.table("portfolios"):
+                if row["id"] == args["p_portfolio_id"] and row["user_id"] == args["p_user_id"]:
+                    row["is_published"] = not row.get("is_published")
+                    self._touch("portfolios", row)
+                    return [dict(self._triggers("portfolios", row))]
+            return []
+        if name == "patch_portfolio":
+            for row in self.table("portfolios"):
+                if row["id"] == args["p_portfolio_id"] and row["user_id"] == args["p_user_id"]:
+                    expected = args.get("p_expected_version")
+                    if expected is not None and row["version"] != expected:
+                        raise PreconditionFailed(str(row["version"]))
+                    row.update(args["p_fields"] or {})
+                    if args.get("p_data_patch") is not None:
+                        row["data"] = merge_patch(row.get("data"), args["p_data_patch"])
+                    self._touch("portfolios", row)
+                    return [dict(self._triggers("portfolios", row))]
+            return []
+        if name == "search_documents":
+            return search_documents(self, args)
+        if name == "claim_resume_job":
+            return []
+        raise KeyError(name)
+
+
+class ConflictError(Exception):
+    pass
+
+
+class PreconditionFailed(Exception):
+    """RAISE SQLSTATE 'PT412'; the message is the current version."""
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """RFC 7396, as jsonb_merge_patch() in migration 009."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+# Weighted like document_search_vector() in migration 010
+SEARCH_WEIGHTS = (("skills", 1.0), ("overview", 0.4), ("experience", 0.2), ("projects", 0.2))
+
+
+def _words(value: Any) -> List[str]:
+    return re.findall(r"[a-z0-9]+", json.dumps(value).lower()) if value else []
+
+
+def search_documents(db: FakeDatabase, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """search_documents() from migration 010, near enough for load tests.
+
+    Words match exactly rather than by stem, and `-word` excludes; quotes
+    and OR are ignored.
+    """
+    query = (args.get("p_query") or "").lower().split()
+    wanted = [w for term in query if not term.startswith("-") for w in _words(term) if w != "or"]
+    excluded = {w for term in query if term.startswith("-") for w in _words(term[1:])}
+    skills = set(args.get("p_skills") or [])
+    after = args.get("p_after_rank")
+    after_key = (after, args.get("p_after_created_at"), args.get("p_after_id"))
+
+    hits = []
+    for kind, table, title_column in (("resume", "resumes", None), ("portfolio", "portfolios", "name")):
+        if kind not in args["p_kinds"]:
+            continue
+        for row in db.table(table):
+            if row["user_id"] != args["p_user_id"]:
+                continue
+            data = row.get("data") or {}
+            tags = {str(s).lower() for s in data.get("skills") or []}
+            if not skills <= tags:
+                continue
+            fields = [(_words(data.get(key)), weight) for key, weight in SEARCH_WEIGHTS]
+            fields.append((_words(row.get(title_column)) if title_column else [], 0.4))
+            present = {w for words, _ in fields for w in words}
+            if any(w not in present for w in wanted) or excluded & present:
+                continue
+            rank = round(sum(weight * words.count(w) for words, weight in fields for w in wanted) / 10, 6)
+            key = (rank, row["created_at"], row["id"])
+            if after is not None and not key < after_key:
+                continue
+            hits.append({"kind": kind, "id": row["id"], "title": row.get(title_column or "title"), "rank": rank,
+                         "matched_skills": sorted(skills), "created_at": row["created_at"]})
+    hits.sort(key=lambda hit: (hit["rank"], hit["created_at"], hit["id"]), reverse=True)
+    return hits[:args["p_limit"]]
+
+
+# ---------------------------------------------------------------------------
+# Storage
+
+@dataclass
+class StoredObject:
+    data: bytes
+    content_type: str
+    etag: str
+    last_modified: str
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects: Dict[str, StoredObject] = {}
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        self.objects[key] = StoredObject(
+            data=data,
+            content_type=content_type,
+            etag=f'"{hashlib.md5(data).hexdigest()}"',
+            last_modified=format_datetime(datetime.now(timezone.utc), usegmt=True),
+        )
+
+
+def _jwt_claims(request: Request) -> Dict[str, Any]:
+    token = request.headers.get("authorization", "").removeprefix("Bearer ")
+    payload = token.split(".")[1] if token.count(".") == 2 else ""
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)) or b"{}")
+
+
+def create_supabase_app(db: FakeDatabase, storage: FakeStorage, db_faults: Faults, storage_faults: Faults) -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        faults = storage_faults if request.url.path.startswith("/storage/") else db_faults
+        await faults.delay()
+        if faults.should_fail():
+            return JSONResponse(status_code=503, content={"message": "injected failure", "code": "503"})
+        return await call_next(request)
+
+    @app.api_route("/rest/v1/rpc/{name}", methods=["POST"])
+    async def rpc(name: str, request: Request):
+        try:
+            return db.rpc(name, await request.json())
+        except PreconditionFailed as e:
+            return JSONResponse(status_code=412, content={"code": "PT412", "message": "Portfolio was modified",
+                                                          "details": str(e), "hint": None})
+
+    @app.api_route("/rest/v1/{table}", methods=["GET", "POST", "PATCH", "DELETE"])
+    async def rest(table: str, request: Request):
+        params = request.query_params
+        if request.method == "GET":
+            return db.select(table, params)
+        if request.method == "DELETE":
+            return db.delete(table, params)
+
+        body = await request.json()
+        if request.method == "PATCH":
+            return db.update(table, params, body)
+
+        rows = body if isinstance(body, list) else [body]
+        merge = "merge-duplicates" in request.headers.get("prefer", "")
+        upsert_on = (params.get("on_conflict") or "id") if merge else None
+        try:
+            return JSONResponse(status_code=201, content=db.insert(table, rows, upsert_on))
+        except ConflictError as e:
+            return JSONResponse(status_code=409, content={"code": "23505", "message": str(e), "details": None, "hint": None})
+
+    # Before the upload route, which would otherwise take "list/<bucket>" as a path
+    @app.post("/storage/v1/object/list/{bucket}")
+    async def list_objects(bucket: str, request: Request):
+        prefix = (await request.json()).get("prefix", "").strip("/")
+        names = sorted(key[len(bucket) + 1:] for key in storage.objects if key.startswith(f"{bucket}/"))
+        return [
+            {"name": name[len(prefix) + 1:] if prefix else name, "id": str(uuid.uuid4())}
+            for name in names if not prefix or name.startswith(prefix + "/")
+        ]
+
+    @app.api_route("/storage/v1/object/{bucket}/{path:path}", methods=["POST", "PUT"])
+    async def upload(bucket: str, path: str, request: Request):
+        form = await request.form()
+        file = form["file"]
+        storage.put(f"{bucket}/{path}", await file.read(), file.content_type or "application/octet-stream")
+        return {"Key": f"{bucket}/{path}", "Id": str(uuid.uuid4())}
+
+    @app.get("/storage/v1/object/{bucket}/{path:path}")
+    async def download(bucket: str, path: str, request: Request):
+        obj = storage.objects.get(f"{bucket}/{path}")
+        if obj is None:
+            return JSONResponse(status_code=400, content={"statusCode": "404", "error": "not_found", "message": "Object not found"})
+        headers = {"ETag": obj.etag, "Last-Modified": obj.last_modified, "Accept-Ranges": "bytes"}
+        if request.headers.get("if-none-match") == obj.etag:
+            return Response(status_code=304, headers=headers)
+        match = re.match(r"bytes=(\d+)-(\d*)$", request.headers.get("range", ""))
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(obj.data) - 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(obj.data)}"
+            return Response(obj.data[start:end + 1], status_code=206, media_type=obj.content_type, headers=headers)
+        return Response(obj.data, media_type=obj.content_type, headers=headers)
+
+    @app.delete("/storage/v1/object/{bucket}")
+    async def remove(bucket: str, request: Request):
+        removed = []
+        for prefix in (await request.json()).get("prefixes", []):
+            if storage.objects.pop(f"{bucket}/{prefix}", None) is not None:
+                removed.append({"name": prefix, "bucket_id": bucket})
+        return removed
+
+    @app.get("/auth/v1/user")
+    async def auth_user(request: Request):
+        claims = _jwt_claims(request)
+        if "sub" not in claims:
+            return JSONResponse(status_code=401, content={"message": "invalid JWT"})
+        return {
+            "id": claims["sub"],
+            "email": claims.get("email"),
+            "role": claims.get("role", "authenticated"),
+            "aud": claims.get("aud", "authenticated"),
+            "app_metadata": {},
+            "user_metadata": {},
+            "created_at": now_iso(),
+        }
+
+    return app
+
+
+# ---------------------------------------------------------------------------
+# OpenAI
+
+SAMPLE_RESUME = {
+    "resume_pdf": "",
+    "portfolio_id": "",
+    "personal_information": {
+        "full_name": "Alex Doe",
+        "contact_info": {
+            "email": "alex@example.com",
+            "linkedin": "linkedin.com/in/alexdoe",
+            "phone": "555-0100",
+            "address": "Springfield",
+        },
+        "education": {
+            "school": "State University",
+            "majors": ["Computer Science"],
+            "minors": ["Mathematics"],
+            "expected_grad": "May 2026",
+        },
+    },
+    "overview": {"career_name": "Software Engineer", "resume_summary": "Builds reliable backend systems."},
+    "projects": [{"title": "Portfolio Builder", "description": "Generates websites from resumes."}],
+    "skills": ["Python", "FastAPI", "PostgreSQL"],
+    "experience": [{"company": "Acme", "description": "Backend engineer.", "employed_dates": "2023 - 2025"}],
+}
+
+
+def openai_response(model: str, text: str, input_tokens: int) -> Dict[str, Any]:
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(datetime.now(timezone.utc).timestamp()),
+        "model": model,
+        "status": "completed",
+        "output": [{
+            "type": "message",
+            "id": f"msg_{uuid.uuid4().hex}",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": len(text) // 4,
+            "total_tokens": input_tokens + len(text) // 4,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+async def stream_response(response: Dict[str, Any], text: str, faults: Faults, chunk: int = 16):
+    """The Responses API event stream for `response`, text in small deltas.
+
+    The configured LLM latency is spread over the deltas rather than paid
+    up front, the way a real model streams.
+    """
+    message = response["output"][0]
+    sequence = iter(range(1_000_000))
+
+    def event(kind: str, **data) -> str:
+        return f"event: {kind}\ndata: {json.dumps({'type': kind, 'sequence_number': next(sequence), **data})}\n\n"
+
+    ids = {"item_id": message["id"], "output_index": 0, "content_index": 0}
+    yield event("response.created", response={**response, "status": "in_progress", "output": []})
+    yield event("response.output_item.added", output_index=0,
+                item={**message, "status": "in_progress", "content": []})
+    yield event("response.content_part.added", **ids, part={"type": "output_text", "text": "", "annotations": []})
+    pieces = [text[i:i + chunk] for i in range(0, len(text), chunk)]
+    for piece in pieces:
+        await asyncio.sleep(faults.latency_ms / 1000 / len(pieces))
+        yield event("response.output_text.delta", **ids, delta=piece, logprobs=[])
+    yield event("response.output_text.done", **ids, text=text, logprobs=[])
+    yield event("response.content_part.done", **ids, part=message["content"][0])
+    yield event("response.output_item.done", output_index=0, item=message)
+    yield event("response.completed", response=response)
+
+
+def create_openai_app(faults: Faults) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        if not body.get("stream"):
+            await faults.delay()
+        if faults.should_fail():
+            # Alternate between the two failure modes the governor treats differently
+            if random.random() < 0.5:
+                return JSONResponse(status_code=429, content={"error": {"message": "injected rate limit", "type": "rate_limit"}})
+            return JSONResponse(status_code=500, content={"error": {"message": "injected failure", "type": "server_error"}})
+
+        input_tokens = len(json.dumps(body.get("input", ""))) // 4
+        # Answer with just the requested fields when asked for a subset of
+        # the resume (re-parsing the changed sections of a new version)
+        requested = body.get("text", {}).get("format", {}).get("schema", {}).get("properties", {})
+        fields = {**SAMPLE_RESUME, **SAMPLE_RESUME["personal_information"]}
+        text = json.dumps({key: fields[key] for key in requested if key in fields} or SAMPLE_RESUME)
+        response = openai_response(body.get("model", "gpt-4o"), text, input_tokens)
+        if body.get("stream"):
+            return StreamingResponse(stream_response(response, text, faults), media_type="text/event-stream")
+        return response
+
+    return app
+
+
+def main() -> None:
+    """Serve both stand-ins from one process (started by bench.run)."""
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--supabase-port", type=int, required=True)
+    parser.add_argument("--openai-port", type=int, required=True)
+    for name in ("db", "storage", "llm"):
+        parser.add_argument(f"--{name}-latency", type=float, default=0.0)
+        parser.add_argument(f"--{name}-jitter", type=float, default=0.0)
+        parser.add_argument(f"--{name}-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    faults = {
+        name: Faults(getattr(args, f"{name}_latency"), getattr(args, f"{name}_jitter"), getattr(args, f"{name}_error_rate"))
+        for name in ("db", "storage", "llm")
+    }
+    supabase_app = create_supabase_app(FakeDatabase(), FakeStorage(), faults["db"], faults["storage"])
+    openai_app = create_openai_app(faults["llm"])
+
+    def server(app: FastAPI, port: int) -> uvicorn.Server:
+        return uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+
+    async def serve() -> None:
+        await asyncio.gather(
+            server(supabase_app, args.supabase_port).serve(),
+            server(openai_app, args.openai_port).serve(),
+        )
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Import-time profile of the app: what `import app.main` costs at start-up.
+
+    python -m bench.import_profile              # top 15 packages, best of 5 runs
+    python -m bench.import_profile --top 30 --module app.api.routes.resumes
+
+Runs `python -X importtime` in fresh interpreters and reports the total and
+the heaviest top-level packages by cumulative import time. Anything heavy in
+the list is a candidate for a lazy import or for the start-up warm-up
+(app/core/warmup.py).
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Settings are read at import time; placeholders let the app import without a .env
+PLACEHOLDER_ENV = {
+    "OPENAI_API_KEY": "sk-placeholder",
+    "SUPABASE_URL": "http://127.0.0.1:1",
+    "SUPABASE_PUB_KEY": "placeholder",
+    "SUPABASE_SERVICE_ROLE_KEY": "placeholder",
+}
+
+
+def profile_once(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module imported."""
+    env = {**PLACEHOLDER_ENV, **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def total_us(rows: List[Tuple[str, int, int]], module: str) -> int:
+    return next(cumulative for name, _, cumulative in rows if name.strip() == module)
+
+
+def by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Self time summed per top-level package."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        totals[name.strip().split(".")[0]] += self_us
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Best of N: the fastest run has the least noise from the rest of the machine
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda rows: total_us(rows, args.module))
+    total = total_us(best, args.module)
+
+    print(f"import {args.module}: {total / 1000:.0f} ms (best of {args.runs}), {len(best)} modules")
+    print(f"\n{'package':<32} {'ms':>8} {'share':>7}")
+    for package, self_us in sorted(by_package(best).items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32} {self_us / 1000:>8.1f} {self_us / total:>7.1%}")
+
+    heavy = [name for name in ("openai", "pdfminer", "docx", "PIL", "tiktoken")
+             if any(row[0].strip().split(".")[0] == name for row in best)]
+    print(f"\nDeferred packages imported eagerly: {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Per-page PDF extraction throughput across the process pool.
+
+    python -m bench.pdf_throughput                          # 10-page PDF, 1/2/4 workers
+    python -m bench.pdf_throughput --pages 40 --workers 1 2 4 8 --per-task 1 2 4
+    python -m bench.pdf_throughput --pdf resume.pdf --runs 10
+
+Extracts one PDF with extract_pdf_text under each EXTRACT_WORKERS x
+PDF_PAGES_PER_TASK combination and reports pages per second, against a
+serial in-process pdfminer baseline. Each combination gets a fresh pool
+warmed before timing, so start-up isn't counted. Without --pdf a
+text-heavy document of --pages pages is generated.
+"""
+import argparse
+import asyncio
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+from app.core import executors
+from app.core.config import settings
+from app.core.text_extract import count_pdf_pages, extract_pdf_pages, extract_pdf_text, pdf_laparams, warm_worker
+
+WORDS = ("built designed scalable services pipeline latency customers team migrated platform analytics "
+         "dashboard reduced costs deployed mobile payments search ranking models training data").split()
+
+
+def make_pdf(pages: int, lines_per_page: int = 50) -> bytes:
+    """A PDF of `pages` pages, each full of short text lines in Helvetica."""
+    # 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    kids = [4 + 2 * page for page in range(pages)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page in range(pages):
+        lines = [" ".join(WORDS[(page + line + n) % len(WORDS)] for n in range(12)) for line in range(lines_per_page)]
+        text = "BT /F1 10 Tf 40 770 Td 14 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 3 0 R >> >> >>" % (kids[page] + 1))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text.encode("latin-1")))
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def serial_seconds(pdf: bytes, pages: int, runs: int) -> List[float]:
+    seconds = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        extract_pdf_pages(pdf, list(range(pages)), pdf_laparams())
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+async def pool_seconds(pdf: bytes, workers: int, per_task: int, runs: int) -> List[float]:
+    settings.extract_workers = workers
+    settings.pdf_pages_per_task = per_task
+    settings.extract_max_pending = max(settings.extract_max_pending, workers * 2)
+    executors.shutdown_process_pool()
+    try:
+        # One warm-up job per worker so spawning and imports aren't timed
+        await asyncio.gather(*(executors.run_in_process(warm_worker) for _ in range(workers)))
+        await extract_pdf_text(pdf)
+        seconds = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            await extract_pdf_text(pdf)
+            seconds.append(time.perf_counter() - started)
+        return seconds
+    finally:
+        executors.shutdown_process_pool()
+
+
+async def run(args: argparse.Namespace) -> None:
+    pdf = Path(args.pdf).read_bytes() if args.pdf else make_pdf(args.pages)
+    # The cap would otherwise hide the pages past it, and the deadline the slow runs
+    settings.pdf_max_pages = max(settings.pdf_max_pages, 10_000)
+    settings.extract_max_chars = 10**9
+    settings.extract_timeout = 600.0
+    pages = count_pdf_pages(pdf)
+    print(f"{args.pdf or 'generated PDF'}: {pages} pages, {len(pdf) / 1024:.0f} KiB, best of {args.runs} runs\n")
+
+    print(f"{'mode':<24} {'best s':>9} {'p50 s':>9} {'pages/s':>9} {'ms/page':>9}")
+
+    def row(label: str, seconds: List[float]) -> None:
+        best = min(seconds)
+        print(f"{label:<24} {best:>9.3f} {percentile(seconds, 0.5):>9.3f} {pages / best:>9.1f} {best * 1000 / pages:>9.1f}")
+
+    row("serial (in-process)", serial_seconds(pdf, pages, args.runs))
+    for workers in args.workers:
+        for per_task in args.per_task:
+            row(f"{workers} workers x {per_task} pages", await pool_seconds(pdf, workers, per_task, args.runs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="a PDF to extract instead of the generated one")
+    parser.add_argument("--pages", type=int, default=10, help="pages in the generated PDF")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="EXTRACT_WORKERS values")
+    parser.add_argument("--per-task", type=int, nargs="+", default=[1], help="PDF_PAGES_PER_TASK values")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Accuracy and latency of the rule-based prefill against the LLM parse.
+
+    python -m bench.prefill_accuracy                        # synthetic corpus, rules only
+    python -m bench.prefill_accuracy --llm --count 50       # also parse each resume with the model
+    python -m bench.prefill_accuracy --corpus DIR --llm     # real resumes
+
+A corpus directory holds PDF and DOCX resumes, each with a `<name>.json`
+beside it mapping field paths (as in Prefill.fields(), e.g.
+"personal_information.contact_info.email") to the expected values; paths
+left out are not scored. Without --corpus, resumes in a spread of layouts
+are generated along with their answers.
+
+--llm parses every resume with the model too (needs OPENAI_API_KEY; costs
+one call per resume), without prefill hints so the two are scored
+independently. Reported per field: how often each got it right (a field
+correctly found absent counts) and how often the rules found anything.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.resume_prefill import extract_prefill
+
+SCORED = [
+    "personal_information.full_name",
+    "personal_information.contact_info.email",
+    "personal_information.contact_info.phone",
+    "personal_information.contact_info.linkedin",
+    "personal_information.contact_info.address",
+    "personal_information.education.school",
+    "personal_information.education.majors",
+    "personal_information.education.minors",
+    "personal_information.education.expected_grad",
+    "skills",
+]
+LIST_FIELDS = {"personal_information.education.majors", "personal_information.education.minors", "skills"}
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+
+FIRST = ["Alex", "Jordan", "Priya", "Wei", "Maria", "Samuel", "Aisha", "Tomás", "Hannah", "Kenji"]
+LAST = ["Doe", "Patel", "Nguyen", "García", "O'Brien", "Smith-Jones", "Kowalski", "Okafor", "Lee", "Fischer"]
+SCHOOLS = ["State University", "University of Michigan", "Georgia Institute of Technology", "Boston College",
+           "Imperial College London", "Carnegie Mellon University", "Santa Monica College"]
+MAJORS = ["Computer Science", "Economics", "Mechanical Engineering", "Statistics", "Cognitive Science", "Physics"]
+MINORS = ["Mathematics", "Business", "Spanish", "Philosophy", "Music"]
+CITIES = ["Austin, TX", "Ann Arbor, MI 48104", "Seattle, WA", "Pittsburgh, PA 15213", "Boston, MA"]
+SKILLS = ["Python", "Java", "SQL", "React", "Docker", "AWS", "PyTorch", "Excel", "Tableau", "Go", "C++", "Figma"]
+MONTHS = ["May", "December", "June", "Spring", "Fall"]
+
+
+def synthetic_resume(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+    """One resume's text and the expected value of every scored field."""
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    name = f"{first} {last}"
+    email = f"{first.lower()}.{last.lower().replace(chr(39), '')}@{rng.choice(['example.com', 'mail.school.edu'])}"
+    email = email.encode("ascii", "ignore").decode()
+    phone = rng.choice(["555-0100", "(512) 555-0199", "+1 415.555.0142", "+44 20 7946 0958", "312 555 0123"])
+    linkedin = rng.choice([None, f"linkedin.com/in/{first.lower()}{rng.randint(1, 99)}",
+                           f"https://www.linkedin.com/in/{first.lower()}-{rng.randint(1, 99)}"])
+    address = rng.choice([None, rng.choice(CITIES), f"{rng.randint(10, 999)} Main St, {rng.choice(CITIES)}"])
+    school, major = rng.choice(SCHOOLS), rng.choice(MAJORS)
+    minors = rng.sample(MINORS, rng.choice([0, 0, 1, 2]))
+    grad = f"{rng.choice(MONTHS)} {rng.randint(2024, 2028)}"
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+
+    contact = [item for item in (email, phone, linkedin, address) if item]
+    rng.shuffle(contact)
+    separator = rng.choice([" | ", " • ", "\n"])
+    header = [name.upper() if rng.random() < 0.3 else name, separator.join(contact)]
+
+    degree = rng.choice(["B.S.", "B.A.", "Bachelor of Science in", "BSc", "Major:"])
+    minor_text = ""
+    if minors:
+        minor_text = rng.choice([f", minor in {' and '.join(minors)}", f"; Minors: {', '.join(minors)}"])
+    grad_text = rng.choice([f"Expected {grad}", f"Expected Graduation: {grad}", f"{rng.randint(2019, 2023)} - {grad}"])
+    if rng.random() < 0.5:
+        education = [f"{school} - {degree} {major}{minor_text}, {grad_text}"]
+    else:
+        education = [f"{school} | {rng.choice(CITIES)}", f"{degree} {major}{minor_text}", grad_text]
+
+    if rng.random() < 0.5:
+        skill_lines = [", ".join(skills)]
+    else:
+        half = len(skills) // 2
+        skill_lines = [f"Languages: {', '.join(skills[:half])}", f"Tools: {'; '.join(skills[half:])}"]
+
+    lines = [
+        *header,
+        rng.choice(["SUMMARY", "Profile"]),
+        f"{major} student who likes building things.",
+        rng.choice(["EDUCATION", "Education"]),
+        *education,
+        rng.choice(["EXPERIENCE", "Work Experience"]),
+        f"Acme Corp - Intern ({rng.randint(2021, 2023)} - {rng.randint(2023, 2025)})",
+        "Built internal tools used by 40 people.",
+        rng.choice(["SKILLS", "Technical Skills"]),
+        *skill_lines,
+    ]
+    expected = {
+        "personal_information.full_name": name,
+        "personal_information.contact_info.email": email,
+        "personal_information.contact_info.phone": phone,
+        "personal_information.contact_info.linkedin": linkedin or "",
+        "personal_information.contact_info.address": address or "",
+        "personal_information.education.school": school,
+        "personal_information.education.majors": [major],
+        "personal_information.education.minors": minors,
+        "personal_information.education.expected_grad": grad,
+        "skills": skills,
+    }
+    return "\n".join(lines), expected
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+
+def normalize(path: str, value: Any) -> Any:
+    if isinstance(value, list) or (value is None and path in LIST_FIELDS):
+        value = value or []
+        return frozenset(normalize(path, item) for item in value if item)
+    text = re.sub(r"\s+", " ", str(value or "")).strip().casefold()
+    if path.endswith(".phone"):
+        return re.sub(r"\D", "", text)
+    if path.endswith(".linkedin"):
+        return re.sub(r"^(https?://)?(www\.)?", "", text).rstrip("/")
+    return text.rstrip(".")
+
+
+def lookup(data: Dict[str, Any], path: str) -> Any:
+    for key in path.split("."):
+        data = data.get(key) if isinstance(data, dict) else None
+    return data
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def llm_parse(text: str) -> Dict[str, Any]:
+    from app.core.resume_parser import parse_resume
+    from app.core.resume_text import prepare_resume_text
+
+    parsed, _ = await parse_resume(prepare_resume_text(text).text)
+    return parsed.model_dump()
+
+
+async def load_corpus(directory: Path) -> List[Tuple[str, str, Dict[str, Any]]]:
+    from app.core.executors import shutdown_process_pool
+    from app.core.text_extract import extract_text_async
+
+    documents = []
+    try:
+        for path in sorted(directory.iterdir()):
+            answers = path.with_suffix(".json")
+            if path.suffix.lower() not in CONTENT_TYPES or not answers.exists():
+                continue
+            text = await extract_text_async(CONTENT_TYPES[path.suffix.lower()], path.read_bytes())
+            documents.append((path.name, text, json.loads(answers.read_text())))
+    finally:
+        shutdown_process_pool()
+    return documents
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.corpus:
+        documents = await load_corpus(Path(args.corpus))
+    else:
+        rng = random.Random(args.seed)
+        documents = [(f"synthetic-{n}", *synthetic_resume(rng)) for n in range(args.count)]
+    if not documents:
+        raise SystemExit("No scored documents found")
+
+    correct = {"rules": {path: 0 for path in SCORED}, "llm": {path: 0 for path in SCORED}}
+    found = {path: 0 for path in SCORED}
+    scored = {path: 0 for path in SCORED}
+    seconds: Dict[str, List[float]] = {"rules": [], "llm": []}
+    misses: List[str] = []
+
+    for name, text, expected in documents:
+        started = time.perf_counter()
+        rules = extract_prefill(text).fields()
+        seconds["rules"].append(time.perf_counter() - started)
+
+        llm: Optional[Dict[str, Any]] = None
+        if args.llm:
+            started = time.perf_counter()
+            llm = await llm_parse(text)
+            seconds["llm"].append(time.perf_counter() - started)
+
+        for path in SCORED:
+            if path not in expected:
+                continue
+            want = normalize(path, expected[path])
+            scored[path] += 1
+            got = normalize(path, rules.get(path))
+            found[path] += bool(got)
+            if got == want:
+                correct["rules"][path] += 1
+            elif len(misses) < args.show_misses:
+                misses.append(f"{name} {path}: expected {expected[path]!r}, rules {rules.get(path)!r}")
+            if llm is not None and normalize(path, lookup(llm, path)) == want:
+                correct["llm"][path] += 1
+
+    print(f"{len(documents)} resumes ({'corpus ' + args.corpus if args.corpus else 'synthetic'})\n")
+    header = f"{'field':<28} {'rules':>7} {'found':>7}" + (f" {'llm':>7}" if args.llm else "")
+    print(header)
+    for path in SCORED:
+        if not scored[path]:
+            continue
+        row = f"{path.rsplit('.', 1)[-1]:<28} {correct['rules'][path] / scored[path]:>7.1%} {found[path] / scored[path]:>7.1%}"
+        if args.llm:
+            row += f" {correct['llm'][path] / scored[path]:>7.1%}"
+        print(row)
+
+    print(f"\n{'latency (ms)':<28} {'p50':>9} {'p95':>9} {'mean':>9}")
+    for path, values in seconds.items():
+        if values:
+            ms = [v * 1000 for v in values]
+            print(f"{path:<28} {percentile(ms, 0.5):>9.2f} {percentile(ms, 0.95):>9.2f} {statistics.mean(ms):>9.2f}")
+
+    if misses:
+        print("\nRule misses:")
+        for miss in misses:
+            print(f"  {miss}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of resumes with <name>.json answers")
+    parser.add_argument("--count", type=int, default=500, help="synthetic resumes to generate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--llm", action="store_true", help="also parse with the model (calls OpenAI)")
+    parser.add_argument("--show-misses", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
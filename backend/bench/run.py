@@ -0,0 +1,309 @@
+"""Benchmark the backend against local Supabase and OpenAI stand-ins.
+
+    python -m bench.run --duration 30 --concurrency 16 --mix default
+    python -m bench.run --save-baseline          # record bench/baseline.json
+    python -m bench.run --db-latency 20 --llm-error-rate 0.1
+
+Starts the fakes and the app (under uvicorn) as subprocesses, drives the
+chosen traffic mix, then reports throughput, p50/p95/p99 per
+route and the app's memory. Exits non-zero when results regress past the
+stored baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from bench.scenarios import JOURNEYS, JWT_SECRET, MIXES, BenchUser, Recorder, make_user, public_view, setup_user
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Absolute slack on latency comparisons so sub-millisecond noise isn't a regression
+LATENCY_SLACK_MS = 5.0
+# Tail percentiles from a handful of samples are noise; don't gate on them
+MIN_SAMPLES_P95 = 50
+MIN_SAMPLES_P99 = 200
+
+# Settings that must match the baseline's for a comparison to mean anything
+COMPARABLE_CONFIG = (
+    "concurrency", "users", "mix",
+    "db_latency", "db_error_rate", "storage_latency", "storage_error_rate", "llm_latency", "llm_error_rate",
+    "app_env",
+)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(process: subprocess.Popen, url: str, log_name: str) -> None:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited during startup; see {log_name}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{url} did not become ready within 60s")
+
+
+def start_fakes(args, supabase_port: int, openai_port: int, log_file) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "bench.fakes",
+        "--supabase-port", str(supabase_port), "--openai-port", str(openai_port),
+    ]
+    for name in ("db", "storage", "llm"):
+        latency = getattr(args, f"{name}_latency")
+        command += [
+            f"--{name}-latency", str(latency),
+            f"--{name}-jitter", str(latency * 0.2),
+            f"--{name}-error-rate", str(getattr(args, f"{name}_error_rate")),
+        ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=log_file, stderr=subprocess.STDOUT)
+    wait_until_ready(process, f"http://127.0.0.1:{supabase_port}/rest/v1/users", log_file.name)
+    return process
+
+
+def rss_kb(pid: int, field: str = "VmRSS") -> Optional[int]:
+    """Resident memory of a process from /proc (Linux only)."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    by_step: Dict[str, List] = defaultdict(list)
+    for sample in recorder.samples:
+        by_step[sample.step].append(sample)
+
+    routes = {}
+    for step, samples in sorted(by_step.items()):
+        latencies = sorted(s.seconds * 1000 for s in samples)
+        errors = sum(1 for s in samples if s.status == 0 or s.status >= 500)
+        routes[step] = {
+            "count": len(samples),
+            "rps": round(len(samples) / elapsed, 2),
+            "error_rate": round(errors / len(samples), 4),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+        }
+    total = len(recorder.samples)
+    return {"requests": total, "throughput_rps": round(total / elapsed, 2), "routes": routes}
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"\n{'route':<36}{'count':>8}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for step, r in results["routes"].items():
+        print(f"{step:<36}{r['count']:>8}{r['rps']:>9.1f}{r['error_rate'] * 100:>6.1f}%"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+    memory = results["memory"]
+    print(f"\n{results['requests']} requests in {results['config']['duration']}s: {results['throughput_rps']} req/s")
+    print(f"app memory: start {memory['start_rss_mb']} MB, end {memory['end_rss_mb']} MB, peak {memory['peak_rss_mb']} MB")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of `results` against `baseline`, as human-readable lines."""
+    regressions = []
+    if results["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        regressions.append(f"throughput {results['throughput_rps']} req/s < baseline {baseline['throughput_rps']}")
+
+    base_peak, peak = baseline["memory"].get("peak_rss_mb"), results["memory"].get("peak_rss_mb")
+    if base_peak and peak and peak > base_peak * (1 + tolerance):
+        regressions.append(f"peak memory {peak} MB > baseline {base_peak} MB")
+
+    for step, base in baseline["routes"].items():
+        current = results["routes"].get(step)
+        if current is None:
+            continue
+        for key, min_count in (("p95_ms", MIN_SAMPLES_P95), ("p99_ms", MIN_SAMPLES_P99)):
+            if current["count"] < min_count or base["count"] < min_count:
+                continue
+            limit = base[key] * (1 + tolerance) + LATENCY_SLACK_MS
+            if current[key] > limit:
+                regressions.append(f"{step} {key} {current[key]} > baseline {base[key]}")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{step} error rate {current['error_rate']} > baseline {base['error_rate']}")
+    return regressions
+
+
+def start_app(port: int, supabase_url: str, openai_url: str, app_env: Dict[str, str], log_file) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        # The stand-in has no quota; don't let the production rate limits
+        # shape the numbers unless asked to via --app-env
+        "OPENAI_REQUESTS_PER_MINUTE": "100000",
+        "OPENAI_TOKENS_PER_MINUTE": "100000000",
+        **app_env,
+        "SUPABASE_URL": supabase_url,
+        "SUPABASE_PUB_KEY": "bench-anon-key",
+        "SUPABASE_SERVICE_ROLE_KEY": "bench-service-key",
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "OPENAI_API_KEY": "bench-openai-key",
+        "OPENAI_BASE_URL": f"{openai_url}/v1",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    # Wait for the warm-up too, so it does not land in the measured window
+    wait_until_ready(process, f"http://127.0.0.1:{port}/readiness", log_file.name)
+    return process
+
+
+async def drive(base_url: str, users: List[BenchUser], mix: Dict[str, float], duration: float,
+                concurrency: int, pid: int) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        setup = Recorder()
+        await asyncio.gather(*(setup_user(client, setup, user) for user in users))
+        failed = [s for s in setup.samples if s.status not in (200, 201)]
+        if failed:
+            raise RuntimeError(f"setup failed: {failed[:3]}")
+
+        start_rss = rss_kb(pid)
+        peak_rss = start_rss or 0
+        recorder = Recorder()
+        names, weights = zip(*[(name, weight) for name, weight in mix.items() if weight > 0])
+        deadline = time.monotonic() + duration
+
+        async def virtual_user() -> None:
+            while time.monotonic() < deadline:
+                journey = random.choices(names, weights)[0]
+                if journey == "public":
+                    await public_view(client, recorder, users)
+                else:
+                    await JOURNEYS[journey](client, recorder, random.choice(users))
+
+        async def sample_memory() -> None:
+            nonlocal peak_rss
+            while time.monotonic() < deadline:
+                peak_rss = max(peak_rss, rss_kb(pid) or 0)
+                await asyncio.sleep(0.25)
+
+        started = time.monotonic()
+        await asyncio.gather(sample_memory(), *(virtual_user() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    results = summarize(recorder, elapsed)
+    to_mb = lambda kb: round(kb / 1024, 1) if kb else None
+    results["memory"] = {
+        "start_rss_mb": to_mb(start_rss),
+        "end_rss_mb": to_mb(rss_kb(pid)),
+        "peak_rss_mb": to_mb(max(peak_rss, rss_kb(pid, "VmHWM") or 0)),
+    }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db-latency", type=float, default=5, help="ms, PostgREST and Auth")
+    parser.add_argument("--db-error-rate", type=float, default=0.0)
+    parser.add_argument("--storage-latency", type=float, default=10, help="ms")
+    parser.add_argument("--storage-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=1500, help="ms")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the app, e.g. READ_CACHE_BACKEND=sqlite")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    supabase_port, openai_port, app_port = free_port(), free_port(), free_port()
+    supabase_url = f"http://127.0.0.1:{supabase_port}"
+    users = [make_user(i) for i in range(args.users)]
+
+    with tempfile.NamedTemporaryFile("w", prefix="bench-", suffix=".log", delete=False) as log_file:
+        processes = [start_fakes(args, supabase_port, openai_port, log_file)]
+        try:
+            # Fault injection applies to seeding too; retry through it
+            for user in users:
+                row = {"id": user.id, "name": user.email, "email": user.email, "role": "regular"}
+                while httpx.post(f"{supabase_url}/rest/v1/users", json=row).status_code != 201:
+                    pass
+
+            app_env = dict(item.split("=", 1) for item in args.app_env)
+            app = start_app(app_port, supabase_url, f"http://127.0.0.1:{openai_port}", app_env, log_file)
+            processes.append(app)
+            results = asyncio.run(drive(
+                f"http://127.0.0.1:{app_port}", users, MIXES[args.mix], args.duration, args.concurrency, app.pid,
+            ))
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait(timeout=30)
+
+    results["config"] = {key: value for key, value in vars(args).items() if not isinstance(value, Path)}
+    print_report(results)
+    print(f"app and fake server log: {log_file.name}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("no baseline to compare against; run with --save-baseline to record one")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    mismatched = [
+        key for key in COMPARABLE_CONFIG
+        if baseline.get("config", {}).get(key) != results["config"][key]
+    ]
+    if mismatched:
+        print(f"baseline was recorded with different {', '.join(mismatched)}; skipping comparison")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS vs baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nno regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
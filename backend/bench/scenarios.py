@@ -0,0 +1,298 @@
+"""Traffic mixes: weighted user journeys against the backend's real routes."""
+import json
+import random
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+import jwt
+from docx import Document
+
+from bench.fakes import SAMPLE_RESUME
+
+JWT_SECRET = "bench-secret-bench-secret-bench-secret"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+@dataclass
+class BenchUser:
+    id: str
+    email: str
+    token: str
+    portfolio_ids: List[str] = field(default_factory=list)
+    slugs: List[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def make_user(index: int) -> BenchUser:
+    user_id = str(uuid.uuid4())
+    email = f"bench{index}@example.com"
+    token = jwt.encode(
+        {"sub": user_id, "email": email, "aud": "authenticated", "role": "authenticated", "exp": int(time.time()) + 86400},
+        JWT_SECRET,
+        algorithm="HS256",
+    )
+    return BenchUser(id=user_id, email=email, token=token)
+
+
+@dataclass
+class Sample:
+    step: str
+    seconds: float
+    status: int
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: List[Sample] = []
+
+    async def call(self, client: httpx.AsyncClient, step: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        self.samples.append(Sample(step, time.perf_counter() - started, status))
+        return response
+
+    async def call_sse(self, client: httpx.AsyncClient, step: str, method: str, url: str,
+                       first_events: Sequence[str], **kwargs) -> List[str]:
+        """Like call for a Server-Sent Events response; returns the event names.
+
+        Also records the time until the first event of each of `first_events`
+        as a separate "<step> (first <event>)" step.
+        """
+        started = time.perf_counter()
+        events: List[str] = []
+        try:
+            async with client.stream(method, url, **kwargs) as response:
+                status = response.status_code
+                async for line in response.aiter_lines():
+                    if line.startswith("event: "):
+                        events.append(line[len("event: "):])
+                        if events[-1] in first_events and events.count(events[-1]) == 1:
+                            self.samples.append(Sample(f"{step} (first {events[-1]})", time.perf_counter() - started, status))
+        except httpx.HTTPError:
+            status = 0
+        if "error" in events:
+            status = 500
+        self.samples.append(Sample(step, time.perf_counter() - started, status))
+        return events
+
+
+# ---------------------------------------------------------------------------
+# Upload documents
+
+RESUME_LINES = [
+    "Alex Doe",
+    "alex@example.com | 555-0100 | linkedin.com/in/alexdoe",
+    "EDUCATION",
+    "State University - B.S. Computer Science, minor in Mathematics, May 2026",
+    "EXPERIENCE",
+    "Acme Corp - Backend Engineer (2023 - 2025)",
+    "Built and operated Python services handling millions of requests per day.",
+    "PROJECTS",
+    "Portfolio Builder - generates personal websites from parsed resumes.",
+    "SKILLS",
+    "Python, FastAPI, PostgreSQL, Docker, AWS",
+]
+
+
+def resume_lines() -> List[str]:
+    # A unique line per upload so the parse cache doesn't turn every upload into a hit
+    return RESUME_LINES + [f"Reference {uuid.uuid4().hex}"]
+
+
+def make_docx() -> bytes:
+    document = Document()
+    for line in resume_lines():
+        document.add_paragraph(line)
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_pdf() -> bytes:
+    """A minimal single-page PDF with one text line per resume line."""
+    text = "BT /F1 11 Tf 50 760 Td 14 TL " + " ".join(
+        "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '"
+        for line in resume_lines()
+    ) + " ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text.encode("latin-1")),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def portfolio_body(name: str) -> Dict:
+    return {
+        "name": name,
+        "template_id": random.choice(["1", "2", "3", "4"]),
+        "data": SAMPLE_RESUME,
+        "color": random.choice(["#2563EB", "#DC2626", "#059669"]),
+        "display_mode": random.choice(["light", "dark"]),
+        "is_published": False,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Journeys
+
+async def setup_user(client: httpx.AsyncClient, rec: Recorder, user: BenchUser) -> None:
+    """Give each user a profile and a couple of portfolios, one published."""
+    await rec.call(client, "PUT /profiles/me", "PUT", "/profiles/me", headers=user.headers, json={"full_name": user.email})
+    for n in range(2):
+        response = await rec.call(client, "POST /portfolios/", "POST", "/portfolios/", headers=user.headers,
+                                  json=portfolio_body(f"{user.email} site {n}"))
+        if response is not None and response.status_code == 200:
+            user.portfolio_ids.append(response.json()["id"])
+    if user.portfolio_ids:
+        response = await rec.call(client, "PATCH /portfolios/{id}/publish", "PATCH",
+                                  f"/portfolios/{user.portfolio_ids[0]}/publish", headers=user.headers)
+        if response is not None and response.status_code == 200 and response.json().get("slug"):
+            user.slugs.append(response.json()["slug"])
+
+
+# Terms that match the fake parser's output some of the time
+SEARCHES = [{"q": "backend"}, {"q": "python -java"}, {"skills": "postgresql"}, {"q": "systems", "skills": "fastapi"}]
+
+
+async def dashboard(client: httpx.AsyncClient, rec: Recorder, user: BenchUser) -> None:
+    await rec.call(client, "GET /users/", "GET", "/users/", headers=user.headers)
+    await rec.call(client, "GET /profiles/me", "GET", "/profiles/me", headers=user.headers)
+    await rec.call(client, "GET /portfolios/", "GET", "/portfolios/", headers=user.headers, params={"fields": "data"})
+    await rec.call(client, "GET /resumes/", "GET", "/resumes/", headers=user.headers)
+    if random.random() < 0.3:
+        await rec.call(client, "GET /search/", "GET", "/search/", headers=user.headers,
+                       params=random.choice(SEARCHES))
+    if user.portfolio_ids:
+        await rec.call(client, "GET /portfolios/{id}", "GET", f"/portfolios/{random.choice(user.portfolio_ids)}",
+                       headers=user.headers)
+
+
+async def portfolio_edit(client: httpx.AsyncClient, rec: Recorder, user: BenchUser) -> None:
+    if not user.portfolio_ids:
+        return
+    portfolio_id = random.choice(user.portfolio_ids)
+    response = await rec.call(client, "GET /portfolios/{id}", "GET", f"/portfolios/{portfolio_id}", headers=user.headers)
+    if random.random() < 0.5:
+        await rec.call(client, "PUT /portfolios/{id}", "PUT", f"/portfolios/{portfolio_id}", headers=user.headers,
+                       json={"color": random.choice(["#2563EB", "#DC2626", "#059669"])})
+    else:
+        # A small edit to the document, sent as a merge patch against the version just read
+        headers = {**user.headers, "Content-Type": "application/merge-patch+json"}
+        if response is not None and response.headers.get("etag"):
+            headers["If-Match"] = response.headers["etag"]
+        await rec.call(client, "PATCH /portfolios/{id}", "PATCH", f"/portfolios/{portfolio_id}", headers=headers,
+                       content=json.dumps({"data": {"overview": {"resume_summary": uuid.uuid4().hex}}}))
+    if random.random() < 0.2:
+        await rec.call(client, "PATCH /portfolios/{id}/publish", "PATCH", f"/portfolios/{portfolio_id}/publish",
+                       headers=user.headers)
+    if random.random() < 0.3:
+        await rec.call(client, "PUT /profiles/me", "PUT", "/profiles/me", headers=user.headers,
+                       json={"bio": uuid.uuid4().hex})
+
+
+async def upload(client: httpx.AsyncClient, rec: Recorder, user: BenchUser) -> None:
+    if random.random() < 0.5:
+        files = {"file": ("resume.pdf", make_pdf(), "application/pdf")}
+    else:
+        files = {"file": ("resume.docx", make_docx(), DOCX)}
+    if random.random() < 0.25:
+        await rec.call_sse(client, "POST /resumes/stream", "POST", "/resumes/stream", ("prefill", "field"),
+                           headers=user.headers, files=files)
+        return
+    if random.random() < 0.1:
+        await rec.call(client, "POST /resumes/?fast", "POST", "/resumes/", headers=user.headers,
+                       files=files, params={"fast": "true"})
+        return
+    response = await rec.call(client, "POST /resumes/", "POST", "/resumes/", headers=user.headers, files=files)
+    if response is not None and response.status_code == 201:
+        resume_id = response.json()["id"]
+        await rec.call(client, "GET /resumes/{id}", "GET", f"/resumes/{resume_id}", headers=user.headers)
+        await rec.call(client, "GET /resumes/{id}/download", "GET", f"/resumes/{resume_id}/download", headers=user.headers)
+        if random.random() < 0.5:
+            # A revised version: only the last line differs, so one section is re-parsed
+            files = {"file": ("resume.docx", make_docx(), DOCX)}
+            await rec.call(client, "POST /resumes/?previous_id", "POST", "/resumes/", headers=user.headers,
+                           files=files, params={"previous_id": resume_id})
+
+
+def make_zip(count: int) -> bytes:
+    out = BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for n in range(count):
+            if n % 2:
+                archive.writestr(f"resumes/resume-{n}.docx", make_docx())
+            else:
+                archive.writestr(f"resumes/resume-{n}.pdf", make_pdf())
+    return out.getvalue()
+
+
+async def bulk_upload(client: httpx.AsyncClient, rec: Recorder, user: BenchUser) -> None:
+    files = [
+        ("files", ("resumes.zip", make_zip(random.randint(2, 6)), "application/zip")),
+        ("files", ("resume.pdf", make_pdf(), "application/pdf")),
+    ]
+    if random.random() < 0.2:
+        # Client gives up after the first file is parsed: exercises the
+        # cleanup of files stored for rows that are never inserted
+        started = time.perf_counter()
+        status = 0
+        try:
+            async with client.stream("POST", "/resumes/bulk", headers=user.headers, files=files) as response:
+                status = response.status_code
+                async for line in response.aiter_lines():
+                    if line and json.loads(line).get("event") == "parsed":
+                        break
+        except httpx.HTTPError:
+            status = 0
+        rec.samples.append(Sample("POST /resumes/bulk (abandoned)", time.perf_counter() - started, status))
+        return
+    await rec.call(client, "POST /resumes/bulk", "POST", "/resumes/bulk", headers=user.headers, files=files)
+
+
+async def public_view(client: httpx.AsyncClient, rec: Recorder, users: List[BenchUser]) -> None:
+    slugs = [slug for user in users for slug in user.slugs]
+    if slugs:
+        await rec.call(client, "GET /p/{slug}", "GET", f"/p/{random.choice(slugs)}")
+
+
+Journey = Callable[[httpx.AsyncClient, Recorder, BenchUser], Awaitable[None]]
+
+JOURNEYS: Dict[str, Journey] = {
+    "dashboard": dashboard,
+    "portfolio_edit": portfolio_edit,
+    "upload": upload,
+    "bulk_upload": bulk_upload,
+}
+
+# Weights per journey; "public" is anonymous traffic to published portfolios
+MIXES: Dict[str, Dict[str, float]] = {
+    "default": {"dashboard": 0.55, "portfolio_edit": 0.2, "upload": 0.05, "public": 0.2},
+    "read_heavy": {"dashboard": 0.7, "portfolio_edit": 0.05, "upload": 0.0, "public": 0.25},
+    "upload_heavy": {"dashboard": 0.3, "portfolio_edit": 0.1, "upload": 0.45, "bulk_upload": 0.05, "public": 0.1},
+}
@@ -0,0 +1,125 @@
+-- Search benchmark on a synthetic dataset (migration 010).
+--
+--   psql "$DATABASE_URL" -f bench/search_dataset.sql
+--   psql "$DATABASE_URL" -v users=5000 -v heavy=50000 -f bench/search_dataset.sql
+--
+-- Run against a local or staging database with the migrations applied
+-- (e.g. `supabase start`), never production. Everything happens in a
+-- scratch schema holding copies of resumes and portfolios, with the same
+-- generated columns and indexes, inside a transaction that is rolled back.
+--
+-- The dataset has :users ordinary users with 20 resumes and 3 portfolios
+-- each, plus one heavy user with :heavy resumes. For each search the
+-- timing and, through auto_explain, the plan of the query search_documents()
+-- runs are printed (loading auto_explain needs a superuser, such as
+-- supabase_admin locally). The plans should show bitmap scans of the
+-- idx_*_user_id_* indexes touching only the searching user's entries, so
+-- the heavy user's searches should stay within a small multiple of the
+-- light user's.
+
+\set ON_ERROR_STOP on
+\if :{?users}
+\else
+    \set users 2000
+\endif
+\if :{?heavy}
+\else
+    \set heavy 20000
+\endif
+\set heavy_user '00000000-0000-0000-0000-000000000001'
+
+BEGIN;
+
+CREATE SCHEMA bench_search;
+CREATE TABLE bench_search.resumes (LIKE public.resumes INCLUDING ALL);
+CREATE TABLE bench_search.portfolios (LIKE public.portfolios INCLUDING ALL);
+SET LOCAL search_path = bench_search, public;
+
+CREATE FUNCTION bench_search.words(n INTEGER) RETURNS TEXT AS $$
+    SELECT string_agg(
+        (ARRAY['built', 'designed', 'scalable', 'services', 'pipeline', 'latency', 'customers', 'team',
+               'migrated', 'platform', 'analytics', 'dashboard', 'reduced', 'costs', 'deployed', 'mobile',
+               'payments', 'search', 'ranking', 'models', 'training', 'data', 'warehouse', 'realtime',
+               'streaming', 'kafka', 'kubernetes', 'terraform', 'react', 'typescript', 'postgres',
+               'observability', 'incident', 'on-call', 'mentored', 'interns', 'accessibility', 'compliance',
+               'security', 'authentication', 'billing', 'growth', 'experiments', 'recommendations'])
+        [1 + floor(random() * 44)::INTEGER], ' ')
+    FROM generate_series(1, n);
+$$ LANGUAGE sql VOLATILE;
+
+CREATE FUNCTION bench_search.document() RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'overview', jsonb_build_object('career_name', 'Software Engineer', 'resume_summary', bench_search.words(40)),
+        'skills', (SELECT jsonb_agg(DISTINCT skill) FROM (
+            SELECT (ARRAY['Python', 'Go', 'Rust', 'Java', 'TypeScript', 'React', 'PostgreSQL', 'Redis',
+                          'Kafka', 'Kubernetes', 'Docker', 'AWS', 'GCP', 'Terraform', 'GraphQL', 'Spark',
+                          'Airflow', 'PyTorch', 'Swift', 'Kotlin'])[1 + floor(random() * 20)::INTEGER] AS skill
+            FROM generate_series(1, 8)
+        ) skills),
+        'experience', (SELECT jsonb_agg(jsonb_build_object(
+            'company', 'Company ' || n, 'description', bench_search.words(60), 'employed_dates', '2020 - 2024'))
+            FROM generate_series(1, 3) n),
+        'projects', (SELECT jsonb_agg(jsonb_build_object('title', bench_search.words(3), 'description', bench_search.words(40)))
+            FROM generate_series(1, 2) n)
+    );
+$$ LANGUAGE sql VOLATILE;
+
+\echo 'Generating data...'
+INSERT INTO resumes (id, user_id, title, file_path, data, created_at)
+SELECT gen_random_uuid(), u.user_id, 'resume-' || r || '.pdf', 'bench/' || r || '.pdf', bench_search.document(),
+       NOW() - random() * INTERVAL '365 days'
+FROM (SELECT gen_random_uuid() AS user_id FROM generate_series(1, :users)) u,
+     generate_series(1, 20) r;
+
+INSERT INTO resumes (id, user_id, title, file_path, data, created_at)
+SELECT gen_random_uuid(), :'heavy_user', 'resume-' || r || '.pdf', 'bench/' || r || '.pdf', bench_search.document(),
+       NOW() - random() * INTERVAL '365 days'
+FROM generate_series(1, :heavy) r;
+
+INSERT INTO portfolios (id, user_id, name, template_id, data, created_at)
+SELECT gen_random_uuid(), user_id, 'Portfolio ' || n, '1', bench_search.document(), NOW() - random() * INTERVAL '365 days'
+FROM (SELECT DISTINCT user_id FROM resumes) u, generate_series(1, 3) n;
+
+ANALYZE resumes;
+ANALYZE portfolios;
+
+SELECT :'heavy_user' AS heavy_user,
+       (SELECT user_id FROM resumes WHERE user_id <> :'heavy_user' LIMIT 1) AS light_user
+\gset
+
+SELECT count(*) AS resumes, count(DISTINCT user_id) AS users FROM resumes;
+
+LOAD 'auto_explain';
+SET auto_explain.log_min_duration = 0;
+SET auto_explain.log_analyze = on;
+SET auto_explain.log_buffers = on;
+SET auto_explain.log_nested_statements = on;
+SET auto_explain.log_level = notice;
+\timing on
+
+\echo 'Heavy user, common term'
+SELECT count(*) FROM search_documents(:'heavy_user', 'kubernetes', NULL, ARRAY['resume', 'portfolio'], 21);
+
+\echo 'Heavy user, phrase and exclusion'
+SELECT count(*) FROM search_documents(:'heavy_user', '"realtime streaming" -java', NULL, ARRAY['resume', 'portfolio'], 21);
+
+\echo 'Heavy user, skills filter only'
+SELECT count(*) FROM search_documents(:'heavy_user', NULL, ARRAY['rust', 'kafka'], ARRAY['resume', 'portfolio'], 21);
+
+\echo 'Heavy user, term and skills'
+SELECT count(*) FROM search_documents(:'heavy_user', 'payments', ARRAY['go'], ARRAY['resume'], 21);
+
+\echo 'Heavy user, second page'
+SET auto_explain.log_min_duration = -1;
+SELECT rank AS after_rank, created_at AS after_created_at, id AS after_id
+FROM search_documents(:'heavy_user', 'kubernetes', NULL, ARRAY['resume', 'portfolio'], 20)
+OFFSET 19 LIMIT 1
+\gset
+SET auto_explain.log_min_duration = 0;
+SELECT count(*) FROM search_documents(:'heavy_user', 'kubernetes', NULL, ARRAY['resume', 'portfolio'], 21,
+                               :'after_rank', :'after_created_at', :'after_id');
+
+\echo 'Light user, common term'
+SELECT count(*) FROM search_documents(:'light_user', 'kubernetes', NULL, ARRAY['resume', 'portfolio'], 21);
+
+ROLLBACK;
@@ -0,0 +1,107 @@
+"""Microbenchmark: JSON response paths for portfolio and resume rows.
+
+    python -m bench.serialization
+    python -m bench.serialization --rows 100 --number 200
+
+Compares, per payload, what it costs to turn PostgREST rows into a
+response body:
+
+- response_model: Pydantic validation, then FastAPI's serialization of the
+  model (what `response_model=List[Portfolio]` did)
+- jsonable_encoder: FastAPI's default for a returned dict, then
+  Starlette's JSONResponse
+- JSONResponse: the stdlib encoder, rows as they are
+- FastJSONResponse: orjson, rows as they are (the trusted-row path)
+"""
+import argparse
+import copy
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.json_response import FastJSONResponse, orjson
+from app.models.portfolios import Portfolio
+from app.models.resumes import Resume
+from bench.fakes import SAMPLE_RESUME
+
+
+def portfolio_row(index: int) -> Dict[str, Any]:
+    data = copy.deepcopy(SAMPLE_RESUME)
+    # Editors grow the document well past the parsed resume
+    data["projects"] = [{"title": f"Project {n}", "description": "Built and shipped a thing. " * 12} for n in range(12)]
+    data["experience"] = [
+        {"company": f"Company {n}", "description": "Led work on services and tooling. " * 15, "employed_dates": "2020 - 2024"}
+        for n in range(8)
+    ]
+    data["skills"] = [f"Skill {n}" for n in range(40)]
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()), "name": f"Portfolio {index}", "template_id": "1",
+        "data": data, "color": "#2563EB", "display_mode": "light", "is_published": True, "slug": f"p-{index}",
+        "version": 3, "created_at": now, "updated_at": now,
+    }
+
+
+def resume_row(index: int) -> Dict[str, Any]:
+    data = portfolio_row(index)["data"]
+    return {
+        "id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()), "title": f"resume-{index}.pdf",
+        "file_path": f"u/resumes/{index}.pdf", "data": data, "previous_id": None, "section_fingerprints": None,
+    }
+
+
+def paths(model: Any) -> Dict[str, Callable[[Any], bytes]]:
+    adapter = TypeAdapter(model)
+
+    def response_model(rows):
+        # FastAPI validates the return value against the response model, then
+        # serializes the validated value back to JSON-safe Python
+        return JSONResponse(content=adapter.dump_python(adapter.validate_python(rows), mode="json")).body
+
+    return {
+        "response_model": response_model,
+        "jsonable_encoder": lambda rows: JSONResponse(content=jsonable_encoder(rows)).body,
+        "JSONResponse": lambda rows: JSONResponse(content=rows).body,
+        "FastJSONResponse": lambda rows: FastJSONResponse(content=rows).body,
+    }
+
+
+def measure(fn: Callable[[Any], bytes], payload: Any, number: int) -> float:
+    fn(payload)
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn(payload)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="rows in the list payloads")
+    parser.add_argument("--number", type=int, default=100, help="iterations per timing")
+    args = parser.parse_args()
+
+    payloads: List[tuple] = [
+        (f"portfolio list ({args.rows} rows)", [portfolio_row(i) for i in range(args.rows)], List[Portfolio]),
+        ("portfolio", portfolio_row(0), Portfolio),
+        ("resume", resume_row(0), Resume),
+    ]
+    print(f"JSON encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib (orjson not installed)'}")
+    for name, payload, model in payloads:
+        size = len(FastJSONResponse(content=payload).body)
+        print(f"\n{name}, {size / 1024:.0f} KiB")
+        timings = {path: measure(fn, payload, args.number) for path, fn in paths(model).items()}
+        baseline = timings["response_model"]
+        for path, seconds in timings.items():
+            print(f"  {path:<18} {seconds * 1e6:>9.0f} us  {baseline / seconds:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Prompt tokens saved by resume text preparation, over a corpus.
+
+    python -m bench.token_reduction                         # synthetic corpus
+    python -m bench.token_reduction --corpus DIR            # real resumes (PDF, DOCX, TXT)
+    python -m bench.token_reduction --corpus DIR --budget 1500 --show 20
+
+Counts o200k_base tokens (tiktoken) of each resume's extracted text as
+extracted, after each cleaning step of prepare_resume_text (page furniture,
+whitespace, de-hyphenation) and after fitting LLM_INPUT_TOKEN_BUDGET, and
+reports the totals and per-document distribution. Without --corpus,
+multi-page resumes are generated with the furniture and spacing PDF
+extraction typically leaves behind.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.resume_text import (
+    _encoding,
+    count_tokens,
+    dehyphenate,
+    fit_token_budget,
+    normalize_whitespace,
+    prepare_resume_text,
+    remove_page_furniture,
+)
+from bench.prefill_accuracy import CONTENT_TYPES, percentile, synthetic_resume
+
+STEPS = ("raw", "furniture", "whitespace", "dehyphenate", "budget")
+SPACING = [" ", " ", "  ", " \u00a0"]
+
+
+def extracted_looking(text: str, rng: random.Random) -> str:
+    """Lay a resume out the way pdfminer hands back a multi-page PDF: form
+    feeds between pages, a running header and page numbers, ragged spacing
+    and words hyphenated across line ends."""
+    lines = text.split("\n")
+    name = lines[0]
+    # Pad the body so it runs over a few pages
+    filler = [
+        "Led the migration of the reporting pipeline to a stream processor, cutting nightly run time by "
+        "two-thirds and freeing the analytics team from manual back-fills.",
+        "Designed and maintained internal tooling for deployment, monitoring and on-call hand-offs across "
+        "four product teams.",
+    ]
+    body = lines[1:] + [rng.choice(filler) for _ in range(rng.randint(20, 60))]
+
+    pages, page, width = [], [], rng.choice([70, 90])
+    for line in body:
+        words, current = line.split(" "), ""
+        for word in words:
+            if len(current) + len(word) + 1 > width and current:
+                if rng.random() < 0.15 and len(word) > 6 and word.isalpha() and word.islower():
+                    cut = len(word) // 2
+                    page.append(f"{current} {word[:cut]}-")
+                    current = word[cut:]
+                    continue
+                page.append(current)
+                current = word
+            else:
+                current = f"{current}{rng.choice(SPACING)}{word}" if current else word
+        page.append(current + rng.choice(["", "  ", "\t"]))
+        if rng.random() < 0.2:
+            page.append("")
+        if len(page) >= 45:
+            pages.append(page)
+            page = []
+    pages.append(page)
+
+    count = len(pages)
+    return "\f".join(
+        "\n".join([f"{name} - Resume", "", *content, "", f"Page {n} of {count}"])
+        for n, content in enumerate(pages, start=1)
+    )
+
+
+async def load_corpus(directory: Path) -> List[Tuple[str, str]]:
+    from app.core.executors import shutdown_process_pool
+    from app.core.text_extract import extract_text_async
+
+    documents = []
+    try:
+        for path in sorted(directory.iterdir()):
+            suffix = path.suffix.lower()
+            if suffix == ".txt":
+                documents.append((path.name, path.read_text()))
+            elif suffix in CONTENT_TYPES:
+                documents.append((path.name, await extract_text_async(CONTENT_TYPES[suffix], path.read_bytes())))
+    finally:
+        shutdown_process_pool()
+    return documents
+
+
+def step_tokens(text: str, budget: int) -> Dict[str, int]:
+    """Tokens after each preparation step, in the order prepare_resume_text applies them."""
+    counts = {"raw": count_tokens(text)}
+    text = remove_page_furniture(text)
+    counts["furniture"] = count_tokens(text)
+    text = normalize_whitespace(text)
+    counts["whitespace"] = count_tokens(text)
+    text = dehyphenate(text)
+    counts["dehyphenate"] = count_tokens(text)
+    counts["budget"] = count_tokens(fit_token_budget(text, budget))
+    return counts
+
+
+async def run(args: argparse.Namespace) -> None:
+    if _encoding() is None:
+        raise SystemExit("tiktoken (with the o200k_base encoding) is needed; the fallback is only an estimate")
+    if args.corpus:
+        documents = await load_corpus(Path(args.corpus))
+    else:
+        rng = random.Random(args.seed)
+        documents = [
+            (f"synthetic-{n}", extracted_looking(synthetic_resume(rng)[0], rng)) for n in range(args.count)
+        ]
+    if not documents:
+        raise SystemExit("No documents found")
+
+    budget = args.budget or settings.llm_input_token_budget
+    rows = []
+    for name, text in documents:
+        counts = step_tokens(text, budget)
+        prepared = prepare_resume_text(text, budget)
+        # The steps above are prepare_resume_text taken apart; they must agree
+        assert (prepared.raw_tokens, prepared.tokens) == (counts["raw"], counts["budget"]), name
+        rows.append((name, counts))
+
+    totals = {step: sum(counts[step] for _, counts in rows) for step in STEPS}
+    print(f"{len(rows)} resumes ({'corpus ' + args.corpus if args.corpus else 'synthetic'}), "
+          f"budget {budget} tokens, o200k_base\n")
+    print(f"{'after step':<14} {'tokens':>10} {'saved':>8} {'of raw':>8}")
+    previous = totals["raw"]
+    for step in STEPS:
+        saved = previous - totals[step]
+        print(f"{step:<14} {totals[step]:>10} {saved:>8} {1 - totals[step] / totals['raw']:>8.1%}")
+        previous = totals[step]
+
+    reductions = [1 - counts["budget"] / counts["raw"] for _, counts in rows if counts["raw"]]
+    truncated = sum(1 for _, counts in rows if counts["budget"] < counts["dehyphenate"])
+    print(f"\nper resume: median {statistics.median(reductions):.1%}, p10 {percentile(reductions, 0.1):.1%}, "
+          f"p90 {percentile(reductions, 0.9):.1%} fewer tokens; {truncated} cut to the budget")
+
+    if args.show:
+        print(f"\n{'resume':<32} {'raw':>7} {'prepared':>9} {'saved':>7}")
+        for name, counts in sorted(rows, key=lambda row: row[1]["budget"] - row[1]["raw"])[:args.show]:
+            print(f"{name[:32]:<32} {counts['raw']:>7} {counts['budget']:>9} {1 - counts['budget'] / counts['raw']:>7.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of PDF, DOCX or extracted .txt resumes")
+    parser.add_argument("--count", type=int, default=200, help="synthetic resumes to generate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--budget", type=int, help="token budget (default LLM_INPUT_TOKEN_BUDGET)")
+    parser.add_argument("--show", type=int, default=0, help="list the N resumes with the biggest savings")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
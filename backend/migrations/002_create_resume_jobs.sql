@@ -0,0 +1,51 @@
+-- Create resume_jobs table: background resume parsing jobs
+CREATE TABLE IF NOT EXISTS resume_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'extracting', 'parsing', 'done', 'failed')),
+    title TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    resume_id UUID NOT NULL,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Workers claim the oldest pending job; users poll their own jobs
+CREATE INDEX IF NOT EXISTS idx_resume_jobs_status_created_at ON resume_jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_resume_jobs_user_id ON resume_jobs(user_id);
+
+-- Enable Row Level Security (RLS)
+ALTER TABLE resume_jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own resume jobs"
+    ON resume_jobs FOR SELECT
+    USING (auth.uid() = user_id);
+
+CREATE TRIGGER update_resume_jobs_updated_at
+    BEFORE UPDATE ON resume_jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Atomically claim the next runnable job. Jobs left in a running state for
+-- longer than p_stale_seconds (e.g. the worker died) are picked up again.
+CREATE OR REPLACE FUNCTION claim_resume_job(p_stale_seconds INTEGER DEFAULT 600)
+RETURNS SETOF resume_jobs AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE resume_jobs
+    SET status = 'extracting', error = NULL
+    WHERE id = (
+        SELECT id FROM resume_jobs
+        WHERE status = 'pending'
+           OR (status IN ('extracting', 'parsing')
+               AND updated_at < NOW() - make_interval(secs => p_stale_seconds))
+        ORDER BY created_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,15 @@
+-- Create resume_parse_cache table: OpenAI parses keyed by
+-- sha256(model, prompt version, normalized resume text)
+CREATE TABLE IF NOT EXISTS resume_parse_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    data JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Only the backend (service role) reads or writes the cache
+ALTER TABLE resume_parse_cache ENABLE ROW LEVEL SECURITY;
+
+-- Background jobs can opt out of the cache like the synchronous upload
+ALTER TABLE resume_jobs ADD COLUMN IF NOT EXISTS use_cache BOOLEAN NOT NULL DEFAULT TRUE;
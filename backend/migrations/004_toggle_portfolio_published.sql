@@ -0,0 +1,13 @@
+-- Flip a portfolio's published flag in one statement. Returns the updated
+-- row, or nothing when the portfolio does not exist or belongs to someone else.
+CREATE OR REPLACE FUNCTION toggle_portfolio_published(p_portfolio_id UUID, p_user_id UUID)
+RETURNS SETOF portfolios AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE portfolios
+    SET is_published = NOT COALESCE(is_published, FALSE)
+    WHERE id = p_portfolio_id
+      AND user_id = p_user_id
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,11 @@
+-- List endpoints page through a user's rows newest first with a
+-- (created_at, id) keyset cursor; index that exact order per user.
+CREATE INDEX IF NOT EXISTS idx_resumes_user_id_created_at
+    ON resumes(user_id, created_at DESC, id DESC);
+
+-- portfolios.created_at has a default but was nullable; the cursor needs it set
+UPDATE portfolios SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE portfolios ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_portfolios_user_id_created_at
+    ON portfolios(user_id, created_at DESC, id DESC);
@@ -0,0 +1,44 @@
+-- Public URL slug for published portfolios, assigned the first time a
+-- portfolio is published and kept afterwards so shared links stay valid
+ALTER TABLE portfolios ADD COLUMN IF NOT EXISTS slug TEXT UNIQUE;
+
+CREATE OR REPLACE FUNCTION assign_portfolio_slug()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.is_published AND NEW.slug IS NULL THEN
+        NEW.slug := NULLIF(trim(BOTH '-' FROM lower(regexp_replace(NEW.name, '[^a-zA-Z0-9]+', '-', 'g'))), '');
+        NEW.slug := COALESCE(left(NEW.slug, 48) || '-', '') || left(NEW.id::text, 8);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER assign_portfolios_slug
+    BEFORE INSERT OR UPDATE ON portfolios
+    FOR EACH ROW
+    EXECUTE FUNCTION assign_portfolio_slug();
+
+-- Backfill: portfolios published before this migration get their slug now
+-- (assigned by the trigger above) rather than on their next edit
+UPDATE portfolios SET slug = NULL WHERE is_published AND slug IS NULL;
+
+-- Pre-rendered public view (JSON view model + HTML) of each published
+-- portfolio, written by the backend on publish/update. Rendering needs the
+-- backend, so portfolios published before this migration (backfilled
+-- above) get theirs on their first public view (SnapshotStore.get).
+CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+    portfolio_id UUID PRIMARY KEY REFERENCES portfolios(id) ON DELETE CASCADE,
+    slug TEXT NOT NULL UNIQUE,
+    etag TEXT NOT NULL,
+    view JSONB NOT NULL,
+    html TEXT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Only the backend (service role) reads or writes snapshots
+ALTER TABLE portfolio_snapshots ENABLE ROW LEVEL SECURITY;
+
+CREATE TRIGGER update_portfolio_snapshots_updated_at
+    BEFORE UPDATE ON portfolio_snapshots
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,4 @@
+-- Content hash of the current processed profile picture. Variants live at
+-- users/{id}/profile/{pfp_hash}/{size}.webp in storage; NULL means the user
+-- has no picture or only a legacy unprocessed one.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS pfp_hash TEXT;
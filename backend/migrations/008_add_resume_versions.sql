@@ -0,0 +1,8 @@
+-- Resume versions: a re-uploaded resume links to the version it replaces,
+-- and every resume keeps a hash of the text behind each part of its parse so
+-- the next version only re-parses the sections that changed.
+ALTER TABLE resumes
+    ADD COLUMN IF NOT EXISTS previous_id UUID REFERENCES resumes(id) ON DELETE SET NULL,
+    ADD COLUMN IF NOT EXISTS section_fingerprints JSONB;
+
+CREATE INDEX IF NOT EXISTS resumes_previous_id_idx ON resumes (previous_id);
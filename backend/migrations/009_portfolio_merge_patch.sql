@@ -0,0 +1,85 @@
+-- Optimistic concurrency and in-database merge patches for portfolios.
+--
+-- Every update bumps portfolios.version; the API exposes it as the ETag and
+-- checks If-Match against it. patch_portfolio() applies an RFC 7396 merge
+-- patch to the data document in place, so clients send only what changed.
+
+ALTER TABLE portfolios ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION bump_portfolio_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.version = OLD.version + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bump_portfolios_version
+    BEFORE UPDATE ON portfolios
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_portfolio_version();
+
+-- RFC 7396: objects merge key by key, null removes a key, anything else
+-- replaces the target value.
+CREATE OR REPLACE FUNCTION jsonb_merge_patch(target JSONB, patch JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    result JSONB;
+    item RECORD;
+BEGIN
+    IF jsonb_typeof(patch) IS DISTINCT FROM 'object' THEN
+        RETURN patch;
+    END IF;
+    result := CASE WHEN jsonb_typeof(target) = 'object' THEN target ELSE '{}'::jsonb END;
+    FOR item IN SELECT key, value FROM jsonb_each(patch) LOOP
+        IF jsonb_typeof(item.value) = 'null' THEN
+            result := result - item.key;
+        ELSE
+            result := jsonb_set(result, ARRAY[item.key], jsonb_merge_patch(result -> item.key, item.value));
+        END IF;
+    END LOOP;
+    RETURN result;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Set the given columns and merge-patch data in one statement. Returns the
+-- updated row, or nothing when the portfolio does not exist or belongs to
+-- someone else. With p_expected_version, a row at any other version raises
+-- PT412, which PostgREST answers as 412 Precondition Failed.
+CREATE OR REPLACE FUNCTION patch_portfolio(
+    p_portfolio_id UUID,
+    p_user_id UUID,
+    p_fields JSONB,
+    p_data_patch JSONB DEFAULT NULL,
+    p_expected_version INTEGER DEFAULT NULL
+)
+RETURNS SETOF portfolios AS $$
+DECLARE
+    current_version INTEGER;
+BEGIN
+    SELECT version INTO current_version
+    FROM portfolios
+    WHERE id = p_portfolio_id
+      AND user_id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    IF p_expected_version IS NOT NULL AND current_version <> p_expected_version THEN
+        RAISE SQLSTATE 'PT412' USING MESSAGE = 'Portfolio was modified', DETAIL = current_version::text;
+    END IF;
+
+    RETURN QUERY
+    UPDATE portfolios
+    SET name = COALESCE(p_fields ->> 'name', name),
+        template_id = COALESCE(p_fields ->> 'template_id', template_id),
+        color = COALESCE(p_fields ->> 'color', color),
+        display_mode = COALESCE(p_fields ->> 'display_mode', display_mode),
+        is_published = COALESCE((p_fields ->> 'is_published')::BOOLEAN, is_published),
+        data = CASE WHEN p_data_patch IS NULL THEN data ELSE jsonb_merge_patch(data, p_data_patch) END
+    WHERE id = p_portfolio_id
+      AND user_id = p_user_id
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,125 @@
+-- Full-text and skill search over a user's resumes and portfolios.
+--
+-- Each table gets two generated columns:
+--   search_vector  weighted tsvector: skills (A), career name and summary
+--                  (B), experience and projects (C)
+--   skill_tags     lower-cased skills, for exact skill filters
+-- Both are indexed with user_id first (btree_gin), so a search only
+-- touches the calling user's entries however many rows other users have.
+
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+CREATE OR REPLACE FUNCTION document_search_vector(doc JSONB, title TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT
+        setweight(jsonb_to_tsvector('english', COALESCE(doc -> 'skills', '[]'::jsonb), '["string"]'), 'A') ||
+        setweight(to_tsvector('english', COALESCE(title, '')), 'B') ||
+        setweight(jsonb_to_tsvector('english', COALESCE(doc -> 'overview', '{}'::jsonb), '["string"]'), 'B') ||
+        setweight(jsonb_to_tsvector('english', COALESCE(doc -> 'experience', '[]'::jsonb), '["string"]'), 'C') ||
+        setweight(jsonb_to_tsvector('english', COALESCE(doc -> 'projects', '[]'::jsonb), '["string"]'), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION document_skill_tags(doc JSONB)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(DISTINCT lower(btrim(skill))), '{}')
+    FROM jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(doc -> 'skills') = 'array' THEN doc -> 'skills' ELSE '[]'::jsonb END
+    ) AS skill;
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE resumes
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+        GENERATED ALWAYS AS (document_search_vector(data, NULL)) STORED,
+    ADD COLUMN IF NOT EXISTS skill_tags TEXT[]
+        GENERATED ALWAYS AS (document_skill_tags(data)) STORED;
+
+ALTER TABLE portfolios
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+        GENERATED ALWAYS AS (document_search_vector(data, name)) STORED,
+    ADD COLUMN IF NOT EXISTS skill_tags TEXT[]
+        GENERATED ALWAYS AS (document_skill_tags(data)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_resumes_user_id_search
+    ON resumes USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_resumes_user_id_skill_tags
+    ON resumes USING GIN (user_id, skill_tags);
+CREATE INDEX IF NOT EXISTS idx_portfolios_user_id_search
+    ON portfolios USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_portfolios_user_id_skill_tags
+    ON portfolios USING GIN (user_id, skill_tags);
+
+-- Ranked search for one user. p_query takes web-search syntax ("quoted
+-- phrases", OR, -excluded); p_skills must all be present (lower-case).
+-- Results are ordered by (rank, created_at, id) descending; pass the last
+-- row's values as p_after_* for the next page. Without a query every match
+-- ranks 0, so results come newest first.
+--
+-- The filters are put together per call rather than written as
+-- "(p_query IS NULL OR ...)": a plan cached for the OR form cannot use the
+-- GIN indexes and would scan every row the user has.
+CREATE OR REPLACE FUNCTION search_documents(
+    p_user_id UUID,
+    p_query TEXT DEFAULT NULL,
+    p_skills TEXT[] DEFAULT NULL,
+    p_kinds TEXT[] DEFAULT ARRAY['resume', 'portfolio'],
+    p_limit INTEGER DEFAULT 20,
+    p_after_rank REAL DEFAULT NULL,
+    p_after_created_at TIMESTAMPTZ DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    kind TEXT,
+    id UUID,
+    title TEXT,
+    rank REAL,
+    matched_skills TEXT[],
+    created_at TIMESTAMPTZ
+) AS $$
+DECLARE
+    v_query TSQUERY;
+    v_filter TEXT := '';
+    v_branches TEXT[] := '{}';
+BEGIN
+    IF btrim(COALESCE(p_query, '')) <> '' THEN
+        v_query := websearch_to_tsquery('english', p_query);
+        -- Only stop words: nothing can match
+        IF numnode(v_query) = 0 THEN
+            RETURN;
+        END IF;
+        v_filter := v_filter || ' AND search_vector @@ $2';
+    END IF;
+    IF p_skills IS NOT NULL THEN
+        v_filter := v_filter || ' AND skill_tags @> $3';
+    END IF;
+
+    IF 'resume' = ANY(p_kinds) THEN
+        v_branches := v_branches || format(
+            'SELECT ''resume''::TEXT AS kind, id, title, search_vector, skill_tags, created_at
+             FROM resumes WHERE user_id = $1%s', v_filter);
+    END IF;
+    IF 'portfolio' = ANY(p_kinds) THEN
+        v_branches := v_branches || format(
+            'SELECT ''portfolio''::TEXT AS kind, id, name AS title, search_vector, skill_tags, created_at
+             FROM portfolios WHERE user_id = $1%s', v_filter);
+    END IF;
+    IF cardinality(v_branches) = 0 THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT m.kind, m.id, m.title, m.rank, m.matched_skills, m.created_at
+         FROM (
+             SELECT d.kind, d.id, d.title,
+                    COALESCE(ts_rank_cd(d.search_vector, $2), 0)::REAL AS rank,
+                    CASE WHEN $3 IS NULL THEN ''{}''::TEXT[]
+                         ELSE ARRAY(SELECT unnest(d.skill_tags) INTERSECT SELECT unnest($3)) END AS matched_skills,
+                    d.created_at
+             FROM (%s) d
+         ) m
+         WHERE $5 IS NULL OR (m.rank, m.created_at, m.id) < ($5, $6, $7)
+         ORDER BY m.rank DESC, m.created_at DESC, m.id DESC
+         LIMIT $4',
+        array_to_string(v_branches, ' UNION ALL '))
+    USING p_user_id, v_query, p_skills, p_limit, p_after_rank, p_after_created_at, p_after_id;
+END;
+$$ LANGUAGE plpgsql STABLE;
@@ -0,0 +1,8 @@
+-- Resume parse cache entries expire PARSE_CACHE_TTL_DAYS after they were
+-- last written or hit; the backend deletes expired rows periodically (see
+-- core/parse_cache.py).
+ALTER TABLE resume_parse_cache
+    ADD COLUMN IF NOT EXISTS accessed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_resume_parse_cache_accessed_at
+    ON resume_parse_cache(accessed_at);
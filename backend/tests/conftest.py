@@ -0,0 +1,81 @@
+import argparse
+import os
+import socket
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import pytest
+
+# Settings are read at import time; nothing in-process reaches these services
+# (the app started by start_stack gets its own environment)
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:1")
+os.environ.setdefault("SUPABASE_PUB_KEY", "test")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class Stack:
+    """The app running against the bench stand-ins (bench/fakes.py)."""
+
+    def __init__(self, app_url: str, supabase_url: str):
+        self.app_url = app_url
+        self.supabase_url = supabase_url
+
+    def client(self, user) -> httpx.Client:
+        return httpx.Client(base_url=self.app_url, headers=user.headers, timeout=30)
+
+    def objects(self, prefix: str) -> List[str]:
+        response = httpx.post(f"{self.supabase_url}/storage/v1/object/list/users", json={"prefix": prefix})
+        return [item["name"] for item in response.json()]
+
+    def rows(self, table: str, **filters: str) -> List[Dict[str, Any]]:
+        params = {column: f"eq.{value}" for column, value in filters.items()}
+        return httpx.get(f"{self.supabase_url}/rest/v1/{table}", params=params).json()
+
+    def insert(self, table: str, row: Dict[str, Any]) -> None:
+        httpx.post(f"{self.supabase_url}/rest/v1/{table}", json=row).raise_for_status()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def start_stack(llm_latency_ms: float = 0.0, app_env: Optional[Dict[str, str]] = None) -> Iterator[Stack]:
+    """Start the fakes and the app as subprocesses, as bench.run does."""
+    from bench import run
+
+    faults = {f"{name}_{knob}": 0.0 for name in ("db", "storage", "llm") for knob in ("latency", "error_rate")}
+    args = argparse.Namespace(**{**faults, "llm_latency": llm_latency_ms})
+    supabase_port, openai_port, app_port = free_port(), free_port(), free_port()
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as log:
+        fakes = run.start_fakes(args, supabase_port, openai_port, log)
+        try:
+            app = run.start_app(app_port, f"http://127.0.0.1:{supabase_port}", f"http://127.0.0.1:{openai_port}",
+                                app_env or {}, log)
+        except BaseException:
+            fakes.terminate()
+            raise
+    try:
+        yield Stack(f"http://127.0.0.1:{app_port}", f"http://127.0.0.1:{supabase_port}")
+    finally:
+        app.terminate()
+        fakes.terminate()
+        app.wait()
+        fakes.wait()
+        os.unlink(log.name)
+
+
+@pytest.fixture(scope="module")
+def stack() -> Iterator[Stack]:
+    with start_stack() as stack:
+        yield stack
@@ -0,0 +1,51 @@
+"""The event loop stays free while uploads are extracted and parsed."""
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+
+from bench.scenarios import DOCX, make_docx, make_pdf, make_user
+from conftest import start_stack
+
+pytestmark = pytest.mark.anyio
+
+UPLOADS = 16
+LLM_LATENCY_MS = 1500
+
+
+@pytest.fixture(scope="module")
+def slow_llm_stack():
+    with start_stack(llm_latency_ms=LLM_LATENCY_MS) as stack:
+        yield stack
+
+
+async def test_liveliness_and_reads_stay_fast_while_uploads_parse(slow_llm_stack):
+    user = make_user(1)
+    async with httpx.AsyncClient(base_url=slow_llm_stack.app_url, headers=user.headers, timeout=60) as client:
+        async def upload(n: int) -> int:
+            files = {"file": ("resume.pdf", make_pdf(), "application/pdf")} if n % 2 else \
+                {"file": ("resume.docx", make_docx(), DOCX)}
+            return (await client.post("/resumes/", files=files)).status_code
+
+        uploads = [asyncio.create_task(upload(n)) for n in range(UPLOADS)]
+        # Let every upload get into extraction or the (slow) model call
+        await asyncio.sleep(0.3)
+
+        seconds = {"/liveliness": [], "/resumes/": []}
+        while not all(task.done() for task in uploads):
+            for path, samples in seconds.items():
+                started = time.perf_counter()
+                response = await client.get(path)
+                samples.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            await asyncio.sleep(0.05)
+
+        assert await asyncio.gather(*uploads) == [201] * UPLOADS
+
+    for path, samples in seconds.items():
+        # Probes kept going for the whole model latency
+        assert len(samples) >= 10, path
+        assert statistics.median(samples) < 0.1, (path, samples)
+        assert max(samples) < 0.5, (path, samples)
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.core import executors
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "extract_workers", 1)
+    monkeypatch.setattr(settings, "extract_max_pending", 1)
+    monkeypatch.setattr(settings, "extract_timeout", 1.0)
+    executors.shutdown_process_pool()
+    yield
+    executors.shutdown_process_pool()
+
+
+async def test_abandoned_job_holds_its_slot_until_done(pool):
+    # Start the worker first so the timing below isn't spent spawning it
+    await executors.run_in_process(os.getpid)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(executors.run_in_process(time.sleep, 0.5), timeout=0.1)
+    assert executors._pending.locked()
+
+    started = time.monotonic()
+    await executors.run_in_process(os.getpid)
+    assert time.monotonic() - started >= 0.3
+
+
+async def test_overrunning_job_recycles_the_pool(pool):
+    first = await executors.run_in_process(os.getpid)
+    stuck = executors._process_pool
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(executors.run_in_process(time.sleep, 30), timeout=0.1)
+    await asyncio.sleep(settings.extract_timeout + 0.5)
+
+    assert executors._process_pool is not stuck
+    assert not executors._pending.locked()
+    assert await asyncio.wait_for(executors.run_in_process(os.getpid), timeout=10) != first
+
+
+async def test_unneeded_job_does_not_recycle_the_pool(pool):
+    await executors.run_in_process(os.getpid)
+    shared = executors._process_pool
+
+    task = asyncio.ensure_future(executors.run_in_process(time.sleep, settings.extract_timeout + 1))
+    await asyncio.sleep(0.2)
+    task.cancel(executors.UNNEEDED)
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(settings.extract_timeout + 0.5)
+
+    assert executors._process_pool is shared
+
+
+async def test_pdf_pages_past_the_char_cap_are_not_started(pool, monkeypatch):
+    from app.core import text_extract
+    from bench.pdf_throughput import make_pdf
+
+    monkeypatch.setattr(settings, "extract_workers", 2)
+    monkeypatch.setattr(settings, "extract_max_pending", 4)
+    monkeypatch.setattr(settings, "extract_timeout", 20.0)
+    monkeypatch.setattr(settings, "pdf_pages_per_task", 1)
+    monkeypatch.setattr(settings, "extract_max_chars", 100)
+    started = []
+
+    async def counting(fn, *args):
+        if fn is text_extract.extract_pdf_pages:
+            started.append(args[1])
+        return await executors.run_in_process(fn, *args)
+
+    monkeypatch.setattr(text_extract, "run_in_process", counting)
+    text = await text_extract.extract_pdf_text(make_pdf(10))
+
+    assert len(text) == 100
+    # The first page reaches the cap; only the page beside it was in flight
+    assert started == [[0], [1]]
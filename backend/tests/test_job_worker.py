@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+from app.core import job_worker
+from app.core.job_queue import SQLiteJobQueue
+from app.core.resume_prefill import Prefill
+from app.models.resumes import ResumeJob, ResumeJobStatus
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSupabase:
+    """Just enough of the client for process_job: resumes lookups and a download."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.storage = SimpleNamespace(from_=lambda bucket: self)
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filter = (column, value)
+        return self
+
+    def limit(self, count):
+        return self
+
+    async def execute(self):
+        column, value = self.filter
+        return SimpleNamespace(data=[{"id": row["id"]} for row in self.rows if row[column] == value])
+
+    async def download(self, path):
+        return b"%PDF"
+
+
+@pytest.fixture
+def removed(monkeypatch):
+    removed = []
+
+    async def remove_file(supabase, path):
+        removed.append(path)
+
+    async def extract_text_async(content_type, file_bytes):
+        return "Jane Doe\njane@example.com"
+
+    async def parse_text(text, use_cache=True):
+        return Prefill(full_name="Jane Doe").to_resume()
+
+    monkeypatch.setattr(job_worker, "remove_file", remove_file)
+    monkeypatch.setattr(job_worker, "extract_text_async", extract_text_async)
+    monkeypatch.setattr(job_worker, "parse_text", parse_text)
+    monkeypatch.setattr(job_worker, "section_fingerprints", lambda text: {})
+    return removed
+
+
+async def run_job(monkeypatch, supabase, insert_resume):
+    queue = SQLiteJobQueue()
+    job = await queue.create(ResumeJob(id="job-1", user_id="user-1", title="cv.pdf", file_path="user-1/cv.pdf",
+                                       content_type="application/pdf", resume_id="resume-1"))
+    monkeypatch.setattr(job_worker, "get_supabase_client", lambda: supabase)
+    monkeypatch.setattr(job_worker, "insert_resume", insert_resume)
+    await job_worker.process_job(queue, job)
+    return await queue.get(job.id, job.user_id)
+
+
+async def test_reclaimed_job_with_stored_row_is_done(monkeypatch, removed):
+    async def insert_resume(supabase, resume):
+        raise AssertionError("row already stored")
+
+    job = await run_job(monkeypatch, FakeSupabase([{"id": "resume-1", "file_path": "user-1/cv.pdf"}]), insert_resume)
+    assert job.status == ResumeJobStatus.DONE
+    assert removed == []
+
+
+async def test_duplicate_insert_is_done(monkeypatch, removed):
+    async def insert_resume(supabase, resume):
+        raise APIError({"code": "23505", "message": "duplicate key value"})
+
+    job = await run_job(monkeypatch, FakeSupabase([]), insert_resume)
+    assert job.status == ResumeJobStatus.DONE
+    assert removed == []
+
+
+async def test_failure_before_insert_removes_file(monkeypatch, removed):
+    inserted = []
+
+    async def insert_resume(supabase, resume):
+        inserted.append(resume.id)
+        raise APIError({"code": "57014", "message": "statement timeout"})
+
+    job = await run_job(monkeypatch, FakeSupabase([]), insert_resume)
+    assert inserted == ["resume-1"]
+    assert job.status == ResumeJobStatus.FAILED
+    assert removed == ["user-1/cv.pdf"]
+
+
+async def test_failure_keeps_file_another_run_inserted(monkeypatch, removed):
+    supabase = FakeSupabase([])
+
+    async def insert_resume(client, resume):
+        # A stale run of the same job stores its row while this one fails
+        supabase.rows.append({"id": resume.id, "file_path": resume.file_path})
+        raise APIError({"code": "57014", "message": "statement timeout"})
+
+    job = await run_job(monkeypatch, supabase, insert_resume)
+    assert job.status == ResumeJobStatus.DONE
+    assert removed == []
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.llm_governor import LLMGovernor
+
+pytestmark = pytest.mark.anyio
+
+
+def half_open(governor: LLMGovernor, model: str) -> None:
+    breaker = governor.breakers[model]
+    breaker.failures = breaker.threshold
+    breaker.opened_at = time.monotonic() - breaker.cooldown - 1
+
+
+async def test_cancelled_trial_does_not_leave_circuit_open():
+    governor = LLMGovernor("primary", None)
+    half_open(governor, "primary")
+
+    async def hang(model: str):
+        await asyncio.sleep(60)
+
+    task = asyncio.create_task(governor.run(hang, 10))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    async def ok(model: str):
+        return "parsed"
+
+    assert await governor.run(ok, 10) == ("parsed", "primary")
+    assert governor.breakers["primary"].opened_at is None
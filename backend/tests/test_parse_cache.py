@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import parse_cache as parse_cache_module
+from app.core.parse_cache import ParseCache
+from app.core.resume_prefill import Prefill
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSupabase:
+    """Records the filters of one resume_parse_cache delete."""
+
+    def __init__(self, expired):
+        self.expired = expired
+        self.filters = []
+
+    def table(self, name):
+        assert name == "resume_parse_cache"
+        return self
+
+    def delete(self):
+        return self
+
+    def lt(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    async def execute(self):
+        return SimpleNamespace(data=[{"key": key} for key in self.expired])
+
+
+async def test_memory_hits_are_copies():
+    cache = ParseCache(max_size=4, persistent=False)
+    stored = Prefill(full_name="Jane Doe").to_resume()
+    await cache.put("Jane Doe", stored)
+    stored.personal_information.full_name = "changed after put"
+
+    first = await cache.get("Jane Doe")
+    first.personal_information.full_name = "changed by a caller"
+    second = await cache.get("Jane Doe")
+    assert second.personal_information.full_name == "Jane Doe"
+    assert second is not first
+
+
+async def test_prune_deletes_rows_not_accessed_within_the_ttl(monkeypatch):
+    supabase = FakeSupabase(["a", "b"])
+    monkeypatch.setattr(parse_cache_module, "get_supabase_client", lambda: supabase)
+
+    assert await ParseCache(max_size=4, persistent=True).prune(ttl_days=30) == 2
+    [(column, cutoff)] = supabase.filters
+    assert column == "accessed_at"
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(cutoff)
+    assert timedelta(days=30) <= age < timedelta(days=30, minutes=1)
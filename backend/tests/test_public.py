@@ -0,0 +1,34 @@
+"""Public portfolio pages, served from snapshots."""
+import uuid
+
+import httpx
+
+from bench.scenarios import SAMPLE_RESUME
+
+
+def test_published_portfolio_without_snapshot_is_rendered_on_first_view(stack):
+    # As left by migration 006's backfill: published, slugged, no snapshot
+    portfolio_id = str(uuid.uuid4())
+    stack.insert("portfolios", {
+        "id": portfolio_id, "user_id": str(uuid.uuid4()), "name": "Old Site", "template_id": "1",
+        "data": SAMPLE_RESUME, "is_published": True,
+    })
+    slug = stack.rows("portfolios", id=portfolio_id)[0]["slug"]
+    assert stack.rows("portfolio_snapshots", portfolio_id=portfolio_id) == []
+
+    response = httpx.get(f"{stack.app_url}/p/{slug}")
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert len(stack.rows("portfolio_snapshots", portfolio_id=portfolio_id)) == 1
+
+    assert httpx.get(f"{stack.app_url}/p/{slug}", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_unpublished_or_unknown_slug_is_404(stack):
+    portfolio_id = str(uuid.uuid4())
+    stack.insert("portfolios", {
+        "id": portfolio_id, "user_id": str(uuid.uuid4()), "name": "Draft", "template_id": "1",
+        "data": SAMPLE_RESUME, "slug": f"draft-{portfolio_id[:8]}", "is_published": False,
+    })
+    assert httpx.get(f"{stack.app_url}/p/draft-{portfolio_id[:8]}").status_code == 404
+    assert httpx.get(f"{stack.app_url}/p/no-such-slug").status_code == 404
@@ -0,0 +1,32 @@
+import pytest
+
+from app.core.read_cache import MemoryCacheBackend, ReadCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_memory_counters_are_bounded():
+    backend = MemoryCacheBackend(max_entries=10)
+    cache = ReadCache(backend, ttl=60)
+    for n in range(1000):
+        await cache.invalidate(f"user-{n}", "resumes")
+    assert len(backend._counters) == 10
+
+
+async def test_evicted_counter_never_revives_a_pre_write_entry():
+    cache = ReadCache(MemoryCacheBackend(max_entries=4), ttl=60)
+
+    async def load_old():
+        return "old"
+
+    async def load_new():
+        return "new"
+
+    assert await cache.get_or_load("alex", "resumes", ("list",), load_old) == "old"
+    await cache.invalidate("alex", "resumes")
+    # Push alex's counter out while the pre-write entry is still cached
+    for n in range(4):
+        await cache.invalidate(f"user-{n}", "resumes")
+    assert "v:alex:resumes" not in cache.backend._counters
+
+    assert await cache.get_or_load("alex", "resumes", ("list",), load_new) == "new"
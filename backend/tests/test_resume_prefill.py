@@ -0,0 +1,21 @@
+import pytest
+
+from app.core.resume_prefill import extract_prefill
+
+
+@pytest.mark.parametrize("header, name", [
+    ("Alex Doe\nalex@example.com | 555-0100", "Alex Doe"),
+    ("CURRICULUM VITAE\nAlex Doe\nalex@example.com", "Alex Doe"),
+    ("Professional Resume\nPriya Patel\npriya@example.com", "Priya Patel"),
+    ("Alex Doe - Resume\nalex@example.com", "Alex Doe"),
+    ("Résumé\nTomás García\ntomas@example.com", "Tomás García"),
+    ("JORDAN O'BRIEN\njordan@example.com", "Jordan O'Brien"),
+    ("RONALD MCDONALD\nronald@example.com", "Ronald McDonald"),
+    ("SMITH-JONES ALEX\nalex@example.com", "Smith-Jones Alex"),
+    # Macdonald or MacDonald: left as written
+    ("ALEX MACDONALD\nalex@example.com", "ALEX MACDONALD"),
+    ("Curriculum Vitae\nalex@example.com", None),
+])
+def test_full_name(header, name):
+    text = header + "\nEDUCATION\nState University"
+    assert extract_prefill(text).full_name == name
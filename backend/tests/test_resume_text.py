@@ -0,0 +1,45 @@
+from app.core.resume_text import clean_resume_text, dehyphenate, remove_page_furniture
+
+HEADER = "Jane Doe\njane@x.com | 555-123-4567"
+
+
+def test_running_header_is_kept_once():
+    text = "\f".join([
+        f"{HEADER}\nEXPERIENCE\nAcme Corp - Engineer\nBuilt things.\nPage 1 of 2",
+        f"{HEADER}\nEDUCATION\nState University\nPage 2 of 2",
+    ])
+    cleaned = remove_page_furniture(text)
+
+    assert cleaned.count("Jane Doe") == 1
+    assert cleaned.count("jane@x.com | 555-123-4567") == 1
+    assert cleaned.startswith(HEADER)
+    assert "Page" not in cleaned
+    assert "State University" in cleaned
+
+
+def test_running_footer_is_dropped_after_the_first_page():
+    text = "\f".join(f"Page body {n}\nmore\nConfidential - Jane Doe" for n in range(3))
+    assert remove_page_furniture(text).count("Confidential - Jane Doe") == 1
+
+
+def test_prefill_reads_a_repeated_header():
+    from app.core.resume_prefill import extract_prefill
+
+    text = "\f".join([f"{HEADER}\nSUMMARY\nEngineer.", f"{HEADER}\nSKILLS\nPython, Go"])
+    prefill = extract_prefill(text)
+    assert (prefill.full_name, prefill.email, prefill.phone) == ("Jane Doe", "jane@x.com", "555-123-4567")
+
+
+def test_dehyphenate_joins_broken_words():
+    assert dehyphenate("led the develop-\nment of tools") == "led the development of tools"
+    assert dehyphenate("Kuber-\nnetes") == "Kubernetes"
+
+
+def test_dehyphenate_keeps_compounds():
+    assert dehyphenate("a self-\nmotivated engineer") == "a self-motivated engineer"
+    assert dehyphenate("a well-\nknown library") == "a well-known library"
+    assert dehyphenate("data-\ndriven decisions") == "data-driven decisions"
+
+
+def test_clean_keeps_unrelated_hyphens():
+    assert clean_resume_text("Python -\nGo") == "Python -\nGo"
@@ -0,0 +1,94 @@
+"""Supabase round trips per write route, counted from the Server-Timing header."""
+import re
+import uuid
+from typing import Dict
+
+import httpx
+
+from bench.scenarios import DOCX, make_docx, make_user, portfolio_body
+
+
+def calls(response: httpx.Response) -> Dict[str, int]:
+    return {
+        stage: int(count)
+        for stage, count in re.findall(r'(\w+);dur=[\d.]+;desc="(\d+) call\(s\)"', response.headers["server-timing"])
+    }
+
+
+def test_profile_routes(stack):
+    user = make_user(1)
+    with stack.client(user) as client:
+        response = client.post("/profiles/me", json={"full_name": "Alex Doe"})
+        assert response.status_code == 200
+        assert calls(response)["db"] == 1
+        assert response.json()["email"] == user.email
+
+        response = client.post("/profiles/me", json={"full_name": "Alex Doe"})
+        assert response.status_code == 400
+        assert calls(response)["db"] == 1
+
+        response = client.put("/profiles/me", json={"bio": "hello"})
+        assert response.status_code == 200
+        assert calls(response)["db"] == 1
+        assert response.json()["bio"] == "hello"
+
+
+def test_profile_put_creates_with_account_email_and_keeps_it_after(stack):
+    user = make_user(2)
+    with stack.client(user) as client:
+        response = client.put("/profiles/me", json={"full_name": "Alex Doe"})
+        assert response.status_code == 200
+        assert calls(response)["db"] == 2
+        assert response.json()["email"] == user.email
+
+    other = make_user(3)
+    stack.insert("profiles", {"user_id": other.id, "full_name": "Sam", "email": "sam@work.example.com"})
+    with stack.client(other) as client:
+        response = client.put("/profiles/me", json={"bio": "hi"})
+        assert response.status_code == 200
+        assert response.json()["email"] == "sam@work.example.com"
+
+
+def test_portfolio_routes(stack):
+    user, intruder = make_user(4), make_user(5)
+    with stack.client(user) as client:
+        portfolio_id = client.post("/portfolios/", json=portfolio_body("site")).json()["id"]
+
+        response = client.put(f"/portfolios/{portfolio_id}", json={"color": "#000000"})
+        assert response.status_code == 200
+        assert calls(response)["db"] == 1
+
+        # The toggle, then the published snapshot
+        response = client.patch(f"/portfolios/{portfolio_id}/publish")
+        assert response.status_code == 200
+        assert calls(response)["db"] == 2
+        assert response.json()["is_published"] is True
+
+        with stack.client(intruder) as other:
+            assert other.put(f"/portfolios/{portfolio_id}", json={"color": "#ffffff"}).status_code == 404
+            assert other.delete(f"/portfolios/{portfolio_id}").status_code == 404
+
+        response = client.delete(f"/portfolios/{portfolio_id}")
+        assert response.status_code == 200
+        assert calls(response)["db"] == 1
+        assert client.delete(f"/portfolios/{portfolio_id}").status_code == 404
+
+
+def test_resume_delete_removes_row_then_file(stack):
+    user = make_user(6)
+    with stack.client(user) as client:
+        response = client.post("/resumes/", files={"file": ("resume.docx", make_docx(), DOCX)})
+        assert response.status_code == 201
+        resume_id = response.json()["id"]
+        assert len(stack.objects(user.id)) == 1
+
+        response = client.delete(f"/resumes/{resume_id}")
+        assert response.status_code == 204
+        assert calls(response) == {"db": 1, "storage": 1}
+        assert stack.rows("resumes", id=resume_id) == []
+        assert stack.objects(user.id) == []
+
+        response = client.delete(f"/resumes/{resume_id}")
+        assert response.status_code == 404
+        assert "storage" not in calls(response)
+        assert client.delete(f"/resumes/{uuid.uuid4()}").status_code == 404
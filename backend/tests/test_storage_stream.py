@@ -0,0 +1,66 @@
+import gzip
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from app.core import storage_stream
+
+pytestmark = pytest.mark.anyio
+
+BODY = b"%PDF-1.4 " + b"resume " * 2000
+
+
+def request(headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/resumes/1/download",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Storage that gzips the object for clients that accept it."""
+    seen = []
+
+    def handler(upstream_request: httpx.Request) -> httpx.Response:
+        seen.append(upstream_request)
+        if "gzip" in upstream_request.headers.get("accept-encoding", ""):
+            body = gzip.compress(BODY)
+            headers = {"content-encoding": "gzip"}
+        else:
+            body, headers = BODY, {}
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers={
+            **headers, "content-type": "application/pdf", "content-length": str(len(body)), "etag": '"v1"',
+        })
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(storage_stream, "get_http_client", lambda: client)
+    monkeypatch.setattr(storage_stream, "object_meta_cache", storage_stream.ObjectMetaCache(8, 60))
+    return seen
+
+
+async def read(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+async def test_encoded_object_is_relayed_as_sent(upstream):
+    response = await storage_stream.stream_object(request({"accept-encoding": "gzip"}), "users", "a.pdf", "private")
+    body = await read(response)
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == BODY
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+async def test_client_without_accept_encoding_gets_identity(upstream):
+    response = await storage_stream.stream_object(request({}), "users", "a.pdf", "private")
+    body = await read(response)
+
+    assert upstream[0].headers["accept-encoding"] == "identity"
+    assert "content-encoding" not in response.headers
+    assert body == BODY
+    assert int(response.headers["content-length"]) == len(BODY)
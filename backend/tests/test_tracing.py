@@ -0,0 +1,30 @@
+import json
+import logging
+import sys
+
+from app.core.tracing import JSONLogFormatter, Trace, _current_trace
+
+
+def _record(exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord("app.core.job_worker", logging.ERROR, __file__, 1, "Error processing resume job %s", ("job-1",), exc_info)
+
+
+def test_log_records_carry_the_request_id():
+    token = _current_trace.set(Trace(request_id="req-1"))
+    try:
+        entry = json.loads(JSONLogFormatter().format(_record()))
+    finally:
+        _current_trace.reset(token)
+    assert entry["request_id"] == "req-1"
+    assert entry["level"] == "error"
+    assert entry["logger"] == "app.core.job_worker"
+    assert entry["message"] == "Error processing resume job job-1"
+
+
+def test_log_records_outside_a_request_include_the_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        entry = json.loads(JSONLogFormatter().format(_record(sys.exc_info())))
+    assert "request_id" not in entry
+    assert "ValueError: boom" in entry["exception"]
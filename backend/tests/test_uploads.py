@@ -0,0 +1,66 @@
+"""Spooled uploads keep memory flat however large the file is."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+MB = 1024 * 1024
+
+# Runs in a fresh interpreter so each size's peak RSS is its own. The
+# upload is read from a file on disk, so only spooling allocates.
+SPOOL = """
+import asyncio, sys
+from fastapi import UploadFile
+from app.core.uploads import spooled_upload
+
+def peak_kb():
+    for line in open("/proc/self/status"):
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+
+async def main(path, size):
+    with open(path, "rb") as fp:
+        file = UploadFile(fp, filename="resume.pdf")
+        await file.read(1)
+        await file.seek(0)
+        before = peak_kb()
+        async with spooled_upload(file, size + 1) as upload:
+            assert upload.size == size
+            spooled = upload.path is not None
+        print(peak_kb() - before, int(spooled))
+
+asyncio.run(main(sys.argv[1], int(sys.argv[2])))
+"""
+
+
+def spool(tmp_path: Path, size: int):
+    path = tmp_path / f"upload-{size}"
+    with open(path, "wb") as fp:
+        for _ in range(size // MB):
+            fp.write(os.urandom(MB))
+        fp.write(os.urandom(size % MB))
+    result = subprocess.run(
+        [sys.executable, "-c", SPOOL, str(path), str(size)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    growth_kb, spooled = map(int, result.stdout.split())
+    return growth_kb, bool(spooled)
+
+
+@pytest.mark.skipif(not Path("/proc/self/status").exists(), reason="reads peak RSS from /proc")
+def test_peak_rss_is_flat_past_the_spool_threshold(tmp_path):
+    threshold = settings.upload_spool_threshold
+    small, small_spooled = spool(tmp_path, threshold // 2)
+    large, large_spooled = spool(tmp_path, 4 * threshold)
+    huge, huge_spooled = spool(tmp_path, 64 * MB)
+
+    assert (small_spooled, large_spooled, huge_spooled) == (False, True, True)
+    # Past the threshold only a chunk or two is held at a time: growing the
+    # upload 16x must not grow the peak by anything like the upload's size
+    assert huge - large < 4 * 1024, (small, large, huge)
+    assert huge < threshold // 1024 + 8 * 1024, (small, large, huge)
@@ -56,7 +56,7 @@ export default function DashboardPage() {
 
         // Fetch portfolios (websites)
         const url = process.env.NEXT_PUBLIC_BACKEND_URL
-        const response = await fetch(`${url}/portfolios/`, {
+        const response = await fetch(`${url}/portfolios/?fields=data`, {
 
           headers: {
             'Authorization': `Bearer ${token}`